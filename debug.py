@@ -22,6 +22,10 @@ class Debugger:
         self._wait_for_breakpoint = False
         self._stop_debugging = False
         self._emulation_stopped = False
+        # State file to save or load once the debugger returns, see
+        # 'pop_state_request'
+        self._state_file = ""
+        self._state_save = False
 
     def step(self):
         if self._stop_debugging:
@@ -30,7 +34,7 @@ class Debugger:
             if self.cpu68k.get_pc() not in self._breakpoints:
                 return
             print("Hit breakpoint")
-        old_verbose = self.mem._verbose
+        old_verbose = self.mem.is_verbose()
         self.mem.set_verbose(False)
         self._wait_for_breakpoint = False
         quit = False
@@ -46,6 +50,22 @@ class Debugger:
             print("")
         self.mem.set_verbose(old_verbose)
 
+    def pop_state_request(self):
+        """
+        Get and remove the request to save or load the state.
+
+        Returns
+        -------
+        file_name: str
+            The file of the state, or an empty string if there is no request.
+
+        is_save: bool
+            ``True`` to save the state, ``False`` to load it.
+        """
+        file_name = self._state_file
+        self._state_file = ""
+        return file_name, self._state_save
+
     def post_mortem(self):
         self._emulation_stopped = True
         self._wait_for_breakpoint = False
@@ -81,6 +101,8 @@ class Debugger:
             else:
                 quit = True
                 self._wait_for_breakpoint = True
+        elif base_command in ("save", "load"):
+            quit = self._request_state(command, base_command == "save")
         elif base_command in ("q", "quit"):
             quit = True
             self._stop_debugging = True
@@ -89,6 +111,20 @@ class Debugger:
             print("Type 'help' for a list of commands.")
         return quit
 
+    def _request_state(self, command, is_save):
+        if self._emulation_stopped:
+            print("Emulation has stopped")
+            return False
+        # File names keep their case
+        args = [arg for arg in command.split(" ")[1:] if arg]
+        if len(args) == 0:
+            print("Missing file name")
+            return False
+        # The console handles the request and returns to the debugger
+        self._state_file = args[0]
+        self._state_save = is_save
+        return True
+
     def _execute_68k(self, other_args):
         # TODO support more args
         print(self.cpu68k.__str__())
@@ -318,6 +354,12 @@ d/delete <pc_value>
 l/list
         List all breakpoints.
 
+save <file_name>
+        Save the state of the console to the given file.
+
+load <file_name>
+        Load the state of the console from the given file.
+
 s/step
         Progress the emulation by one M68k instruction.
 
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of pre-decoded straight-line runs of instructions.
+
+A block starts at the address that execution jumped to and contains the
+operation words of all instructions that follow it sequentially, up to and
+including the first instruction that may change the flow of execution. Each
+entry is stored together with its entry from ``m68k.decoder.DECODE_TABLE``, so
+that executing a cached instruction needs neither a memory access nor a
+decoding step. Extension words are still read from memory when the
+instruction is executed.
+
+Blocks are built while the code executes: an instruction is only appended
+after its predecessor has finished without changing the program counter
+through anything but the normal fetch, so the address of every entry is known
+to be the one that follows the previous instruction.
+
+Only code in cartridge ROM and 68k RAM is cached. ROM never changes, whereas
+every write to 68k RAM drops all blocks with an instruction in the written
+page.
+
+Created on Sun Oct 18 13:37:02 2026
+
+@author: Simon Romanowski
+"""
+
+import m68k.decoder as decoder
+
+
+# RAM is tracked in pages of 256 bytes
+RAM_PAGE_SHIFT = 8
+RAM_PAGE_COUNT = 0x10000 >> RAM_PAGE_SHIFT
+
+
+def _create_ends_block():
+    ends_block = [False] * len(decoder.HANDLERS)
+    for handler_index in [
+            decoder.UNKNOWN,
+            decoder.ILLEGAL,
+            decoder.TRAP,
+            decoder.TRAPV,
+            decoder.CHK,
+            decoder.DIVU,
+            decoder.DIVS,
+            decoder.RESET,
+            decoder.STOP,
+            decoder.RTE,
+            decoder.RTS,
+            decoder.RTR,
+            decoder.JSR,
+            decoder.JMP,
+            decoder.DBCC,
+            decoder.BRA,
+            decoder.BSR,
+            decoder.BCC]:
+        ends_block[handler_index] = True
+    return ends_block
+
+# Handlers that may change the program counter or cause a trap
+ENDS_BLOCK = _create_ends_block()
+
+
+def is_cacheable(address):
+    """Check if code at the given address may be cached."""
+    address &= 0xFFFFFF
+    return address < 0x400000 or address >= 0xFF0000
+
+
+class Block(object):
+    """
+    Sequence of pre-decoded instructions.
+
+    Parameters
+    ----------
+    start_pc: int
+        The address of the first instruction of the block.
+    """
+
+    def __init__(self, start_pc):
+        self.start_pc = start_pc
+        # Address of each instruction's operation word
+        self.pcs = []
+        self.op_codes = []
+        # Entries from 'decoder.DECODE_TABLE'
+        self.entries = []
+        # No more instructions may be appended once this is 'True'
+        self.closed = False
+        # Set to 'False' once the code in memory has changed
+        self.valid = True
+
+    def append(self, pc, op_code, entry):
+        """Append the next instruction to the end of the block."""
+        self.pcs.append(pc)
+        self.op_codes.append(op_code)
+        self.entries.append(entry)
+        if ENDS_BLOCK[entry & 0xFF]:
+            self.closed = True
+
+
+class BlockCache(object):
+    """Blocks of pre-decoded instructions, indexed by their start address."""
+
+    def __init__(self):
+        self._blocks = {}
+        # All blocks that contain instructions in a page of 68k RAM
+        self._ram_pages = [[] for _ in range(RAM_PAGE_COUNT)]
+
+    def get(self, pc):
+        """
+        Get the block that starts at the given address.
+
+        A new, empty block is created if there is none yet.
+        Returns ``None`` if code at the given address may not be cached.
+        """
+        block = self._blocks.get(pc, None)
+        if block is None and is_cacheable(pc):
+            block = Block(pc)
+            self._blocks[pc] = block
+        return block
+
+    def append(self, block, pc, op_code, entry):
+        """Append an instruction to a block that is part of this cache."""
+        block.append(pc, op_code, entry)
+        pc &= 0xFFFFFF
+        if pc >= 0xFF0000:
+            page = self._ram_pages[(pc & 0xFFFF) >> RAM_PAGE_SHIFT]
+            if not page or page[-1] is not block:
+                page.append(block)
+
+    def invalidate(self, address):
+        """
+        Drop all blocks with instructions in the RAM page of the address.
+
+        Parameters
+        ----------
+        address: int
+            Address in 68k RAM, relative to the start of RAM.
+        """
+        page = self._ram_pages[(address & 0xFFFF) >> RAM_PAGE_SHIFT]
+        if page:
+            for block in page:
+                block.valid = False
+                if self._blocks.get(block.start_pc, None) is block:
+                    del self._blocks[block.start_pc]
+            del page[:]
+
+    def clear(self):
+        """Drop all blocks."""
+        for block in self._blocks.values():
+            block.valid = False
+        self._blocks.clear()
+        for page in self._ram_pages:
+            del page[:]
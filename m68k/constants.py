@@ -40,3 +40,13 @@ SR_I = 0b00000111
 SR_I2 = 0b00000100
 SR_I1 = 0b00000010
 SR_I0 = 0b00000001
+
+# Indices into the CPU's register file
+REG_D0 = 0
+REG_A0 = 8
+REG_A7 = 15
+REG_USP = 16
+REG_SSP = 17
+REG_PC = 18
+REG_SR = 19
+REG_COUNT = 20
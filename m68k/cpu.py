@@ -9,18 +9,40 @@ Created on Fri Sep 15 19:43:18 2023
 
 from utils import rpython_utils
 
-from cpu_utils import register
 from utils import int_utils
+import m68k.decoder as decoder
+import m68k.block_cache as block_cache
 import m68k.effective_address as ea
-import m68k.instructions as ins
 from m68k.constants import (
     OP_SIZE_BYTE, OP_SIZE_WORD, OP_SIZE_LONG,
-    EA_MODE_REG_A,
+    CCR_ALL, CCR_X, CCR_N, CCR_Z, CCR_V, CCR_C,
     SR_T1, SR_S, SR_I,
+    REG_D0, REG_A0, REG_A7, REG_USP, REG_SSP, REG_PC, REG_SR, REG_COUNT,
 )
 from m68k.errors import IllegalInstruction, PrivilegeError
 
 
+# Kinds of operations whose condition codes have not been calculated yet
+CCR_LAZY_NONE = 0
+# N and Z from the result, V and C cleared, X unchanged
+CCR_LAZY_LOGIC = 1
+# Addition, all condition codes
+CCR_LAZY_ADD = 2
+# Subtraction, all condition codes
+CCR_LAZY_SUB = 3
+# Comparison, like subtraction but X unchanged
+CCR_LAZY_CMP = 4
+
+# Masks for the result and its most significant bit by operation size
+_SIZE_MASKS = [0xFF, 0xFFFF, 0xFFFFFFFF]
+_SIZE_MSB_MASKS = [0x80, 0x8000, 0x80000000]
+
+# End of the cartridge ROM in the address space
+ROM_END = 0x400000
+
+# Maximum distance in bytes of a backward branch that may close an idle loop
+IDLE_LOOP_MAX_SIZE = 64
+
 # Set to 'True' to force usage of JIT
 FAIL_ON_NO_JIT = False
 
@@ -29,17 +51,13 @@ try:
         return \
             "pc: " + int_utils.to_32x_string(pc) \
             + " | rom[pc]: " + (
-                int_utils.to_16b_string(
-                    int_utils.select_bits(
-                        rom[pc>>3],
-                        (pc & 0b111) << 3,
-                        (((pc & 0b111) + 1) << 3) - 1
-                    )
-                )
-                if (pc>>3) < len(rom) else "NOT IN ROM"
+                int_utils.to_16b_string(rom.read_const(pc))
+                if pc < rom.get_size() else "NOT IN ROM"
             )
     from rpython.rlib import jit
-    JIT_DRIVER = jit.JitDriver(greens=["pc", "rom"], reds="auto",
+    JIT_DRIVER = jit.JitDriver(greens=["pc", "rom"],
+                               reds=["until_cycle", "cpu"],
+                               virtualizables=["cpu"],
                                get_printable_location=get_printable_location)
     USE_JIT = True
 except ImportError:
@@ -59,33 +77,41 @@ class Cpu(object):
     ----------
     memory_interface: megadrive.memory.Memory
         Access to the memory that should be used.
-
-    verbose: bool, optional
-        Set this to ``True`` to print all instructions that are executed.
     """
 
-    def __init__(self, memory_interface, verbose=False):
+    # The JIT keeps these fields in machine registers while executing a trace
+    # and only writes them back when leaving it
+    _virtualizable_ = [
+        "_regs[*]", "_cycle",
+        "_ccr_kind", "_ccr_dst", "_ccr_src", "_ccr_result", "_ccr_size",
+        "_pending_interrupt", "_stopped",
+    ]
+    _immutable_fields_ = [
+        "mem", "_rom", "_block_cache", "src_operand", "dst_operand",
+        "_skip_idle_loops?", "_idle_regs",
+    ]
+
+    def __init__(self, memory_interface):
+        if USE_JIT:
+            self = jit.hint(self, access_directly=True,
+                            fresh_virtualizable=True)
         self.mem = memory_interface
-        # 8 32-bit data register
-        self.d_registers = [register.Register32() for _ in range(8)]
-        # 9 32-bit address registers
-        # A7 is the (user-/system-) stack pointer
+        # Instructions in cartridge ROM are fetched from it directly
+        self._rom = memory_interface.get_rom()
+        # All registers are kept in one list of integers:
+        # Index   | 0-7   | 8-15  |  16 |  17 | 18 | 19 |
+        # -------------------------------------------------
+        # Meaning | D0-D7 | A0-A7 | USP | SSP | PC | SR |
+        #
+        # A7 is the active stack pointer. The other stack pointer is kept at
+        # its own index, which is only valid while it is not active. The
+        # values are swapped when the S bit changes.
+        self._regs = [0] * REG_COUNT
         # Initial Stack pointer at address 0
-        self._user_stack = register.Register32()
-        self._system_stack = register.Register32(
-            (self.mem.read(0) << 16) | self.mem.read(2))
-        self.a_registers = [register.Register32(),
-                            register.Register32(),
-                            register.Register32(),
-                            register.Register32(),
-                            register.Register32(),
-                            register.Register32(),
-                            register.Register32(),
-                            self._system_stack]
+        self._regs[REG_A7] = self.mem.read_long(0)
         # 32-bit program counter
         # Program starts at the address at 0x4 in self.mem
-        self._pc = register.Register32(
-            (self.mem.read(4) << 16) | self.mem.read(6))
+        self._regs[REG_PC] = self.mem.read_long(4)
         # 16-bit status register
         # Bit     | 15 | 14 | 13 | 12 | 11 | 10 |  9 |  8 | 7 | 6 | 5 |
         # -------------------------------------------------------------------
@@ -98,13 +124,45 @@ class Cpu(object):
         # 'CCR' or 'Condition Code Register'.
         # All bits marked with "-" are ignored and always 0
         # Initially, the S-Bit is 1 to start in supervisor mode.
-        self._stat_register = register.Register16(SR_S << 8)
+        self._regs[REG_SR] = SR_S << 8
+        # The condition codes are only calculated when they are read. Until
+        # then, the last operation that changed them is stored here and the
+        # bits in the status register are outdated.
+        self._ccr_kind = CCR_LAZY_NONE
+        self._ccr_dst = 0
+        self._ccr_src = 0
+        self._ccr_result = 0
+        self._ccr_size = OP_SIZE_BYTE
         # Cycle counter will be updated by each instruction
         self._cycle = 0
         # Priority of the currently pending interrupt, or 0 if there is none
         self._pending_interrupt = 0
         self._stopped = False
-        self._verbose = verbose
+        # Pre-decoded instructions
+        self._block_cache = block_cache.BlockCache()
+        self.mem.set_code_cache(self._block_cache)
+        # Block that is currently executed and index of its next instruction
+        self._block = None
+        self._block_index = 0
+        # Resolved operands of the current instruction. They are reused by
+        # every instruction to avoid allocations.
+        self.src_operand = ea.Operand()
+        self.dst_operand = ea.Operand()
+        # Detection of loops that only wait for an interrupt
+        self._skip_idle_loops = False
+        self._skipped_cycles = 0
+        # Target of the last backward branch, or -1 if there is none
+        self._idle_target = -1
+        self._idle_cycle = 0
+        self._idle_side_effects = 0
+        # Whether the state below was saved at the last backward branch
+        self._idle_saved = False
+        self._idle_regs = [0] * REG_COUNT
+        self._idle_ccr_kind = CCR_LAZY_NONE
+        self._idle_ccr_dst = 0
+        self._idle_ccr_src = 0
+        self._idle_ccr_result = 0
+        self._idle_ccr_size = OP_SIZE_BYTE
 
     # --- Register access ---
 
@@ -119,10 +177,16 @@ class Cpu(object):
 
         size: int, optional
             Defines the section of the register, that should be considered.
-            0 means only the lowest byte, 1 is the lower word and 3 (default)
+            0 means only the lowest byte, 1 is the lower word and 2 (default)
             means the full 32 bits.
         """
-        return self._get_reg(index, self.d_registers, size)
+        # The mask proves to the JIT that the index is never negative
+        value = self._regs[REG_D0 + (index & 0x7)]
+        if size == OP_SIZE_BYTE:
+            return value & 0xFF
+        elif size == OP_SIZE_WORD:
+            return value & 0xFFFF
+        return value
 
     def get_a(self, index, size=OP_SIZE_LONG):
         """
@@ -135,85 +199,99 @@ class Cpu(object):
 
         size: int, optional
             Defines the section of the register, that should be considered.
-            0 means only the lowest byte, 1 is the lower word and 3 (default)
+            0 means only the lowest byte, 1 is the lower word and 2 (default)
             means the full 32 bits.
         """
-        return self._get_reg(index, self.a_registers, size)
-
-    @staticmethod
-    def _get_reg(index, registers, size):
-        """Get one of the eight data or address registers."""
-        if index > 7:
-            raise rpython_utils.RIndexError(
-                "No data register with index %d." % index)
-        if size > OP_SIZE_LONG:
-            raise rpython_utils.RValueError(
-                "Invalid size value given: %d" % size)
-
-        reg = registers[index]
+        value = self._regs[REG_A0 + (index & 0x7)]
         if size == OP_SIZE_BYTE:
-            return reg.get_byte()
+            return value & 0xFF
         elif size == OP_SIZE_WORD:
-            return reg.get_word()
-        return reg.get()
+            return value & 0xFFFF
+        return value
 
     def get_pc(self):
         """Get the current program counter."""
-        return self._pc.get()
+        return self._regs[REG_PC]
 
     def get_usp(self):
-        """Set the value of the user stack pointer."""
-        return self._user_stack.get()
+        """Get the value of the user stack pointer."""
+        if self.get_s():
+            return self._regs[REG_USP]
+        return self._regs[REG_A7]
 
     def get_ssp(self):
-        """Set the value of the system stack pointer."""
-        return self._system_stack.get()
+        """Get the value of the system stack pointer."""
+        if self.get_s():
+            return self._regs[REG_A7]
+        return self._regs[REG_SSP]
 
     def get_t1(self):
         """Get the T1 bit from the condition code register."""
-        return self._stat_register.get_bit(15)
+        return (self._regs[REG_SR] >> 15) & 1
 
     def get_s(self):
         """Get the S bit from the condition code register."""
-        return self._stat_register.get_bit(13)
+        return (self._regs[REG_SR] >> 13) & 1
 
     def get_i(self):
         """Get the I bits from the condition code register."""
-        return int_utils.select_bits(self._stat_register.get(), 8, 10)
+        return (self._regs[REG_SR] >> 8) & 7
 
     def get_x(self):
         """Get the X bit from the condition code register."""
-        return self._stat_register.get_bit(4)
+        if self._ccr_kind != CCR_LAZY_NONE:
+            self._update_ccr()
+        return (self._regs[REG_SR] >> 4) & 1
 
     def get_n(self):
         """Get the N bit from the condition code register."""
-        return self._stat_register.get_bit(3)
+        if self._ccr_kind != CCR_LAZY_NONE:
+            self._update_ccr()
+        return (self._regs[REG_SR] >> 3) & 1
 
     def get_z(self):
         """Get the Z bit from the condition code register."""
-        return self._stat_register.get_bit(2)
+        if self._ccr_kind != CCR_LAZY_NONE:
+            self._update_ccr()
+        return (self._regs[REG_SR] >> 2) & 1
 
     def get_v(self):
         """Get the V bit from the condition code register."""
-        return self._stat_register.get_bit(1)
+        if self._ccr_kind != CCR_LAZY_NONE:
+            self._update_ccr()
+        return (self._regs[REG_SR] >> 1) & 1
 
     def get_c(self):
         """Get the C bit from the condition code register."""
-        return self._stat_register.get_bit(0)
+        if self._ccr_kind != CCR_LAZY_NONE:
+            self._update_ccr()
+        return self._regs[REG_SR] & 1
+
+    def get_ccr(self):
+        """Get the value of the condition code register."""
+        if self._ccr_kind != CCR_LAZY_NONE:
+            self._update_ccr()
+        return self._regs[REG_SR] & 0b11111
 
     def get_sr_full(self):
         """Get value of the entire status register."""
-        return self._stat_register.get()
+        if self._ccr_kind != CCR_LAZY_NONE:
+            self._update_ccr()
+        return self._regs[REG_SR]
 
     def get_cycle(self):
         """Get the amount of cycles that have passed so far."""
         return self._cycle
 
+    def get_skipped_cycles(self):
+        """Get the amount of cycles that were skipped in idle loops."""
+        return self._skipped_cycles
+
     # --- Setters ---
 
     def set_d(self, index, value, size=OP_SIZE_LONG):
         """
-        Get the value of the data register with the given index.
+        Set the value of the data register with the given index.
 
         Parameters
         ----------
@@ -225,14 +303,19 @@ class Cpu(object):
 
         size: int, optional
             Defines the section of the register, that should be considered.
-            0 means only the lowest byte, 1 is the lower word and 3 (default)
+            0 means only the lowest byte, 1 is the lower word and 2 (default)
             means the full 32 bits.
         """
-        return self._set_reg(index, self.d_registers, value, size)
+        reg_index = REG_D0 + (index & 0x7)
+        if size == OP_SIZE_BYTE:
+            value = (self._regs[reg_index] & 0xFFFFFF00) | (value & 0xFF)
+        elif size == OP_SIZE_WORD:
+            value = (self._regs[reg_index] & 0xFFFF0000) | (value & 0xFFFF)
+        self._regs[reg_index] = value & 0xFFFFFFFF
 
     def set_a(self, index, value):
         """
-        Get the value of the address register with the given index.
+        Set the value of the address register with the given index.
 
         This always sets all 32 bits.
 
@@ -244,37 +327,27 @@ class Cpu(object):
         value: int
             The new value of the address register.
         """
-        return self._set_reg(index, self.a_registers, value, OP_SIZE_LONG)
-
-    @staticmethod
-    def _set_reg(index, registers, value, size):
-        """Get one of the eight data or address registers."""
-        if index > 7:
-            raise rpython_utils.RIndexError(
-                "No data register with index %d." % index)
-        if size > OP_SIZE_LONG:
-            raise rpython_utils.RValueError(
-                "Invalid size value given: %d" % size)
-
-        reg = registers[index]
-        if size == OP_SIZE_BYTE:
-            reg.set_byte(value)
-        elif size == OP_SIZE_WORD:
-            reg.set_word(value)
-        else:
-            reg.set(value)
+        self._regs[REG_A0 + (index & 0x7)] = value & 0xFFFFFFFF
 
     def set_pc(self, value):
         """Set the current program counter."""
-        self._pc.set(value)
+        self._regs[REG_PC] = value & 0xFFFFFFFF
+        # Execution does not continue sequentially
+        self._block = None
 
     def set_usp(self, value):
         """Set the value of the user stack pointer."""
-        self._user_stack.set(value)
+        if self.get_s():
+            self._regs[REG_USP] = value & 0xFFFFFFFF
+        else:
+            self._regs[REG_A7] = value & 0xFFFFFFFF
 
     def set_ssp(self, value):
         """Set the value of the system stack pointer."""
-        self._system_stack.set(value)
+        if self.get_s():
+            self._regs[REG_A7] = value & 0xFFFFFFFF
+        else:
+            self._regs[REG_SSP] = value & 0xFFFFFFFF
 
     # pylint: disable=invalid-name
     def set_ccr(self, mask, x=False, n=False, z=False, v=False, c=False):
@@ -292,8 +365,144 @@ class Cpu(object):
             Value of each condition code. Default value is ``False``.
         """
         mask = mask & 0b11111
-        self._stat_register.set_bits(
-            mask, c + (v << 1) + (z << 2) + (n << 3) + (x << 4))
+        if mask != 0b11111 and self._ccr_kind != CCR_LAZY_NONE:
+            # The bits that are not changed have to be up to date
+            self._update_ccr()
+        self._ccr_kind = CCR_LAZY_NONE
+        value = c + (v << 1) + (z << 2) + (n << 3) + (x << 4)
+        self._regs[REG_SR] = (self._regs[REG_SR] & ~mask) | (value & mask)
+
+    def set_ccr_logic(self, result, op_size):
+        """
+        Set the condition codes for the result of a logical operation.
+
+        N and Z are set according to ``result``, V and C are cleared and X
+        remains unchanged. The bits are only calculated when they are read.
+
+        Parameters
+        ----------
+        result: int
+            The result of the operation.
+
+        op_size: int
+            The size of the operation.
+        """
+        kind = self._ccr_kind
+        if kind == CCR_LAZY_ADD or kind == CCR_LAZY_SUB:
+            # X of the previous operation is kept
+            self._update_ccr()
+        self._ccr_kind = CCR_LAZY_LOGIC
+        self._ccr_result = result
+        self._ccr_size = op_size
+
+    def set_ccr_add(self, v0, v1, result_raw, op_size):
+        """
+        Set the condition codes for an addition.
+
+        All bits are set. They are only calculated when they are read.
+
+        Parameters
+        ----------
+        v0, v1: int
+            The operands of the addition.
+
+        result_raw: int
+            The sum of both operands, before it is cut to the operation size.
+
+        op_size: int
+            The size of the operation.
+        """
+        self._ccr_kind = CCR_LAZY_ADD
+        self._ccr_dst = v0
+        self._ccr_src = v1
+        self._ccr_result = result_raw
+        self._ccr_size = op_size
+
+    def set_ccr_sub(self, dst, src, result, op_size, set_x):
+        """
+        Set the condition codes for a subtraction or comparison.
+
+        The bits are only calculated when they are read.
+
+        Parameters
+        ----------
+        dst, src: int
+            The operands of ``dst - src``.
+
+        result: int
+            The difference, cut to the operation size.
+
+        op_size: int
+            The size of the operation.
+
+        set_x: bool
+            Whether the X bit is set as well (subtraction) or remains
+            unchanged (comparison).
+        """
+        kind = self._ccr_kind
+        if set_x:
+            self._ccr_kind = CCR_LAZY_SUB
+        else:
+            if kind == CCR_LAZY_ADD or kind == CCR_LAZY_SUB:
+                # X of the previous operation is kept
+                self._update_ccr()
+            self._ccr_kind = CCR_LAZY_CMP
+        self._ccr_dst = dst
+        self._ccr_src = src
+        self._ccr_result = result
+        self._ccr_size = op_size
+
+    def _update_ccr(self):
+        """Calculate the condition codes of the last recorded operation."""
+        kind = self._ccr_kind
+        mask = _SIZE_MASKS[self._ccr_size]
+        msb_mask = _SIZE_MSB_MASKS[self._ccr_size]
+        result = self._ccr_result
+        sr = self._regs[REG_SR]
+        if kind == CCR_LAZY_LOGIC:
+            ccr_mask = CCR_ALL ^ CCR_X
+            ccr = 0
+            if result & msb_mask:
+                ccr |= CCR_N
+            if not result & mask:
+                ccr |= CCR_Z
+        elif kind == CCR_LAZY_ADD:
+            ccr_mask = CCR_ALL
+            ccr = 0
+            # The bit after the MSB is set
+            if result & (mask + 1):
+                ccr |= CCR_X | CCR_C
+            result_msb = result & mask & msb_mask
+            if result_msb:
+                ccr |= CCR_N
+            if not result & mask:
+                ccr |= CCR_Z
+            # Overflow is when the sign of both operands is the same, but the
+            # result has a different one.
+            v0_msb = self._ccr_dst & msb_mask
+            if v0_msb == (self._ccr_src & msb_mask) and v0_msb != result_msb:
+                ccr |= CCR_V
+        elif kind == CCR_LAZY_SUB or kind == CCR_LAZY_CMP:
+            ccr_mask = CCR_ALL if kind == CCR_LAZY_SUB else CCR_ALL ^ CCR_X
+            ccr = 0
+            res_msb = result & msb_mask
+            dst_msb = self._ccr_dst & msb_mask
+            src_msb = self._ccr_src & msb_mask
+            if (src_msb and not dst_msb) \
+                    or (res_msb and not dst_msb) \
+                    or (src_msb and res_msb):
+                ccr |= CCR_X | CCR_C
+            if (not src_msb and dst_msb and not res_msb) \
+                    or (src_msb and not dst_msb and res_msb):
+                ccr |= CCR_V
+            if res_msb:
+                ccr |= CCR_N
+            if not result & mask:
+                ccr |= CCR_Z
+        else:
+            return
+        self._ccr_kind = CCR_LAZY_NONE
+        self._regs[REG_SR] = (sr & ~ccr_mask) | (ccr & ccr_mask)
 
     def set_sr(self, mask, t1=False, s=False, i=0):
         """
@@ -313,15 +522,138 @@ class Cpu(object):
             3-bit value that represents the bits I2 (MSB) to I0 (LSB). Default
             is ``0``.
         """
+        old_s = self.get_s()
         mask = (mask & 0b10100111) << 8
         i &= 7
-        self._stat_register.set_bits(mask, (i << 8) + (s << 13) + (t1 << 15))
+        value = (i << 8) + (s << 13) + (t1 << 15)
+        self._regs[REG_SR] = (self._regs[REG_SR] & ~mask) | (value & mask)
         # Set Stack pointer according to S bit
-        self.a_registers[7] = \
-            self._system_stack if self.get_s() else self._user_stack
+        new_s = self.get_s()
+        if new_s != old_s:
+            if new_s:
+                self._regs[REG_USP] = self._regs[REG_A7]
+                self._regs[REG_A7] = self._regs[REG_SSP]
+            else:
+                self._regs[REG_SSP] = self._regs[REG_A7]
+                self._regs[REG_A7] = self._regs[REG_USP]
 
     # --- Instruction decoding ---
 
+    def run(self, until_cycle):
+        """
+        Execute instructions until the cycle counter reaches ``until_cycle``.
+
+        Pending interrupts are handled as part of the execution. Execution
+        returns early if the CPU enters the stopped state. If the CPU is
+        already stopped and no interrupt can wake it up, the cycle counter is
+        advanced to ``until_cycle`` directly.
+
+        Parameters
+        ----------
+        until_cycle: int
+            The cycle at which control should be returned to the caller.
+
+        Returns
+        -------
+        stop: bool
+            ``True`` iff the execution has stopped.
+        """
+        if self._stopped and self._pending_interrupt <= self.get_i():
+            # Nothing will happen until an interrupt arrives
+            if self._cycle < until_cycle:
+                self._cycle = until_cycle
+            return True
+
+        # Devices may have changed since the last call, so previous iterations
+        # of a loop cannot be compared with the next ones
+        self._idle_target = -1
+        rom = self.mem.get_rom()
+        while True:
+            pc = self._regs[REG_PC]
+            if USE_JIT:
+                JIT_DRIVER.jit_merge_point(pc=pc, rom=rom,
+                                           until_cycle=until_cycle, cpu=self)
+            # Checked after the merge point, so that 'can_enter_jit' is always
+            # followed by it
+            if self._cycle >= until_cycle:
+                return False
+            if self.step():
+                return True
+            next_pc = self._regs[REG_PC]
+            if next_pc <= pc:
+                # Backward branch, this might be a loop in the guest code.
+                # Compiled loops are cheap enough, checking them for being
+                # idle would only slow them down.
+                if self._skip_idle_loops \
+                        and not rpython_utils.we_are_jitted() \
+                        and pc - next_pc <= IDLE_LOOP_MAX_SIZE:
+                    self._skip_idle_loop(next_pc, until_cycle)
+                if USE_JIT:
+                    pc = next_pc
+                    JIT_DRIVER.can_enter_jit(pc=pc, rom=rom,
+                                             until_cycle=until_cycle, cpu=self)
+
+    def _skip_idle_loop(self, target, until_cycle):
+        """
+        Skip iterations of the loop that starts at ``target``, if it is idle.
+
+        Called after each short backward branch. The first iteration without
+        side effects saves the state of the CPU, the next one compares
+        against it. If nothing changed, the loop will behave the same way
+        until ``until_cycle`` and as many whole iterations as fit before it
+        are skipped. The remaining part is executed normally.
+
+        Parameters
+        ----------
+        target: int
+            The address that was branched to.
+
+        until_cycle: int
+            The cycle at which ``run`` returns.
+        """
+        side_effects = self.mem.get_side_effect_count()
+        if target != self._idle_target \
+                or side_effects != self._idle_side_effects:
+            # A new loop or an iteration with side effects
+            self._idle_target = target
+            self._idle_side_effects = side_effects
+            self._idle_saved = False
+        elif self._idle_saved and self._is_idle_state():
+            period = self._cycle - self._idle_cycle
+            if period > 0:
+                iterations = (until_cycle - 1 - self._cycle) // period
+                if iterations > 0:
+                    skipped = iterations * period
+                    self._cycle += skipped
+                    self._skipped_cycles += skipped
+        else:
+            self._save_idle_state()
+        self._idle_cycle = self._cycle
+
+    def _save_idle_state(self):
+        """Save the state that is compared by ``_is_idle_state``."""
+        for i in range(REG_COUNT):
+            self._idle_regs[i] = self._regs[i]
+        self._idle_ccr_kind = self._ccr_kind
+        self._idle_ccr_dst = self._ccr_dst
+        self._idle_ccr_src = self._ccr_src
+        self._idle_ccr_result = self._ccr_result
+        self._idle_ccr_size = self._ccr_size
+        self._idle_saved = True
+
+    def _is_idle_state(self):
+        """Returns ``True`` iff the state equals the one saved last."""
+        if self._ccr_kind != self._idle_ccr_kind \
+                or self._ccr_dst != self._idle_ccr_dst \
+                or self._ccr_src != self._idle_ccr_src \
+                or self._ccr_result != self._idle_ccr_result \
+                or self._ccr_size != self._idle_ccr_size:
+            return False
+        for i in range(REG_COUNT):
+            if self._regs[i] != self._idle_regs[i]:
+                return False
+        return True
+
     def step(self, do_trace=True):
         """
         Execute the next instruction as indicated by the program counter.
@@ -342,8 +674,6 @@ class Cpu(object):
         """
         # Check for pending interrupts
         if self._pending_interrupt > self.get_i():
-            if self._verbose:
-                print("### Handling pending interrupt")
             # Execute the interrupt handler now
             self._interrupt_trap(self._pending_interrupt)
             self._pending_interrupt = 0
@@ -356,44 +686,23 @@ class Cpu(object):
         # Check stopped state
         if self._stopped:
             # Stopped state will be broken as soon as an interrupt arrives
-            if self._verbose:
-                print("### Waiting for interrupt...")
             # Doing this so the cycle counter never remains stagnant
             self.increment_cycles(1)
             return True
 
-        if USE_JIT:
-            JIT_DRIVER.jit_merge_point(pc=self._pc.get(),
-                                       rom=self.mem.get_rom_list())
-
         # Only trace if not disabled from the outside
         # This is not a feature of the CPU, but of this emulator to make
         # testing a little more comfortable
         do_trace &= bool(self.get_t1())
 
-        if self._verbose:
-            # Print the state before op code fetch to help if it fails there
-            print("###############\n%s" % self.__str__())
-
-        op_code = self.fetch_next()
-
-        if self._verbose:
-            pc = self.get_pc()
-            print("### Executing opcode: 0x%s\n"
-                  "###       0b%s"
-                  % (int_utils.to_32x_string(op_code)[4:],
-                     int_utils.to_16b_string(op_code)))
+        op_code, entry = self._fetch_decoded()
 
         try:
-            self._execute(op_code)
+            self._execute(op_code, entry)
             if do_trace:
-                if self._verbose:
-                    print("### Entering Trace")
                 self.cause_trap(9)
                 self.increment_cycles(34)
-        except IllegalInstruction as e:
-            if self._verbose:
-                print("### Illegal instruction detected: %s" % e._message)
+        except IllegalInstruction:
             upper_bits = (op_code & 0xF000) >> 12
             if upper_bits == 0b1010:
                 # Line 1010 Emulator
@@ -406,660 +715,101 @@ class Cpu(object):
                 vector_number = 4
             self.cause_trap(vector_number)
             self.increment_cycles(34)
-        except PrivilegeError as e:
-            if self._verbose:
-                print("### Unprivileged execution: %s" % e._message)
+        except PrivilegeError:
             self.cause_trap(8, pc_offset=-2)
             self.increment_cycles(34)
 
-        if self._stopped and self._verbose:
-            print("### Stopping execution")
-
         return self._stopped
 
     def fetch_next(self):
         """Increment the PC and read the next instruction word."""
         pc = self.get_pc()
-        self.set_pc(pc + 2)
+        self._regs[REG_PC] = (pc + 2) & 0xFFFFFFFF
+        return self._read_code(pc)
+
+    def _read_code(self, pc):
+        """
+        Read the instruction word at the given PC.
+
+        Words in cartridge ROM are read without going through the memory
+        interface, which only has to be asked for code that runs elsewhere.
+        """
+        address = pc & 0xFFFFFF
+        if address < ROM_END:
+            return self._rom.read_const(address)
         return self.mem.read(pc)
 
-    def _execute(self, op_code):
-        upper_bits = (op_code & 0xF000) >> 12
-        execute_method = OP_GROUPS[upper_bits]
-        execute_method(self, op_code)
-
-    def _raise_illegal_op_code(self, op_code):
-        raise IllegalInstruction(
-            "Unknown OP code: 0b%s" % int_utils.to_16b_string(op_code))
-
-    def _execute_bit_movep_imm(self, op_code):
-        """Bit manipulation, MOVEP and Immediate instructions."""
-        ea_mode, ea_register = ea.split(
-            int_utils.select_bits(op_code, 0, 5))
-        upper_byte = int_utils.select_bits(op_code, 8, 15)
-        bits_6_15 = int_utils.select_bits(op_code, 6, 15)
-        bits_6_8 = int_utils.select_bits(op_code, 6, 8)
-        is_data_alterable = ea.is_data_alterable(ea_mode, ea_register)
-
-        if op_code == 0x3C:
-            # ORI to CCR
-            if self._verbose:
-                print("### ORI to CCR")
-            ins.ori_to_ccr(self)
-
-        elif op_code == 0x7C:
-            # ORI to SR
-            if self._verbose:
-                print("### ORI to SR")
-            ins.ori_to_sr(self)
-
-        elif upper_byte == 0 and is_data_alterable:
-            # ORI
-            if self._verbose:
-                print("### ORI")
-            ins.ori(self, bits_6_8, ea_mode, ea_register)
-
-        elif op_code == 0x23C:
-            # ANDI to CCR
-            if self._verbose:
-                print("### ANDI to CCR")
-            ins.andi_to_ccr(self)
-
-        elif op_code == 0x27C:
-            # ANDI to SR
-            if self._verbose:
-                print("### ANDI to SR")
-            ins.andi_to_sr(self)
-
-        elif upper_byte == 2 and is_data_alterable:
-            # ANDI
-            if self._verbose:
-                print("### ANDI")
-            ins.andi(self,
-                     int_utils.select_bits(op_code, 6, 7),
-                     ea_mode, ea_register)
-
-        elif upper_byte == 4 and is_data_alterable:
-            # SUBI
-            if self._verbose:
-                print("### SUBI")
-            ins.subi(self, bits_6_8, ea_mode, ea_register)
-
-        elif upper_byte == 6 and is_data_alterable:
-            # ADDI
-            if self._verbose:
-                print("### ADDI")
-            op_size = int_utils.select_bits(op_code, 6, 7)
-            ins.addi(self, op_size, ea_mode, ea_register)
-
-        elif op_code == 0xA3C:
-            # EORI to CCR
-            if self._verbose:
-                print("### EORI to CCR")
-            ins.eori_to_ccr(self)
-
-        elif op_code == 0xA7C:
-            # EORI to SR
-            if self._verbose:
-                print("### EORI to SR")
-            ins.eori_to_sr(self)
-
-        elif upper_byte == 0xA and is_data_alterable:
-            # EORI
-            if self._verbose:
-                print("### EORI")
-            ins.eori(self,
-                     int_utils.select_bits(op_code, 6, 7),
-                     ea_mode, ea_register)
-
-        elif upper_byte == 0xC and is_data_alterable:
-            # CMPI
-            if self._verbose:
-                print("### CMPI")
-            ins.cmpi(self,
-                     int_utils.select_bits(op_code, 6, 7),
-                     ea_mode, ea_register)
-
-        elif is_data_alterable and (bits_6_8 == 4 or bits_6_15 == 0x20):
-            # BTST
-            if self._verbose:
-                print("### BTST")
-            ins.btst(self,
-                     int_utils.select_bits(op_code, 9, 11),
-                     upper_byte & 1,
-                     ea_mode, ea_register)
-
-        elif is_data_alterable and (bits_6_8 == 5 or bits_6_15 == 0x21):
-            # BCHG
-            if self._verbose:
-                print("### BCHG")
-            ins.bchg(self,
-                     int_utils.select_bits(op_code, 9, 11),
-                     upper_byte & 1,
-                     ea_mode, ea_register)
-
-        elif is_data_alterable and (bits_6_8 == 6 or bits_6_15 == 0x22):
-            # BCLR
-            if self._verbose:
-                print("### BCLR")
-            ins.bclr(self,
-                     int_utils.select_bits(op_code, 9, 11),
-                     upper_byte & 1,
-                     ea_mode, ea_register)
-
-        elif is_data_alterable and (bits_6_8 == 7 or bits_6_15 == 0x23):
-            # BSET
-            if self._verbose:
-                print("### BSET")
-            ins.bset(self,
-                     int_utils.select_bits(op_code, 9, 11),
-                     upper_byte & 1,
-                     ea_mode, ea_register)
-
-        elif ea_mode == 1 and int_utils.select_bits(op_code, 8) == 1:
-            # MOVEP
-            if self._verbose:
-                print("### MOVEP")
-            ins.movep(self,
-                      int_utils.select_bits(op_code, 9, 11),
-                      ea_register,
-                      (bits_6_8 >> 1) & 1,
-                      bits_6_8 & 1)
+    def _fetch_decoded(self):
+        """
+        Fetch the next operation word together with its decoded form.
 
-        else:
-            self._raise_illegal_op_code(op_code)
-
-    def _execute_move(self, op_code):
-        """MOVE instructions"""
-        size = op_code >> 12
-        src_mode, src_register = ea.split(op_code)
-        # Order is swapped here!
-        dst_register, dst_mode = ea.split(op_code >> 6)
-        src_valid = ea.is_valid(src_mode, src_register)
-
-        if src_valid and ea.is_data_alterable(dst_mode, dst_register):
-            # MOVE
-            if self._verbose:
-                print("### MOVE")
-            ins.move(
-                self, dst_mode, dst_register, src_mode, src_register, size)
-        elif src_valid and dst_mode == EA_MODE_REG_A and size != 1:
-            # MOVEA
-            if self._verbose:
-                print("### MOVEA")
-            ins.movea(self, dst_register, src_mode, src_register, size)
-        else:
-            self._raise_illegal_op_code(op_code)
-
-    def _execute_misc(self, op_code):
-        """Executes various instructions."""
-        bits_6_11 = int_utils.select_bits(op_code, 6, 11)
-        bits_6_7 = bits_6_11 & 3
-        bits_6_8 = bits_6_11 & 7
-        bits_8_11 = int_utils.select_bits(op_code, 8, 11)
-
-        ea_mode, ea_register = ea.split(op_code)
-        is_data_alterable = ea.is_data_alterable(ea_mode, ea_register)
-        is_data = ea.is_data(ea_mode, ea_register)
-        is_control = ea.is_control(ea_mode, ea_register)
-        is_valid = ea.is_valid(ea_mode, ea_register)
-
-        if bits_6_11 == 3 and is_data_alterable:
-            # MOVE from SR
-            if self._verbose:
-                print("### MOVE from SR")
-            ins.move_from_sr(self, ea_mode, ea_register)
-        elif bits_6_7 != 3 and bits_8_11 == 0 and is_data_alterable:
-            # NEGX
-            if self._verbose:
-                print("### NEGX")
-            ins.negx(self, bits_6_7, ea_mode, ea_register)
-        elif bits_6_7 != 3 and bits_8_11 == 2 and is_data_alterable:
-            # CLR
-            if self._verbose:
-                print("### CLR")
-            ins.clr(self, bits_6_7, ea_mode, ea_register)
-        elif bits_6_11 == 0x13 and is_data:
-            # MOVE to CCR
-            if self._verbose:
-                print("### MOVE to CCR")
-            ins.move_to_ccr(self, ea_mode, ea_register)
-        elif bits_6_7 != 3 and bits_8_11 == 4 and is_data_alterable:
-            # NEG
-            if self._verbose:
-                print("### NEG")
-            ins.neg(self, bits_6_7, ea_mode, ea_register)
-        elif bits_6_7 != 3 and bits_8_11 == 6 and is_data_alterable:
-            # NOT
-            if self._verbose:
-                print("### NOT")
-            ins.not_(self, bits_6_7, ea_mode, ea_register)
-        elif bits_6_11 == 0x1B and is_data:
-            # MOVE to SR
-            if self._verbose:
-                print("### MOVE to SR")
-            ins.move_to_sr(self, ea_mode, ea_register)
-        elif ea_mode == 0 and (bits_6_11 == 0x22 or bits_6_11 == 0x23):
-            # EXT
-            if self._verbose:
-                print("### EXT")
-            ins.ext(self, ea_register, bits_6_11 & 1)
-        elif bits_6_11 == 0x20 and is_data_alterable:
-            # NBCD
-            if self._verbose:
-                print("### NBCD")
-            ins.nbcd(self, ea_mode, ea_register)
-        elif ea_mode == 0 and bits_6_11 == 0x21:
-            # SWAP
-            if self._verbose:
-                print("### SWAP")
-            ins.swap(self, ea_register)
-        elif is_control and bits_6_11 == 0x21:
-            # PEA
-            if self._verbose:
-                print("### PEA")
-            ins.pea(self, ea_mode, ea_register)
-        elif op_code == 0x4AFC:
-            # ILLEGAL
-            if self._verbose:
-                print("### ILLEGAL")
-            ins.illegal(self)
-        elif is_data_alterable and bits_6_11 == 0x2B:
-            # TAS
-            if self._verbose:
-                print("### TAS")
-            ins.tas(self, ea_mode, ea_register)
-        elif bits_6_7 != 3 and bits_8_11 == 0xA and is_valid:
-            # TST
-            if self._verbose:
-                print("### TST")
-            ins.tst(self, bits_6_7, ea_mode, ea_register)
-        elif ea_mode < 2 and bits_6_11 == 0x39:
-            # TRAP
-            if self._verbose:
-                print("### TRAP")
-            ins.trap(self, int_utils.select_bits(op_code, 0, 3))
-        elif ea_mode == 2 and bits_6_11 == 0x39:
-            # LINK
-            if self._verbose:
-                print("### LINK")
-            ins.link(self, ea_register)
-        elif ea_mode == 3 and bits_6_11 == 0x39:
-            # UNLK
-            if self._verbose:
-                print("### UNLK")
-            ins.unlk(self, ea_register)
-        elif (ea_mode == 4 or ea_mode == 5) and bits_6_11 == 0x39:
-            # MOVE USP
-            if self._verbose:
-                print("### MOVE USP")
-            ins.move_usp(self, ea_register, ea_mode & 1)
-        elif op_code == 0x4E70:
-            # RESET
-            if self._verbose:
-                print("### RESET")
-            ins.reset(self)
-        elif op_code == 0x4E71:
-            # NOP
-            if self._verbose:
-                print("### NOP")
-            ins.nop(self)
-        elif op_code == 0x4E72:
-            # STOP
-            if self._verbose:
-                print("### STOP")
-            ins.stop(self)
-        elif op_code == 0x4E73:
-            # RTE
-            if self._verbose:
-                print("### RTE")
-            ins.rte(self)
-        elif op_code == 0x4E75:
-            # RTS
-            if self._verbose:
-                print("### RTS")
-            ins.rts(self)
-        elif op_code == 0x4E76:
-            # TRAPV
-            if self._verbose:
-                print("### TRAPV")
-            ins.trapv(self)
-        elif op_code == 0x4E77:
-            # RTR
-            if self._verbose:
-                print("### RTR")
-            ins.rtr(self)
-        elif is_control and bits_6_11 == 0x3A:
-            # JSR
-            if self._verbose:
-                print("### JSR")
-            ins.jsr(self, ea_mode, ea_register)
-        elif is_control and bits_6_11 == 0x3B:
-            # JMP
-            if self._verbose:
-                print("### JMP")
-            ins.jmp(self, ea_mode, ea_register)
-        elif (ea_mode > 1 and (ea_mode != 7 or ea_register < 2)) \
-                and int_utils.select_bits(op_code, 11) == 1 \
-                and int_utils.select_bits(op_code, 7, 9) == 1:
-            # MOVEM
-            if self._verbose:
-                print("### MOVEM")
-            ins.movem(self,
-                      int_utils.select_bits(op_code, 10),
-                      bits_6_7 & 1,
-                      ea_mode, ea_register)
-        elif is_control and bits_6_8 == 7:
-            # LEA
-            if self._verbose:
-                print("### LEA")
-            ins.lea(self, bits_8_11 >> 1, ea_mode, ea_register)
-        elif is_data and bits_6_8 == 6:
-            # CHK
-            if self._verbose:
-                print("### CHK")
-            ins.chk(self,
-                    int_utils.select_bits(op_code, 9, 11),
-                    ea_mode, ea_register)
-        else:
-            self._raise_illegal_op_code(op_code)
-
-    def _execute_quick_scc_dbcc(self, op_code):
-        """ADDQ, SUBQ, Scc or DBcc."""
-        op_size = int_utils.select_bits(op_code, 6, 7)
-        ea_mode, ea_register = ea.split(int_utils.select_bits(op_code, 0, 5))
-        if op_size == 3:
-            if ea_mode == EA_MODE_REG_A:
-                # DBcc
-                if self._verbose:
-                    print("### DBcc")
-                ins.dbcc(self,
-                         ea_register,
-                         int_utils.select_bits(op_code, 8, 11))
-            else:
-                # Scc
-                if self._verbose:
-                    print("### Scc")
-                ins.scc(self,
-                        int_utils.select_bits(op_code, 8, 11),
-                        ea_mode,
-                        ea_register)
-        else:
-            value = int_utils.select_bits(op_code, 9, 11)
-            if int_utils.select_bits(op_code, 8) == 0:
-                # ADDQ
-                if self._verbose:
-                    print("### ADDQ")
-                ins.addq(self, value, op_size, ea_mode, ea_register)
-            else:
-                # SUBQ
-                if self._verbose:
-                    print("### SUBQ")
-                ins.subq(self, value, op_size, ea_mode, ea_register)
-
-    def _execute_branch(self, op_code):
-        condition = int_utils.select_bits(op_code, 8, 11)
-        offset = op_code & 0xFF
-        if condition == 0:
-            # BRA
-            if self._verbose:
-                print("### BRA")
-            ins.bra(self, offset)
-        elif condition == 1:
-            # BSR
-            if self._verbose:
-                print("### BSR")
-            ins.bsr(self, offset)
-        else:
-            # Bcc
-            if self._verbose:
-                print("### Bcc")
-            ins.bcc(self, condition, offset)
-
-    def _execute_moveq(self, op_code):
-        if not (op_code & 0x100):
-            if self._verbose:
-                print("### MOVEQ")
-            ins.moveq(self,
-                      int_utils.select_bits(op_code, 9, 11),
-                      op_code & 0xFF)
-        else:
-            self._raise_illegal_op_code(op_code)
-
-    def _execute_or_div_sbcd(self, op_code):
-        ea_mode, ea_register = ea.split(op_code)
-        register_index = int_utils.select_bits(op_code, 9, 11)
-        bits_6_8 = int_utils.select_bits(op_code, 6, 8)
-        bit8 = bits_6_8 >> 2
-
-        if bits_6_8 == 3:
-            # DIVU
-            if self._verbose:
-                print("### DIVU")
-            ins.divu(self, register_index, ea_mode, ea_register)
-        elif bits_6_8 == 7:
-            # DIVS
-            if self._verbose:
-                print("### DIVS")
-            ins.divs(self, register_index, ea_mode, ea_register)
-        elif bits_6_8 == 4 and ea_mode < 2:
-            # SBCD
-            if self._verbose:
-                print("### SBCD")
-            ins.sbcd(self, register_index, ea_register, ea_mode)
-        else:
-            # OR
-            if self._verbose:
-                print("### OR")
-            ins.or_(self,
-                    register_index,
-                    bit8,
-                    bits_6_8 & 3,
-                    ea_mode,
-                    ea_register)
-
-    def _execute_sub(self, op_code):
-        """SUB, SUBA or SUBX."""
-        ea_mode, ea_register = ea.split(op_code)
-        op_type = int_utils.select_bits(op_code, 8)
-        op_size = int_utils.select_bits(op_code, 6, 7)
-        register_index = int_utils.select_bits(op_code, 9, 11)
-        if op_size == 3:
-            # SUBA
-            if self._verbose:
-                print("### SUBA")
-            ins.suba(self, register_index, op_type, ea_mode, ea_register)
-        elif op_type == 1 and ea_mode < 2:
-            # SUBX
-            if self._verbose:
-                print("### SUBX")
-            ins.subx(self, register_index, ea_register, ea_mode, op_size)
-        else:
-            # SUB
-            if self._verbose:
-                print("### SUB")
-            ins.sub(
-                self, register_index, op_type, op_size, ea_mode, ea_register)
-
-    def _execute_cmp_eor(self, op_code):
-        ea_mode, ea_register = ea.split(op_code)
-        size = int_utils.select_bits(op_code, 6, 7)
-        register_index = int_utils.select_bits(op_code, 9, 11)
-        bit8 = int_utils.select_bits(op_code, 8)
-
-        if size == 3:
-            # CMPA
-            if self._verbose:
-                print("### CMPA")
-            ins.cmpa(self, register_index, bit8, ea_mode, ea_register)
-        elif bit8 == 0:
-            # CMP
-            if self._verbose:
-                print("### CMP")
-            ins.cmp_(self, register_index, size, ea_mode, ea_register)
-        elif ea_mode == 1:
-            # CMPM
-            if self._verbose:
-                print("### CMPM")
-            ins.cmpm(self, register_index, ea_register, size)
-        else:
-            # EOR
-            if self._verbose:
-                print("### EOR")
-            ins.eor(self, register_index, size, ea_mode, ea_register)
-
-    def _execute_and_mul_abcd_exg(self, op_code):
-        """AND, MUL, ABCD or EXG."""
-        size = int_utils.select_bits(op_code, 6, 7)
-        op_type = int_utils.select_bits(op_code, 8)
-        ea_mode, ea_register = ea.split(op_code & 0x3F)
-        register_dst = int_utils.select_bits(op_code, 9, 11)
-
-        if size == 3:
-            if op_type == 0:
-                # MULU
-                if self._verbose:
-                    print("### MULU")
-                ins.mulu(self, register_dst, ea_mode, ea_register)
-            else:
-                # MULS
-                if self._verbose:
-                    print("### MULS")
-                ins.muls(self, register_dst, ea_mode, ea_register)
-
-        elif int_utils.select_bits(op_code, 4, 8) == 0x10:
-            # ABCD
-            if self._verbose:
-                print("### ABCD")
-            register_src = int_utils.select_bits(op_code, 0, 2)
-            # Use another bit for op_type
-            op_type = int_utils.select_bits(op_code, 3)
-            ins.abcd(self, register_src, register_dst, op_type)
-
-        elif op_type == 1 and int_utils.select_bits(op_code, 4, 5) == 0:
-            # EXG
-            if self._verbose:
-                print("### EXG")
-            register_src = int_utils.select_bits(op_code, 0, 2)
-            ins.exg(self,
-                    register_dst,
-                    register_src,
-                    int_utils.select_bits(op_code, 3, 7))
+        The instruction is taken from the block cache if possible. Otherwise it
+        is read from memory and added to the current block.
 
-        else:
-            # AND
-            if self._verbose:
-                print("### AND")
-            ins.and_(
-                self,
-                register_dst,
-                op_type,
-                size,
-                ea_mode, ea_register
-            )
+        Returns
+        -------
+        op_code: int
+            The operation word.
 
-    def _execute_add(self, op_code):
-        """ADD, ADDA or ADDX"""
-        register_index = int_utils.select_bits(op_code, 9, 11)
-        ea_mode = int_utils.select_bits(op_code, 3, 5)
-        # Bits 2-0 are the effective address register index
-        ea_register = op_code & 7
-        # Bit 8 is 'op_type' for ADD and 'op_size' for ADDA
-        bit8 = int_utils.select_bits(op_code, 8)
-        op_size = int_utils.select_bits(op_code, 6, 7)
-        if op_size == 3:
-            # ADDA
-            if self._verbose:
-                print("### ADDA")
-            ins.adda(self, register_index, bit8, ea_mode, ea_register)
-        elif not bit8 or ea_mode > 1:
-            # ADD
-            if self._verbose:
-                print("### ADD")
-            ins.add(self, register_index, bit8, op_size, ea_mode, ea_register)
-        else:
-            # ADDX
-            if self._verbose:
-                print("### ADDX")
-            ins.addx(self, ea_register, register_index, ea_mode, op_size)
-
-    def _execute_shift_rotate(self, op_code):
-        """ASd, LSd, ROXd or ROd."""
-        op_size = int_utils.select_bits(op_code, 6, 7)
-        shift_amount = int_utils.select_bits(op_code, 9, 11)
-        direction = int_utils.select_bits(op_code, 8)
-        ea_register = int_utils.select_bits(op_code, 0, 2)
-        if op_size == 3:
-            # Memory shift/rotate
-            ea_mode = int_utils.select_bits(op_code, 3, 5)
-            # Register index determines action
-            if shift_amount == 0:
-                # ASd
-                if self._verbose:
-                    print("### ASd")
-                ins.asl_asr_to_mem(self, direction, ea_mode, ea_register)
-            elif shift_amount == 1:
-                # LSd
-                if self._verbose:
-                    print("### LSd")
-                ins.lsl_lsr_to_mem(self, direction, ea_mode, ea_register)
-            elif shift_amount == 2:
-                # ROXd
-                if self._verbose:
-                    print("### ROXd")
-                ins.roxl_roxr_to_mem(self, direction, ea_mode, ea_register)
-            elif shift_amount == 3:
-                # ROd
-                if self._verbose:
-                    print("### ROd")
-                ins.rol_ror_to_mem(self, direction, ea_mode, ea_register)
-            else:
-                self._raise_illegal_op_code(op_code)
-        else:
-            # Data register shift/rotate
-            op_type = int_utils.select_bits(op_code, 5)
-            # Bits 3-4 determine action
-            action_index = int_utils.select_bits(op_code, 3, 4)
-            if action_index == 0:
-                # ASd
-                if self._verbose:
-                    print("### ASd")
-                ins.asl_asr_to_data(self,
-                                    ea_register,
-                                    shift_amount,
-                                    op_type,
-                                    op_size,
-                                    direction)
-            elif action_index == 1:
-                # LSd
-                if self._verbose:
-                    print("### LSd")
-                ins.lsl_lsr_to_data(self,
-                                    ea_register,
-                                    shift_amount,
-                                    op_type,
-                                    op_size,
-                                    direction)
-            elif action_index == 2:
-                # ROXd
-                if self._verbose:
-                    print("### ROXd")
-                ins.roxl_roxr_to_data(self,
-                                      ea_register,
-                                      shift_amount,
-                                      op_type,
-                                      op_size,
-                                      direction)
-            else:
-                # ROd
-                if self._verbose:
-                    print("### ROd")
-                ins.rol_ror_to_data(self,
-                                    ea_register,
-                                    shift_amount,
-                                    op_type,
-                                    op_size,
-                                    direction)
+        entry: int
+            The operation word's entry in ``m68k.decoder.DECODE_TABLE``.
+        """
+        if rpython_utils.we_are_jitted():
+            # The JIT does not need the block cache. Code in ROM never changes,
+            # so with a known PC the operation word and its decoding are
+            # constants within a trace.
+            pc = rpython_utils.promote(self._regs[REG_PC])
+            address = pc & 0xFFFFFF
+            if address < ROM_END:
+                op_code = self._rom.read_const(address)
+                self._regs[REG_PC] = (pc + 2) & 0xFFFFFFFF
+                return op_code, decoder.lookup(op_code)
+
+        pc = self.get_pc()
+        block = self._block
+        index = self._block_index
+        if block is not None:
+            if not block.valid:
+                block = None
+            elif index < len(block.pcs):
+                if block.pcs[index] != pc:
+                    block = None
+            elif block.closed:
+                block = None
+
+        if block is None:
+            block = self._block_cache.get(pc)
+            index = 0
+            if block is None:
+                # Not cacheable
+                op_code = self.fetch_next()
+                return op_code, decoder.DECODE_TABLE[op_code]
+
+        if index == len(block.pcs):
+            # First execution of this instruction within the block
+            op_code = self._read_code(pc)
+            self._block_cache.append(
+                block, pc, op_code, decoder.DECODE_TABLE[op_code])
+
+        self._block = block
+        self._block_index = index + 1
+        self._regs[REG_PC] = (pc + 2) & 0xFFFFFFFF
+        return block.op_codes[index], block.entries[index]
+
+    def _execute(self, op_code, entry):
+        """
+        Execute the instruction given by the operation word.
+
+        ``entry`` is the operation word's entry in
+        ``m68k.decoder.DECODE_TABLE``.
+        """
+        decoder.get_handler(entry & 0xFF)(
+            self, op_code,
+            (entry >> 8) & 0xFF,
+            (entry >> 16) & 0xFF,
+            (entry >> 24) & 0xFF,
+            (entry >> 32) & 0xFF,
+            (entry >> 40) & 0xFF)
 
     # --- Other instance methods ---
 
@@ -1078,21 +828,20 @@ class Cpu(object):
         if size == OP_SIZE_WORD:
             self.mem.write(stack_pointer, value)
         else:
-            self.mem.write(stack_pointer, value >> 16)
-            self.mem.write(stack_pointer + 2, value)
+            self.mem.write_long(stack_pointer, value)
         self.set_a(7, stack_pointer)
 
     def pop(self, size=OP_SIZE_WORD):
         """Pop a vlaue from the currently active stack."""
         stack_pointer = self.get_a(7)
-        value = self.mem.read(stack_pointer)
         if size == OP_SIZE_BYTE:
-            value = value & 0xFF
+            value = self.mem.read(stack_pointer) & 0xFF
             offset = 2
         elif size == OP_SIZE_WORD:
+            value = self.mem.read(stack_pointer)
             offset = 2
         else:
-            value = (value << 16) | self.mem.read(stack_pointer + 2)
+            value = self.mem.read_long(stack_pointer)
             offset = 4
         self.set_a(7, stack_pointer + offset)
         return value
@@ -1146,8 +895,6 @@ class Cpu(object):
 
         Note that this does not increment the cycle counter.
         """
-        if self._verbose:
-            print("### Causing trap %d" % vector_number)
         # Leave stopped state when a trap occurs
         self._stopped = False
         vector_offset = vector_number * 4
@@ -1155,17 +902,81 @@ class Cpu(object):
         self.set_sr(SR_T1 | SR_S, t1=False, s=True)
         self.push(self.get_pc() + pc_offset, OP_SIZE_LONG)
         self.push(old_sr)
-        new_pc = \
-            (self.mem.read(vector_offset) << 16) \
-            + self.mem.read(vector_offset + 2)
-        self.set_pc(new_pc)
+        self.set_pc(self.mem.read_long(vector_offset))
 
     def set_stopped(self):
         """Set the stopped state to true."""
         self._stopped = True
 
     def set_verbose(self, verbose):
-        self._verbose = bool(verbose)
+        """
+        Enable or disable printing of executed instructions.
+
+        Has no effect, only ``TracingCpu`` prints executed instructions.
+        """
+
+    def set_skip_idle_loops(self, skip_idle_loops):
+        """
+        Enable or disable skipping of idle loops in ``run``.
+
+        An idle loop is a short loop in which the state of the CPU is the same
+        at the start of each iteration and that accesses memory without side
+        effects, e.g. to wait for the VBLANK bit of the VDP status or a flag
+        in RAM that is only changed by an interrupt handler. Nothing can
+        change until ``run`` returns, so whole iterations are skipped by only
+        advancing the cycle counter. The result is the same as running them.
+        """
+        self._skip_idle_loops = bool(skip_idle_loops)
+
+    # --- Save states ---
+
+    def save_state(self, writer):
+        """Write the registers to a ``megadrive.state.StateWriter``."""
+        for i in range(REG_COUNT):
+            writer.write_u32(self._regs[i])
+        writer.write_u8(self._ccr_kind)
+        writer.write_i64(self._ccr_dst)
+        writer.write_i64(self._ccr_src)
+        writer.write_i64(self._ccr_result)
+        writer.write_u8(self._ccr_size)
+        writer.write_i64(self._cycle)
+        writer.write_u8(self._pending_interrupt)
+        writer.write_bool(self._stopped)
+        writer.write_i64(self._skipped_cycles)
+
+    def load_state(self, reader):
+        """
+        Read the registers written by ``save_state`` from a
+        ``megadrive.state.StateReader``.
+
+        Decoded instructions are dropped, since the code in RAM may differ.
+        A ``utils.rpython_utils.StateError`` is raised for unknown lazy
+        condition codes.
+        """
+        for i in range(REG_COUNT):
+            self._regs[i] = reader.read_u32()
+        ccr_kind = reader.read_u8()
+        if ccr_kind > CCR_LAZY_CMP:
+            raise rpython_utils.StateError(
+                "Unknown kind of condition codes %d" % ccr_kind)
+        self._ccr_kind = ccr_kind
+        self._ccr_dst = reader.read_i64()
+        self._ccr_src = reader.read_i64()
+        self._ccr_result = reader.read_i64()
+        ccr_size = reader.read_u8()
+        if ccr_size >= len(_SIZE_MASKS):
+            raise rpython_utils.StateError(
+                "Unknown size of condition codes %d" % ccr_size)
+        self._ccr_size = ccr_size
+        self._cycle = reader.read_i64()
+        self._pending_interrupt = reader.read_u8()
+        self._stopped = reader.read_bool()
+        self._skipped_cycles = reader.read_i64()
+        self._block_cache.clear()
+        self._block = None
+        self._block_index = 0
+        self._idle_target = -1
+        self._idle_saved = False
 
     def _ram_to_string_save(self, address):
         if address >= 0xFF0000 and address <= 0xFFFFFF:
@@ -1194,43 +1005,113 @@ cycle = %d
   T-S--III---XNZVC
   %s
 """) % (self.get_cycle(),
-        int_utils.to_32x_string(self.d_registers[0].get()),
-        int_utils.to_32x_string(self.a_registers[0].get()),
-        int_utils.to_32x_string(self.d_registers[1].get()),
-        int_utils.to_32x_string(self.a_registers[1].get()),
-        int_utils.to_32x_string(self.d_registers[2].get()),
-        int_utils.to_32x_string(self.a_registers[2].get()),
-        int_utils.to_32x_string(self.d_registers[3].get()),
-        int_utils.to_32x_string(self.a_registers[3].get()),
-        int_utils.to_32x_string(self.d_registers[4].get()),
-        int_utils.to_32x_string(self.a_registers[4].get()),
-        int_utils.to_32x_string(self.d_registers[5].get()),
-        int_utils.to_32x_string(self.a_registers[5].get()),
-        int_utils.to_32x_string(self.d_registers[6].get()),
-        int_utils.to_32x_string(self.a_registers[6].get()),
-        int_utils.to_32x_string(self.d_registers[7].get()),
-        int_utils.to_32x_string(self.a_registers[7].get()),
-        int_utils.to_32x_string(self._user_stack.get()),
-        int_utils.to_32x_string(self._system_stack.get()),
-        int_utils.to_32x_string(self._pc.get()),
-        int_utils.to_16b_string(self._stat_register.get()))
-
-
-OP_GROUPS = [
-    Cpu._execute_bit_movep_imm,  # 0
-    Cpu._execute_move,  # 1
-    Cpu._execute_move,  # 2
-    Cpu._execute_move,  # 3
-    Cpu._execute_misc,  # 4
-    Cpu._execute_quick_scc_dbcc,  # 5
-    Cpu._execute_branch,  # 6
-    Cpu._execute_moveq,  # 7
-    Cpu._execute_or_div_sbcd,  # 8
-    Cpu._execute_sub,  # 9
-    Cpu._raise_illegal_op_code,  # 0xA
-    Cpu._execute_cmp_eor,  # 0xB
-    Cpu._execute_and_mul_abcd_exg,  # 0xC
-    Cpu._execute_add,  # 0xD
-    Cpu._execute_shift_rotate,  # 0xE
-    Cpu._raise_illegal_op_code,  # 0xF
-]
+        int_utils.to_32x_string(self._regs[REG_D0]),
+        int_utils.to_32x_string(self._regs[REG_A0]),
+        int_utils.to_32x_string(self._regs[REG_D0 + 1]),
+        int_utils.to_32x_string(self._regs[REG_A0 + 1]),
+        int_utils.to_32x_string(self._regs[REG_D0 + 2]),
+        int_utils.to_32x_string(self._regs[REG_A0 + 2]),
+        int_utils.to_32x_string(self._regs[REG_D0 + 3]),
+        int_utils.to_32x_string(self._regs[REG_A0 + 3]),
+        int_utils.to_32x_string(self._regs[REG_D0 + 4]),
+        int_utils.to_32x_string(self._regs[REG_A0 + 4]),
+        int_utils.to_32x_string(self._regs[REG_D0 + 5]),
+        int_utils.to_32x_string(self._regs[REG_A0 + 5]),
+        int_utils.to_32x_string(self._regs[REG_D0 + 6]),
+        int_utils.to_32x_string(self._regs[REG_A0 + 6]),
+        int_utils.to_32x_string(self._regs[REG_D0 + 7]),
+        int_utils.to_32x_string(self._regs[REG_A7]),
+        int_utils.to_32x_string(self.get_usp()),
+        int_utils.to_32x_string(self.get_ssp()),
+        int_utils.to_32x_string(self._regs[REG_PC]),
+        int_utils.to_16b_string(self.get_sr_full()))
+
+
+class TracingCpu(Cpu):
+    """
+    CPU that prints its state and every executed instruction while it is
+    verbose.
+
+    ``Cpu`` never checks for verbosity, so that the emulation is not slowed
+    down by tracing. This class is used instead if tracing is requested.
+
+    Parameters
+    ----------
+    memory_interface: megadrive.memory.Memory
+        Access to the memory that should be used.
+
+    verbose: bool, optional
+        Whether instructions should be printed from the start. Default is
+        ``True``.
+    """
+
+    # Only changes when the verbosity is switched
+    _immutable_fields_ = ["_verbose?"]
+
+    def __init__(self, memory_interface, verbose=True):
+        Cpu.__init__(self, memory_interface)
+        self._verbose = verbose
+
+    def set_verbose(self, verbose):
+        self._verbose = bool(verbose)
+
+    def run(self, until_cycle):
+        if self._verbose and self._stopped \
+                and self._pending_interrupt <= self.get_i():
+            print("### Waiting for interrupt...")
+        return Cpu.run(self, until_cycle)
+
+    def step(self, do_trace=True):
+        if not self._verbose:
+            return Cpu.step(self, do_trace)
+
+        if self._pending_interrupt > self.get_i():
+            print("### Handling pending interrupt")
+            return Cpu.step(self, do_trace)
+
+        if self._stopped:
+            print("### Waiting for interrupt...")
+            return Cpu.step(self, do_trace)
+
+        # Print the state before op code fetch to help if it fails there
+        print("###############\n%s" % self.__str__())
+
+        stopped = Cpu.step(self, do_trace)
+
+        if stopped:
+            print("### Stopping execution")
+
+        return stopped
+
+    def _read_code(self, pc):
+        if not self._verbose:
+            return Cpu._read_code(self, pc)
+        # Let the memory interface trace the access
+        return self.mem.read(pc)
+
+    def _execute(self, op_code, entry):
+        if not self._verbose:
+            Cpu._execute(self, op_code, entry)
+            return
+
+        print("### Executing opcode: 0x%s\n"
+              "###       0b%s"
+              % (int_utils.to_32x_string(op_code)[4:],
+                 int_utils.to_16b_string(op_code)))
+        handler_index = entry & 0xFF
+        if handler_index != decoder.UNKNOWN:
+            print("### %s" % decoder.HANDLER_NAMES[handler_index])
+
+        try:
+            Cpu._execute(self, op_code, entry)
+        except IllegalInstruction as e:
+            print("### Illegal instruction detected: %s" % e._message)
+            raise
+        except PrivilegeError as e:
+            print("### Unprivileged execution: %s" % e._message)
+            raise
+
+    def cause_trap(self, vector_number, pc_offset=0):
+        if self._verbose:
+            print("### Causing trap %d" % vector_number)
+        Cpu.cause_trap(self, vector_number, pc_offset)
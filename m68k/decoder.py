@@ -0,0 +1,951 @@
+# -*- coding: utf-8 -*-
+"""
+Precomputed decoding of 68k operation words.
+
+Every one of the 65536 possible operation words is decoded once when this
+module is loaded. The result is stored in ``DECODE_TABLE`` as a single integer
+per operation word, so that executing an instruction only requires one table
+lookup instead of walking through the instruction groups.
+
+Layout of an entry in ``DECODE_TABLE``:
+
+| Bits    | 47-40 | 39-32 | 31-24 | 23-16 | 15-8 |   7-0   |
+| ------- | ----- | ----- | ----- | ----- | ---- | ------- |
+| Meaning |  f4   |  f3   |  f2   |  f1   |  f0  | handler |
+
+``handler`` is an index into ``HANDLERS`` and ``HANDLER_NAMES``. The operand
+fields ``f0`` to ``f4`` are passed to the handler in that order. Their meaning
+depends on the handler (size, effective address mode and register, register
+index, condition, ...).
+
+Created on Sun Oct 18 10:04:12 2026
+
+@author: Simon Romanowski
+"""
+
+from utils import int_utils, rpython_utils
+import m68k.effective_address as ea
+import m68k.instructions as ins
+from m68k.constants import EA_MODE_REG_A
+from m68k.errors import IllegalInstruction
+
+
+HANDLERS = []
+HANDLER_NAMES = []
+
+
+def _register(name, handler):
+    """Add a handler and return its index."""
+    HANDLERS.append(handler)
+    HANDLER_NAMES.append(name)
+    return len(HANDLERS) - 1
+
+
+def entry(handler_index, f0=0, f1=0, f2=0, f3=0, f4=0):
+    """Pack a handler index and its operand fields into a table entry."""
+    return \
+        handler_index \
+        | (f0 << 8) \
+        | (f1 << 16) \
+        | (f2 << 24) \
+        | (f3 << 32) \
+        | (f4 << 40)
+
+
+# --- Handlers ---
+# All handlers have the same signature, so that they can be called through
+# 'HANDLERS'. 'op_code' is only needed for error messages.
+
+# pylint: disable=unused-argument
+
+def _unknown(cpu, op_code, f0, f1, f2, f3, f4):
+    raise IllegalInstruction(
+        "Unknown OP code: 0b%s" % int_utils.to_16b_string(op_code))
+
+# Has to be the first handler, so that an entry of 0 is an unknown OP code
+UNKNOWN = _register("", _unknown)
+
+
+def _ori_to_ccr(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.ori_to_ccr(cpu)
+
+ORI_TO_CCR = _register("ORI to CCR", _ori_to_ccr)
+
+
+def _ori_to_sr(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.ori_to_sr(cpu)
+
+ORI_TO_SR = _register("ORI to SR", _ori_to_sr)
+
+
+def _ori(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.ori(cpu, op_size, ea_mode, ea_register)
+
+ORI = _register("ORI", _ori)
+
+
+def _andi_to_ccr(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.andi_to_ccr(cpu)
+
+ANDI_TO_CCR = _register("ANDI to CCR", _andi_to_ccr)
+
+
+def _andi_to_sr(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.andi_to_sr(cpu)
+
+ANDI_TO_SR = _register("ANDI to SR", _andi_to_sr)
+
+
+def _andi(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.andi(cpu, op_size, ea_mode, ea_register)
+
+ANDI = _register("ANDI", _andi)
+
+
+def _subi(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.subi(cpu, op_size, ea_mode, ea_register)
+
+SUBI = _register("SUBI", _subi)
+
+
+def _addi(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.addi(cpu, op_size, ea_mode, ea_register)
+
+ADDI = _register("ADDI", _addi)
+
+
+def _eori_to_ccr(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.eori_to_ccr(cpu)
+
+EORI_TO_CCR = _register("EORI to CCR", _eori_to_ccr)
+
+
+def _eori_to_sr(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.eori_to_sr(cpu)
+
+EORI_TO_SR = _register("EORI to SR", _eori_to_sr)
+
+
+def _eori(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.eori(cpu, op_size, ea_mode, ea_register)
+
+EORI = _register("EORI", _eori)
+
+
+def _cmpi(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.cmpi(cpu, op_size, ea_mode, ea_register)
+
+CMPI = _register("CMPI", _cmpi)
+
+
+def _btst(cpu, op_code,
+          register_index, use_register, ea_mode, ea_register, f4):
+    ins.btst(cpu, register_index, use_register, ea_mode, ea_register)
+
+BTST = _register("BTST", _btst)
+
+
+def _bchg(cpu, op_code,
+          register_index, use_register, ea_mode, ea_register, f4):
+    ins.bchg(cpu, register_index, use_register, ea_mode, ea_register)
+
+BCHG = _register("BCHG", _bchg)
+
+
+def _bclr(cpu, op_code,
+          register_index, use_register, ea_mode, ea_register, f4):
+    ins.bclr(cpu, register_index, use_register, ea_mode, ea_register)
+
+BCLR = _register("BCLR", _bclr)
+
+
+def _bset(cpu, op_code,
+          register_index, use_register, ea_mode, ea_register, f4):
+    ins.bset(cpu, register_index, use_register, ea_mode, ea_register)
+
+BSET = _register("BSET", _bset)
+
+
+def _movep(cpu, op_code,
+           data_register, address_register, direction, op_size, f4):
+    ins.movep(cpu, data_register, address_register, direction, op_size)
+
+MOVEP = _register("MOVEP", _movep)
+
+
+def _move(cpu, op_code,
+          dst_mode, dst_register, src_mode, src_register, op_size):
+    ins.move(cpu, dst_mode, dst_register, src_mode, src_register, op_size)
+
+MOVE = _register("MOVE", _move)
+
+
+def _movea(cpu, op_code, dst_register, src_mode, src_register, op_size, f4):
+    ins.movea(cpu, dst_register, src_mode, src_register, op_size)
+
+MOVEA = _register("MOVEA", _movea)
+
+
+def _move_from_sr(cpu, op_code, ea_mode, ea_register, f2, f3, f4):
+    ins.move_from_sr(cpu, ea_mode, ea_register)
+
+MOVE_FROM_SR = _register("MOVE from SR", _move_from_sr)
+
+
+def _negx(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.negx(cpu, op_size, ea_mode, ea_register)
+
+NEGX = _register("NEGX", _negx)
+
+
+def _clr(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.clr(cpu, op_size, ea_mode, ea_register)
+
+CLR = _register("CLR", _clr)
+
+
+def _move_to_ccr(cpu, op_code, ea_mode, ea_register, f2, f3, f4):
+    ins.move_to_ccr(cpu, ea_mode, ea_register)
+
+MOVE_TO_CCR = _register("MOVE to CCR", _move_to_ccr)
+
+
+def _neg(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.neg(cpu, op_size, ea_mode, ea_register)
+
+NEG = _register("NEG", _neg)
+
+
+def _not(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.not_(cpu, op_size, ea_mode, ea_register)
+
+NOT = _register("NOT", _not)
+
+
+def _move_to_sr(cpu, op_code, ea_mode, ea_register, f2, f3, f4):
+    ins.move_to_sr(cpu, ea_mode, ea_register)
+
+MOVE_TO_SR = _register("MOVE to SR", _move_to_sr)
+
+
+def _ext(cpu, op_code, register_index, op_size, f2, f3, f4):
+    ins.ext(cpu, register_index, op_size)
+
+EXT = _register("EXT", _ext)
+
+
+def _nbcd(cpu, op_code, ea_mode, ea_register, f2, f3, f4):
+    ins.nbcd(cpu, ea_mode, ea_register)
+
+NBCD = _register("NBCD", _nbcd)
+
+
+def _swap(cpu, op_code, register_index, f1, f2, f3, f4):
+    ins.swap(cpu, register_index)
+
+SWAP = _register("SWAP", _swap)
+
+
+def _pea(cpu, op_code, ea_mode, ea_register, f2, f3, f4):
+    ins.pea(cpu, ea_mode, ea_register)
+
+PEA = _register("PEA", _pea)
+
+
+def _illegal(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.illegal(cpu)
+
+ILLEGAL = _register("ILLEGAL", _illegal)
+
+
+def _tas(cpu, op_code, ea_mode, ea_register, f2, f3, f4):
+    ins.tas(cpu, ea_mode, ea_register)
+
+TAS = _register("TAS", _tas)
+
+
+def _tst(cpu, op_code, op_size, ea_mode, ea_register, f3, f4):
+    ins.tst(cpu, op_size, ea_mode, ea_register)
+
+TST = _register("TST", _tst)
+
+
+def _trap(cpu, op_code, vector_number, f1, f2, f3, f4):
+    ins.trap(cpu, vector_number)
+
+TRAP = _register("TRAP", _trap)
+
+
+def _link(cpu, op_code, register_index, f1, f2, f3, f4):
+    ins.link(cpu, register_index)
+
+LINK = _register("LINK", _link)
+
+
+def _unlk(cpu, op_code, register_index, f1, f2, f3, f4):
+    ins.unlk(cpu, register_index)
+
+UNLK = _register("UNLK", _unlk)
+
+
+def _move_usp(cpu, op_code, register_index, direction, f2, f3, f4):
+    ins.move_usp(cpu, register_index, direction)
+
+MOVE_USP = _register("MOVE USP", _move_usp)
+
+
+def _reset(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.reset(cpu)
+
+RESET = _register("RESET", _reset)
+
+
+def _nop(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.nop(cpu)
+
+NOP = _register("NOP", _nop)
+
+
+def _stop(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.stop(cpu)
+
+STOP = _register("STOP", _stop)
+
+
+def _rte(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.rte(cpu)
+
+RTE = _register("RTE", _rte)
+
+
+def _rts(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.rts(cpu)
+
+RTS = _register("RTS", _rts)
+
+
+def _trapv(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.trapv(cpu)
+
+TRAPV = _register("TRAPV", _trapv)
+
+
+def _rtr(cpu, op_code, f0, f1, f2, f3, f4):
+    ins.rtr(cpu)
+
+RTR = _register("RTR", _rtr)
+
+
+def _jsr(cpu, op_code, ea_mode, ea_register, f2, f3, f4):
+    ins.jsr(cpu, ea_mode, ea_register)
+
+JSR = _register("JSR", _jsr)
+
+
+def _jmp(cpu, op_code, ea_mode, ea_register, f2, f3, f4):
+    ins.jmp(cpu, ea_mode, ea_register)
+
+JMP = _register("JMP", _jmp)
+
+
+def _movem(cpu, op_code, direction, op_size, ea_mode, ea_register, f4):
+    ins.movem(cpu, direction, op_size, ea_mode, ea_register)
+
+MOVEM = _register("MOVEM", _movem)
+
+
+def _lea(cpu, op_code, register_index, ea_mode, ea_register, f3, f4):
+    ins.lea(cpu, register_index, ea_mode, ea_register)
+
+LEA = _register("LEA", _lea)
+
+
+def _chk(cpu, op_code, register_index, ea_mode, ea_register, f3, f4):
+    ins.chk(cpu, register_index, ea_mode, ea_register)
+
+CHK = _register("CHK", _chk)
+
+
+def _dbcc(cpu, op_code, register_index, condition, f2, f3, f4):
+    ins.dbcc(cpu, register_index, condition)
+
+DBCC = _register("DBcc", _dbcc)
+
+
+def _scc(cpu, op_code, condition, ea_mode, ea_register, f3, f4):
+    ins.scc(cpu, condition, ea_mode, ea_register)
+
+SCC = _register("Scc", _scc)
+
+
+def _addq(cpu, op_code, value, op_size, ea_mode, ea_register, f4):
+    ins.addq(cpu, value, op_size, ea_mode, ea_register)
+
+ADDQ = _register("ADDQ", _addq)
+
+
+def _subq(cpu, op_code, value, op_size, ea_mode, ea_register, f4):
+    ins.subq(cpu, value, op_size, ea_mode, ea_register)
+
+SUBQ = _register("SUBQ", _subq)
+
+
+def _bra(cpu, op_code, offset, f1, f2, f3, f4):
+    ins.bra(cpu, offset)
+
+BRA = _register("BRA", _bra)
+
+
+def _bsr(cpu, op_code, offset, f1, f2, f3, f4):
+    ins.bsr(cpu, offset)
+
+BSR = _register("BSR", _bsr)
+
+
+def _bcc(cpu, op_code, condition, offset, f2, f3, f4):
+    ins.bcc(cpu, condition, offset)
+
+BCC = _register("Bcc", _bcc)
+
+
+def _moveq(cpu, op_code, register_index, value, f2, f3, f4):
+    ins.moveq(cpu, register_index, value)
+
+MOVEQ = _register("MOVEQ", _moveq)
+
+
+def _divu(cpu, op_code, register_index, ea_mode, ea_register, f3, f4):
+    ins.divu(cpu, register_index, ea_mode, ea_register)
+
+DIVU = _register("DIVU", _divu)
+
+
+def _divs(cpu, op_code, register_index, ea_mode, ea_register, f3, f4):
+    ins.divs(cpu, register_index, ea_mode, ea_register)
+
+DIVS = _register("DIVS", _divs)
+
+
+def _sbcd(cpu, op_code, register_dst, register_src, op_type, f3, f4):
+    ins.sbcd(cpu, register_dst, register_src, op_type)
+
+SBCD = _register("SBCD", _sbcd)
+
+
+def _or(cpu, op_code, register_index, op_type, op_size, ea_mode, ea_register):
+    ins.or_(cpu, register_index, op_type, op_size, ea_mode, ea_register)
+
+OR = _register("OR", _or)
+
+
+def _suba(cpu, op_code, register_index, op_size, ea_mode, ea_register, f4):
+    ins.suba(cpu, register_index, op_size, ea_mode, ea_register)
+
+SUBA = _register("SUBA", _suba)
+
+
+def _subx(cpu, op_code, register_dst, register_src, op_type, op_size, f4):
+    ins.subx(cpu, register_dst, register_src, op_type, op_size)
+
+SUBX = _register("SUBX", _subx)
+
+
+def _sub(cpu, op_code,
+         register_index, op_type, op_size, ea_mode, ea_register):
+    ins.sub(cpu, register_index, op_type, op_size, ea_mode, ea_register)
+
+SUB = _register("SUB", _sub)
+
+
+def _cmpa(cpu, op_code, register_index, op_size, ea_mode, ea_register, f4):
+    ins.cmpa(cpu, register_index, op_size, ea_mode, ea_register)
+
+CMPA = _register("CMPA", _cmpa)
+
+
+def _cmp(cpu, op_code, register_index, op_size, ea_mode, ea_register, f4):
+    ins.cmp_(cpu, register_index, op_size, ea_mode, ea_register)
+
+CMP = _register("CMP", _cmp)
+
+
+def _cmpm(cpu, op_code, register_dst, register_src, op_size, f3, f4):
+    ins.cmpm(cpu, register_dst, register_src, op_size)
+
+CMPM = _register("CMPM", _cmpm)
+
+
+def _eor(cpu, op_code, register_index, op_size, ea_mode, ea_register, f4):
+    ins.eor(cpu, register_index, op_size, ea_mode, ea_register)
+
+EOR = _register("EOR", _eor)
+
+
+def _mulu(cpu, op_code, register_index, ea_mode, ea_register, f3, f4):
+    ins.mulu(cpu, register_index, ea_mode, ea_register)
+
+MULU = _register("MULU", _mulu)
+
+
+def _muls(cpu, op_code, register_index, ea_mode, ea_register, f3, f4):
+    ins.muls(cpu, register_index, ea_mode, ea_register)
+
+MULS = _register("MULS", _muls)
+
+
+def _abcd(cpu, op_code, register_src, register_dst, op_type, f3, f4):
+    ins.abcd(cpu, register_src, register_dst, op_type)
+
+ABCD = _register("ABCD", _abcd)
+
+
+def _exg(cpu, op_code, register_x, register_y, op_type, f3, f4):
+    ins.exg(cpu, register_x, register_y, op_type)
+
+EXG = _register("EXG", _exg)
+
+
+def _and(cpu, op_code,
+         register_index, op_type, op_size, ea_mode, ea_register):
+    ins.and_(cpu, register_index, op_type, op_size, ea_mode, ea_register)
+
+AND = _register("AND", _and)
+
+
+def _adda(cpu, op_code, register_index, op_size, ea_mode, ea_register, f4):
+    ins.adda(cpu, register_index, op_size, ea_mode, ea_register)
+
+ADDA = _register("ADDA", _adda)
+
+
+def _add(cpu, op_code,
+         register_index, op_type, op_size, ea_mode, ea_register):
+    ins.add(cpu, register_index, op_type, op_size, ea_mode, ea_register)
+
+ADD = _register("ADD", _add)
+
+
+def _addx(cpu, op_code, register_src, register_dst, op_type, op_size, f4):
+    ins.addx(cpu, register_src, register_dst, op_type, op_size)
+
+ADDX = _register("ADDX", _addx)
+
+
+def _asl_asr_to_mem(cpu, op_code, direction, ea_mode, ea_register, f3, f4):
+    ins.asl_asr_to_mem(cpu, direction, ea_mode, ea_register)
+
+ASD_TO_MEM = _register("ASd", _asl_asr_to_mem)
+
+
+def _lsl_lsr_to_mem(cpu, op_code, direction, ea_mode, ea_register, f3, f4):
+    ins.lsl_lsr_to_mem(cpu, direction, ea_mode, ea_register)
+
+LSD_TO_MEM = _register("LSd", _lsl_lsr_to_mem)
+
+
+def _roxl_roxr_to_mem(cpu, op_code, direction, ea_mode, ea_register, f3, f4):
+    ins.roxl_roxr_to_mem(cpu, direction, ea_mode, ea_register)
+
+ROXD_TO_MEM = _register("ROXd", _roxl_roxr_to_mem)
+
+
+def _rol_ror_to_mem(cpu, op_code, direction, ea_mode, ea_register, f3, f4):
+    ins.rol_ror_to_mem(cpu, direction, ea_mode, ea_register)
+
+ROD_TO_MEM = _register("ROd", _rol_ror_to_mem)
+
+
+def _asl_asr_to_data(cpu, op_code,
+                     register_index, shift_amount, op_type, op_size,
+                     direction):
+    ins.asl_asr_to_data(
+        cpu, register_index, shift_amount, op_type, op_size, direction)
+
+ASD_TO_DATA = _register("ASd", _asl_asr_to_data)
+
+
+def _lsl_lsr_to_data(cpu, op_code,
+                     register_index, shift_amount, op_type, op_size,
+                     direction):
+    ins.lsl_lsr_to_data(
+        cpu, register_index, shift_amount, op_type, op_size, direction)
+
+LSD_TO_DATA = _register("LSd", _lsl_lsr_to_data)
+
+
+def _roxl_roxr_to_data(cpu, op_code,
+                       register_index, shift_amount, op_type, op_size,
+                       direction):
+    ins.roxl_roxr_to_data(
+        cpu, register_index, shift_amount, op_type, op_size, direction)
+
+ROXD_TO_DATA = _register("ROXd", _roxl_roxr_to_data)
+
+
+def _rol_ror_to_data(cpu, op_code,
+                     register_index, shift_amount, op_type, op_size,
+                     direction):
+    ins.rol_ror_to_data(
+        cpu, register_index, shift_amount, op_type, op_size, direction)
+
+ROD_TO_DATA = _register("ROd", _rol_ror_to_data)
+
+# pylint: enable=unused-argument
+
+
+# --- Decoding of the instruction groups ---
+# These are only used to build the decode table and mirror the order in which
+# the instructions of a group have to be checked.
+
+def _decode_bit_movep_imm(op_code):
+    """Bit manipulation, MOVEP and Immediate instructions."""
+    ea_mode, ea_register = ea.split(int_utils.select_bits(op_code, 0, 5))
+    upper_byte = int_utils.select_bits(op_code, 8, 15)
+    bits_6_15 = int_utils.select_bits(op_code, 6, 15)
+    bits_6_8 = int_utils.select_bits(op_code, 6, 8)
+    bits_6_7 = int_utils.select_bits(op_code, 6, 7)
+    bits_9_11 = int_utils.select_bits(op_code, 9, 11)
+    is_data_alterable = ea.is_data_alterable(ea_mode, ea_register)
+
+    if op_code == 0x3C:
+        return entry(ORI_TO_CCR)
+    elif op_code == 0x7C:
+        return entry(ORI_TO_SR)
+    elif upper_byte == 0 and is_data_alterable:
+        return entry(ORI, bits_6_8, ea_mode, ea_register)
+    elif op_code == 0x23C:
+        return entry(ANDI_TO_CCR)
+    elif op_code == 0x27C:
+        return entry(ANDI_TO_SR)
+    elif upper_byte == 2 and is_data_alterable:
+        return entry(ANDI, bits_6_7, ea_mode, ea_register)
+    elif upper_byte == 4 and is_data_alterable:
+        return entry(SUBI, bits_6_8, ea_mode, ea_register)
+    elif upper_byte == 6 and is_data_alterable:
+        return entry(ADDI, bits_6_7, ea_mode, ea_register)
+    elif op_code == 0xA3C:
+        return entry(EORI_TO_CCR)
+    elif op_code == 0xA7C:
+        return entry(EORI_TO_SR)
+    elif upper_byte == 0xA and is_data_alterable:
+        return entry(EORI, bits_6_7, ea_mode, ea_register)
+    elif upper_byte == 0xC and is_data_alterable:
+        return entry(CMPI, bits_6_7, ea_mode, ea_register)
+    elif is_data_alterable and (bits_6_8 == 4 or bits_6_15 == 0x20):
+        return entry(BTST, bits_9_11, upper_byte & 1, ea_mode, ea_register)
+    elif is_data_alterable and (bits_6_8 == 5 or bits_6_15 == 0x21):
+        return entry(BCHG, bits_9_11, upper_byte & 1, ea_mode, ea_register)
+    elif is_data_alterable and (bits_6_8 == 6 or bits_6_15 == 0x22):
+        return entry(BCLR, bits_9_11, upper_byte & 1, ea_mode, ea_register)
+    elif is_data_alterable and (bits_6_8 == 7 or bits_6_15 == 0x23):
+        return entry(BSET, bits_9_11, upper_byte & 1, ea_mode, ea_register)
+    elif ea_mode == 1 and int_utils.select_bits(op_code, 8) == 1:
+        return entry(MOVEP,
+                     bits_9_11,
+                     ea_register,
+                     (bits_6_8 >> 1) & 1,
+                     bits_6_8 & 1)
+    return entry(UNKNOWN)
+
+
+def _decode_move(op_code):
+    """MOVE instructions"""
+    size = op_code >> 12
+    src_mode, src_register = ea.split(op_code & 0x3F)
+    # Order is swapped here!
+    dst_register, dst_mode = ea.split((op_code >> 6) & 0x3F)
+    src_valid = ea.is_valid(src_mode, src_register)
+
+    if src_valid and ea.is_data_alterable(dst_mode, dst_register):
+        return entry(MOVE, dst_mode, dst_register, src_mode, src_register, size)
+    elif src_valid and dst_mode == EA_MODE_REG_A and size != 1:
+        return entry(MOVEA, dst_register, src_mode, src_register, size)
+    return entry(UNKNOWN)
+
+
+def _decode_misc(op_code):
+    """Various instructions."""
+    bits_6_11 = int_utils.select_bits(op_code, 6, 11)
+    bits_6_7 = bits_6_11 & 3
+    bits_6_8 = bits_6_11 & 7
+    bits_8_11 = int_utils.select_bits(op_code, 8, 11)
+
+    ea_mode, ea_register = ea.split(op_code & 0x3F)
+    is_data_alterable = ea.is_data_alterable(ea_mode, ea_register)
+    is_data = ea.is_data(ea_mode, ea_register)
+    is_control = ea.is_control(ea_mode, ea_register)
+    is_valid = ea.is_valid(ea_mode, ea_register)
+
+    if bits_6_11 == 3 and is_data_alterable:
+        return entry(MOVE_FROM_SR, ea_mode, ea_register)
+    elif bits_6_7 != 3 and bits_8_11 == 0 and is_data_alterable:
+        return entry(NEGX, bits_6_7, ea_mode, ea_register)
+    elif bits_6_7 != 3 and bits_8_11 == 2 and is_data_alterable:
+        return entry(CLR, bits_6_7, ea_mode, ea_register)
+    elif bits_6_11 == 0x13 and is_data:
+        return entry(MOVE_TO_CCR, ea_mode, ea_register)
+    elif bits_6_7 != 3 and bits_8_11 == 4 and is_data_alterable:
+        return entry(NEG, bits_6_7, ea_mode, ea_register)
+    elif bits_6_7 != 3 and bits_8_11 == 6 and is_data_alterable:
+        return entry(NOT, bits_6_7, ea_mode, ea_register)
+    elif bits_6_11 == 0x1B and is_data:
+        return entry(MOVE_TO_SR, ea_mode, ea_register)
+    elif ea_mode == 0 and (bits_6_11 == 0x22 or bits_6_11 == 0x23):
+        return entry(EXT, ea_register, bits_6_11 & 1)
+    elif bits_6_11 == 0x20 and is_data_alterable:
+        return entry(NBCD, ea_mode, ea_register)
+    elif ea_mode == 0 and bits_6_11 == 0x21:
+        return entry(SWAP, ea_register)
+    elif is_control and bits_6_11 == 0x21:
+        return entry(PEA, ea_mode, ea_register)
+    elif op_code == 0x4AFC:
+        return entry(ILLEGAL)
+    elif is_data_alterable and bits_6_11 == 0x2B:
+        return entry(TAS, ea_mode, ea_register)
+    elif bits_6_7 != 3 and bits_8_11 == 0xA and is_valid:
+        return entry(TST, bits_6_7, ea_mode, ea_register)
+    elif ea_mode < 2 and bits_6_11 == 0x39:
+        return entry(TRAP, int_utils.select_bits(op_code, 0, 3))
+    elif ea_mode == 2 and bits_6_11 == 0x39:
+        return entry(LINK, ea_register)
+    elif ea_mode == 3 and bits_6_11 == 0x39:
+        return entry(UNLK, ea_register)
+    elif (ea_mode == 4 or ea_mode == 5) and bits_6_11 == 0x39:
+        return entry(MOVE_USP, ea_register, ea_mode & 1)
+    elif op_code == 0x4E70:
+        return entry(RESET)
+    elif op_code == 0x4E71:
+        return entry(NOP)
+    elif op_code == 0x4E72:
+        return entry(STOP)
+    elif op_code == 0x4E73:
+        return entry(RTE)
+    elif op_code == 0x4E75:
+        return entry(RTS)
+    elif op_code == 0x4E76:
+        return entry(TRAPV)
+    elif op_code == 0x4E77:
+        return entry(RTR)
+    elif is_control and bits_6_11 == 0x3A:
+        return entry(JSR, ea_mode, ea_register)
+    elif is_control and bits_6_11 == 0x3B:
+        return entry(JMP, ea_mode, ea_register)
+    elif (ea_mode > 1 and (ea_mode != 7 or ea_register < 2)) \
+            and int_utils.select_bits(op_code, 11) == 1 \
+            and int_utils.select_bits(op_code, 7, 9) == 1:
+        return entry(MOVEM,
+                     int_utils.select_bits(op_code, 10),
+                     bits_6_7 & 1,
+                     ea_mode, ea_register)
+    elif is_control and bits_6_8 == 7:
+        return entry(LEA, bits_8_11 >> 1, ea_mode, ea_register)
+    elif is_data and bits_6_8 == 6:
+        return entry(CHK,
+                     int_utils.select_bits(op_code, 9, 11),
+                     ea_mode, ea_register)
+    return entry(UNKNOWN)
+
+
+def _decode_quick_scc_dbcc(op_code):
+    """ADDQ, SUBQ, Scc or DBcc."""
+    op_size = int_utils.select_bits(op_code, 6, 7)
+    ea_mode, ea_register = ea.split(int_utils.select_bits(op_code, 0, 5))
+    condition = int_utils.select_bits(op_code, 8, 11)
+    if op_size == 3:
+        if ea_mode == EA_MODE_REG_A:
+            return entry(DBCC, ea_register, condition)
+        return entry(SCC, condition, ea_mode, ea_register)
+    value = int_utils.select_bits(op_code, 9, 11)
+    if int_utils.select_bits(op_code, 8) == 0:
+        return entry(ADDQ, value, op_size, ea_mode, ea_register)
+    return entry(SUBQ, value, op_size, ea_mode, ea_register)
+
+
+def _decode_branch(op_code):
+    """BRA, BSR or Bcc."""
+    condition = int_utils.select_bits(op_code, 8, 11)
+    offset = op_code & 0xFF
+    if condition == 0:
+        return entry(BRA, offset)
+    elif condition == 1:
+        return entry(BSR, offset)
+    return entry(BCC, condition, offset)
+
+
+def _decode_moveq(op_code):
+    """MOVEQ."""
+    if not op_code & 0x100:
+        return entry(MOVEQ,
+                     int_utils.select_bits(op_code, 9, 11),
+                     op_code & 0xFF)
+    return entry(UNKNOWN)
+
+
+def _decode_or_div_sbcd(op_code):
+    """OR, DIVU, DIVS or SBCD."""
+    ea_mode, ea_register = ea.split(op_code & 0x3F)
+    register_index = int_utils.select_bits(op_code, 9, 11)
+    bits_6_8 = int_utils.select_bits(op_code, 6, 8)
+    bit8 = bits_6_8 >> 2
+
+    if bits_6_8 == 3:
+        return entry(DIVU, register_index, ea_mode, ea_register)
+    elif bits_6_8 == 7:
+        return entry(DIVS, register_index, ea_mode, ea_register)
+    elif bits_6_8 == 4 and ea_mode < 2:
+        return entry(SBCD, register_index, ea_register, ea_mode)
+    return entry(OR, register_index, bit8, bits_6_8 & 3, ea_mode, ea_register)
+
+
+def _decode_sub(op_code):
+    """SUB, SUBA or SUBX."""
+    ea_mode, ea_register = ea.split(op_code & 0x3F)
+    op_type = int_utils.select_bits(op_code, 8)
+    op_size = int_utils.select_bits(op_code, 6, 7)
+    register_index = int_utils.select_bits(op_code, 9, 11)
+    if op_size == 3:
+        return entry(SUBA, register_index, op_type, ea_mode, ea_register)
+    elif op_type == 1 and ea_mode < 2:
+        return entry(SUBX, register_index, ea_register, ea_mode, op_size)
+    return entry(SUB, register_index, op_type, op_size, ea_mode, ea_register)
+
+
+def _decode_cmp_eor(op_code):
+    """CMP, CMPA, CMPM or EOR."""
+    ea_mode, ea_register = ea.split(op_code & 0x3F)
+    size = int_utils.select_bits(op_code, 6, 7)
+    register_index = int_utils.select_bits(op_code, 9, 11)
+    bit8 = int_utils.select_bits(op_code, 8)
+
+    if size == 3:
+        return entry(CMPA, register_index, bit8, ea_mode, ea_register)
+    elif bit8 == 0:
+        return entry(CMP, register_index, size, ea_mode, ea_register)
+    elif ea_mode == 1:
+        return entry(CMPM, register_index, ea_register, size)
+    return entry(EOR, register_index, size, ea_mode, ea_register)
+
+
+def _decode_and_mul_abcd_exg(op_code):
+    """AND, MUL, ABCD or EXG."""
+    size = int_utils.select_bits(op_code, 6, 7)
+    op_type = int_utils.select_bits(op_code, 8)
+    ea_mode, ea_register = ea.split(op_code & 0x3F)
+    register_dst = int_utils.select_bits(op_code, 9, 11)
+
+    if size == 3:
+        if op_type == 0:
+            return entry(MULU, register_dst, ea_mode, ea_register)
+        return entry(MULS, register_dst, ea_mode, ea_register)
+    elif int_utils.select_bits(op_code, 4, 8) == 0x10:
+        # Use another bit for op_type
+        return entry(ABCD,
+                     int_utils.select_bits(op_code, 0, 2),
+                     register_dst,
+                     int_utils.select_bits(op_code, 3))
+    elif op_type == 1 and int_utils.select_bits(op_code, 4, 5) == 0:
+        return entry(EXG,
+                     register_dst,
+                     int_utils.select_bits(op_code, 0, 2),
+                     int_utils.select_bits(op_code, 3, 7))
+    return entry(AND, register_dst, op_type, size, ea_mode, ea_register)
+
+
+def _decode_add(op_code):
+    """ADD, ADDA or ADDX"""
+    register_index = int_utils.select_bits(op_code, 9, 11)
+    ea_mode = int_utils.select_bits(op_code, 3, 5)
+    # Bits 2-0 are the effective address register index
+    ea_register = op_code & 7
+    # Bit 8 is 'op_type' for ADD and 'op_size' for ADDA
+    bit8 = int_utils.select_bits(op_code, 8)
+    op_size = int_utils.select_bits(op_code, 6, 7)
+    if op_size == 3:
+        return entry(ADDA, register_index, bit8, ea_mode, ea_register)
+    elif not bit8 or ea_mode > 1:
+        return entry(ADD, register_index, bit8, op_size, ea_mode, ea_register)
+    return entry(ADDX, ea_register, register_index, ea_mode, op_size)
+
+
+def _decode_shift_rotate(op_code):
+    """ASd, LSd, ROXd or ROd."""
+    op_size = int_utils.select_bits(op_code, 6, 7)
+    shift_amount = int_utils.select_bits(op_code, 9, 11)
+    direction = int_utils.select_bits(op_code, 8)
+    ea_register = int_utils.select_bits(op_code, 0, 2)
+    if op_size == 3:
+        # Memory shift/rotate
+        ea_mode = int_utils.select_bits(op_code, 3, 5)
+        # Register index determines action
+        if shift_amount == 0:
+            return entry(ASD_TO_MEM, direction, ea_mode, ea_register)
+        elif shift_amount == 1:
+            return entry(LSD_TO_MEM, direction, ea_mode, ea_register)
+        elif shift_amount == 2:
+            return entry(ROXD_TO_MEM, direction, ea_mode, ea_register)
+        elif shift_amount == 3:
+            return entry(ROD_TO_MEM, direction, ea_mode, ea_register)
+        return entry(UNKNOWN)
+    # Data register shift/rotate
+    op_type = int_utils.select_bits(op_code, 5)
+    # Bits 3-4 determine action
+    action_index = int_utils.select_bits(op_code, 3, 4)
+    handlers = [ASD_TO_DATA, LSD_TO_DATA, ROXD_TO_DATA, ROD_TO_DATA]
+    return entry(handlers[action_index],
+                 ea_register, shift_amount, op_type, op_size, direction)
+
+
+def _decode_unknown(op_code):
+    """Line 1010 and line 1111 emulator."""
+    return entry(UNKNOWN)
+
+
+_DECODE_GROUPS = [
+    _decode_bit_movep_imm,  # 0
+    _decode_move,  # 1
+    _decode_move,  # 2
+    _decode_move,  # 3
+    _decode_misc,  # 4
+    _decode_quick_scc_dbcc,  # 5
+    _decode_branch,  # 6
+    _decode_moveq,  # 7
+    _decode_or_div_sbcd,  # 8
+    _decode_sub,  # 9
+    _decode_unknown,  # 0xA
+    _decode_cmp_eor,  # 0xB
+    _decode_and_mul_abcd_exg,  # 0xC
+    _decode_add,  # 0xD
+    _decode_shift_rotate,  # 0xE
+    _decode_unknown,  # 0xF
+]
+
+
+def decode(op_code):
+    """Decode a single operation word into a decode table entry."""
+    return _DECODE_GROUPS[(op_code & 0xF000) >> 12](op_code)
+
+
+# One entry for every possible operation word
+DECODE_TABLE = [decode(op_code) for op_code in range(0x10000)]
+
+
+@rpython_utils.elidable
+def get_handler(handler_index):
+    """
+    Get the handler with the given index from ``HANDLERS``.
+
+    The list never changes after this module is loaded, so the JIT may
+    constant-fold this lookup and inline the handler.
+    """
+    return HANDLERS[handler_index]
+
+
+@rpython_utils.elidable
+def lookup(op_code):
+    """
+    Get the entry of an operation word in ``DECODE_TABLE``.
+
+    The table never changes, so the JIT may constant-fold this lookup when the
+    operation word is known.
+    """
+    return DECODE_TABLE[op_code]
@@ -9,11 +9,11 @@ Created on Wed Sep 20 11:46:04 2023
 
 from m68k.constants import (
     OP_SIZE_BYTE, OP_SIZE_WORD, OP_SIZE_LONG,
-    EA_MODE_REG_A, EA_MODE_A_INDIRECT, EA_MODE_A_POSTINC,
+    EA_MODE_REG_D, EA_MODE_REG_A, EA_MODE_A_INDIRECT, EA_MODE_A_POSTINC,
     EA_MODE_A_PREDEC, EA_MODE_A_INDX, EA_MODE_OTHER,
     EA_REGISTER_ABS_WORD, EA_REGISTER_PC_INDX, EA_REGISTER_IMMEDIATE,
 )
-from utils import int_utils
+from utils import int_utils, rpython_utils
 
 
 def split(ea):
@@ -84,10 +84,112 @@ def is_memory_alterable(ea, ea_register=None):
         and (ea_mode != EA_MODE_OTHER or ea_register < 2)
 
 
-def _resolve_register(ea_mode, ea_register):
-    return ea_register + (ea_mode << 3)
+# Kinds of resolved operands
+OPERAND_DATA_REGISTER = 0
+OPERAND_ADDRESS_REGISTER = 1
+OPERAND_IMMEDIATE = 2
+OPERAND_MEMORY = 3
 
-def resolve_address(cpu, ea_mode, ea_register, op_size):
+
+class Operand(object):
+    """
+    An operand whose effective address has been resolved.
+
+    Instances are meant to be reused for every instruction, so that resolving
+    an effective address does not allocate anything.
+
+    Attributes
+    ----------
+    kind: int
+        One of the ``OPERAND_*`` constants.
+
+    location: int
+        The register index for register direct operands, the value for
+        immediate operands or the memory address for all other operands.
+
+    size: int
+        Value from 0 to 2. The size of the operation.
+    """
+
+    def __init__(self):
+        self.kind = OPERAND_DATA_REGISTER
+        self.location = 0
+        self.size = OP_SIZE_BYTE
+
+
+def resolve(cpu, operand, ea_mode, ea_register, op_size):
+    """
+    Resolve the effective address of an operand.
+
+    This might increase the PC, if extension words are expected for the
+    effective address mode.
+
+    Parameters
+    ----------
+    cpu: m68k.cpu.Cpu
+        The CPU instance for which to resolve the effective address.
+
+    operand: Operand
+        Will be updated to refer to the resolved operand.
+
+    ea_mode, ea_register: int
+        Define the type of effective address.
+
+    op_size: int
+        Value from 0 to 2. Defines the size of the operation.
+
+    Returns
+    -------
+    cycles: int
+        The amount of cycles the calculation took.
+    """
+    # Lets the JIT specialize the rest of the calculation on the mode
+    ea_mode = rpython_utils.promote(ea_mode)
+    op_size = rpython_utils.promote(op_size)
+    operand.size = op_size
+    if ea_mode == EA_MODE_REG_D:
+        # Data register direct
+        operand.kind = OPERAND_DATA_REGISTER
+        operand.location = ea_register
+        return 0
+
+    elif ea_mode == EA_MODE_REG_A:
+        # Address register direct
+        operand.kind = OPERAND_ADDRESS_REGISTER
+        operand.location = ea_register
+        return 0
+
+    elif ea_mode == EA_MODE_OTHER and ea_register == EA_REGISTER_IMMEDIATE:
+        # Immediate value
+        cycles = 4
+        value = cpu.fetch_next()
+        if op_size == OP_SIZE_LONG:
+            # Long word
+            cycles += 4
+            second_ext = cpu.fetch_next()
+            value = (value << 16) | second_ext
+        elif op_size == OP_SIZE_BYTE:
+            # Byte
+            value &= 0xFF
+        operand.kind = OPERAND_IMMEDIATE
+        operand.location = value
+        return cycles
+
+    # - Value is in memory -
+    operand.kind = OPERAND_MEMORY
+
+    if ea_mode < 5:
+        # Address register indirect
+        return resolve_address(cpu, operand, ea_mode, ea_register, op_size)
+
+    elif ea_mode == EA_MODE_OTHER and ea_register < 2:
+        # Absolute short/long addressing mode
+        return resolve_absolute(cpu, operand, ea_register, op_size)
+
+    # Address register / PC indirect with extension (and index register)
+    return resolve_displacement(cpu, operand, ea_mode, ea_register, op_size)
+
+def resolve_address(cpu, operand, ea_mode, ea_register, op_size):
     """
     Resolve address register indirect effective address.
 
@@ -96,6 +198,10 @@ def resolve_address(cpu, ea_mode, ea_register, op_size):
     cpu: m68k.cpu.Cpu
         The CPU instance to work on.
 
+    operand: Operand
+        Its location will be set to the memory address that the effective
+        address refers to.
+
     ea_mode, ea_register: int
         Define the effective address mode.
 
@@ -105,9 +211,6 @@ def resolve_address(cpu, ea_mode, ea_register, op_size):
 
     Returns
     -------
-    address: int
-        The memory address that the effective address refers to.
-
     cycles: int
         The amount of cycles the calculation took.
     """
@@ -129,9 +232,10 @@ def resolve_address(cpu, ea_mode, ea_register, op_size):
         # Increment according to operation size
         cpu.set_a(ea_register, address + size_displacement)
 
-    return address, cycles
+    operand.location = address
+    return cycles
 
-def resolve_absolute(cpu, ea_register, op_size):
+def resolve_absolute(cpu, operand, ea_register, op_size):
     """
     Resolve absolute effective address.
 
@@ -140,6 +244,10 @@ def resolve_absolute(cpu, ea_register, op_size):
     cpu: m68k.cpu.Cpu
         The CPU instance to work on.
 
+    operand: Operand
+        Its location will be set to the memory address that the effective
+        address refers to.
+
     ea_register: int
         Defines the effective address mode.
 
@@ -148,9 +256,6 @@ def resolve_absolute(cpu, ea_register, op_size):
 
     Returns
     -------
-    address: int
-        The memory address that the effective address refers to.
-
     cycles: int
         The amount of cycles the calculation took.
     """
@@ -169,9 +274,10 @@ def resolve_absolute(cpu, ea_register, op_size):
     if op_size == OP_SIZE_LONG:
         cycles += 4
 
-    return address, cycles
+    operand.location = address
+    return cycles
 
-def resolve_displacement(cpu, ea_mode, ea_register, op_size):
+def resolve_displacement(cpu, operand, ea_mode, ea_register, op_size):
     """
     Resolve address register / PC indirect with displacement effective address.
 
@@ -180,6 +286,10 @@ def resolve_displacement(cpu, ea_mode, ea_register, op_size):
     cpu: m68k.cpu.Cpu
         The CPU instance to work on.
 
+    operand: Operand
+        Its location will be set to the memory address that the effective
+        address refers to.
+
     ea_mode, ea_register: int
         Define the effective address mode.
 
@@ -189,9 +299,6 @@ def resolve_displacement(cpu, ea_mode, ea_register, op_size):
 
     Returns
     -------
-    address: int
-        The memory address that the effective address refers to.
-
     cycles: int
         The amount of cycles the calculation took.
     """
@@ -211,15 +318,16 @@ def resolve_displacement(cpu, ea_mode, ea_register, op_size):
         cycles += 2
         # Base displacement is 8 bit value, sign-extended to 32 bit
         displacement = int_utils.sign_extend_8_to_32(ext_word & 0xFF)
-        # Index register type
-        registers = \
-            cpu.a_registers if ext_word & 0x8000 else cpu.d_registers
         # Index is bits 14-12
         reg_index = int_utils.select_bits(ext_word, 12, 14)
-        register = registers[reg_index]
         # Bit 11 is the register size bit
         reg_long = ext_word & 0x800
-        reg_value = register.get() if reg_long else register.get_word()
+        reg_size = OP_SIZE_LONG if reg_long else OP_SIZE_WORD
+        # Index register type
+        if ext_word & 0x8000:
+            reg_value = cpu.get_a(reg_index, reg_size)
+        else:
+            reg_value = cpu.get_d(reg_index, reg_size)
         if not reg_long:
             # Sign-extend the register word value
             reg_value = int_utils.sign_extend_16_to_32(reg_value)
@@ -231,166 +339,67 @@ def resolve_displacement(cpu, ea_mode, ea_register, op_size):
     if op_size == OP_SIZE_LONG:
         cycles += 4
 
-    address = (base_value + displacement) & 0xFFFFFFFF
-    return address, cycles
+    operand.location = (base_value + displacement) & 0xFFFFFFFF
+    return cycles
 
-def accessors(cpu, ea_mode, ea_register, op_size):
+def read(cpu, operand):
     """
-    Get the get and set functions for the given effective address mode.
-
-    This might increase the PC, if extension words are expected for the
-    effective address mode.
+    Read the value of a resolved operand.
 
     Parameters
     ----------
     cpu: m68k.cpu.Cpu
-        The CPU instance for which to get the accessors.
-
-    ea_mode, ea_register: int
-        Define the type of effective address.
-
-    op_size: int
-        Value from 0 to 2. Defines the size of the operation.
-
-    Returns
-    -------
-    get_func: Callable[[m68k.cpu.Cpu, int], int]
-        This function will retrieve the value that the effective address
-        refers to when called with ``address``.
-
-    set_func: None | Callable[[m68k.cpu.Cpu, int, int], None]
-        This function may be called with ``address`` as the first and the
-        new value as the second parameter. Might be ``None`` if the
-        effective address points to a location that is not writable.
+        The CPU instance to read from.
 
-    address: int
-        Address parameter for ``set_func``.
-
-    cycles: int
-        The amount of cycles the calculation took.
+    operand: Operand
+        The operand to read.
     """
-    if ea_mode < 2:
-        # Register direct
-        reg_address = _resolve_register(ea_mode, ea_register)
-
-        # TODO bake 'op_size' into 'reg_address' and combine these methods
-        if op_size == OP_SIZE_BYTE:
-            get_func = _register_get_byte
-            set_func = _register_set_byte
-        elif op_size == OP_SIZE_WORD:
-            get_func = _register_get_word
-            set_func = _register_set_word
-        else:
-            get_func = _register_get_long
-            set_func = _register_set_long
-        return get_func, set_func, reg_address, 0
-
-    elif ea_mode == EA_MODE_OTHER and ea_register == EA_REGISTER_IMMEDIATE:
-        # Immediate value
-        cycles = 4
-        value = cpu.fetch_next()
-        if op_size == OP_SIZE_LONG:
-            # Long word
-            cycles += 4
-            second_ext = cpu.fetch_next()
-            value = (value << 16) | second_ext
-        elif op_size == OP_SIZE_BYTE:
-            # Byte
-            value &= 0xFF
-
-        # Slightly cheating here, but this holds the contract
-        # 'int' could be any function that will just return 'value'
-        return _return_address, None, value, cycles
-
-    # - Value is in memory -
-
-    elif ea_mode < 5:
-        # Address register indirect
-        address, cycles = resolve_address(cpu, ea_mode, ea_register, op_size)
-
-    elif ea_mode == EA_MODE_OTHER and ea_register < 2:
-        # Absolute short/long addressing mode
-        address, cycles = resolve_absolute(cpu, ea_register, op_size)
+    kind = operand.kind
+    size = operand.size
+    if kind == OPERAND_DATA_REGISTER:
+        return cpu.get_d(operand.location, size)
+    elif kind == OPERAND_ADDRESS_REGISTER:
+        return cpu.get_a(operand.location, size)
+    elif kind == OPERAND_IMMEDIATE:
+        return operand.location
+    # Memory
+    address = operand.location
+    if size == OP_SIZE_BYTE:
+        return cpu.mem.read_byte(address)
+    elif size == OP_SIZE_WORD:
+        return cpu.mem.read(address)
+    return cpu.mem.read_long(address)
+
+def write(cpu, operand, value):
+    """
+    Write a value to a resolved operand.
 
-    else:
-        # Address register / PC indirect with extension (and index
-        # register)
-        address, cycles = resolve_displacement(
-            cpu, ea_mode, ea_register, op_size)
-
-    # Resolve address
-    if op_size == OP_SIZE_BYTE:
-        get_func = _get_mem_byte
-        set_func = _set_mem_byte
-    elif op_size == OP_SIZE_WORD:
-        get_func = _get_mem_word
-        set_func = _set_mem_word
-    else:
-        # Long word
-        get_func = _get_mem_long
-        set_func = _set_mem_long
-
-    return get_func, set_func, address, cycles
-
-def _register_get_byte(cpu, reg_address):
-    if reg_address & 8:
-        return cpu.get_a(reg_address & 7, OP_SIZE_BYTE)
-    return cpu.get_d(reg_address & 7, OP_SIZE_BYTE)
-
-def _register_get_word(cpu, reg_address):
-    if reg_address & 8:
-        return cpu.get_a(reg_address & 7, OP_SIZE_WORD)
-    return cpu.get_d(reg_address & 7, OP_SIZE_WORD)
-
-def _register_get_long(cpu, reg_address):
-    if reg_address & 8:
-        return cpu.get_a(reg_address & 7, OP_SIZE_LONG)
-    return cpu.get_d(reg_address & 7, OP_SIZE_LONG)
-
-def _register_set_byte(cpu, reg_address, value):
-    if reg_address & 8:
-        cpu.set_a(reg_address & 7, value)
-    else:
-        cpu.set_d(reg_address & 7, value, OP_SIZE_BYTE)
+    Parameters
+    ----------
+    cpu: m68k.cpu.Cpu
+        The CPU instance to write to.
 
-def _register_set_word(cpu, reg_address, value):
-    if reg_address & 8:
-        cpu.set_a(reg_address & 7, value)
-    else:
-        cpu.set_d(reg_address & 7, value, OP_SIZE_WORD)
+    operand: Operand
+        The operand to write. Must not be an immediate operand.
 
-def _register_set_long(cpu, reg_address, value):
-    if reg_address & 8:
-        cpu.set_a(reg_address & 7, value)
+    value: int
+        The new value of the operand.
+    """
+    kind = operand.kind
+    size = operand.size
+    if kind == OPERAND_DATA_REGISTER:
+        cpu.set_d(operand.location, value, size)
+    elif kind == OPERAND_ADDRESS_REGISTER:
+        # Always sets all 32 bits
+        cpu.set_a(operand.location, value)
+    elif kind == OPERAND_IMMEDIATE:
+        raise rpython_utils.RRuntimeError("Immediate operand is not writable")
     else:
-        cpu.set_d(reg_address & 7, value, OP_SIZE_LONG)
-
-def _return_address(_, address):
-    return address
-
-def _get_mem_byte(cpu, address):
-    return (cpu.mem.read(address) & 0xFF00) >> 8
-
-def _set_mem_byte(cpu, address, value):
-    # Get the original value
-    o_value = cpu.mem.read(address)
-    cpu.mem.write(address, (o_value & 0xFF) | (value << 8))
-
-def _get_mem_word(cpu, address):
-    return cpu.mem.read(address)
-
-def _set_mem_word(cpu, address, value):
-    cpu.mem.write(address, value)
-
-def _get_mem_long(cpu, address):
-    # Get both words
-    lower = cpu.mem.read(address + 2)
-    higher = cpu.mem.read(address)
-    # Combine
-    return (higher << 16) | lower
-
-def _set_mem_long(cpu, address, value):
-    # Next write should only write the higher word
-    cpu.mem.write(address, value >> 16)
-    # Write the lower word from 'value'
-    cpu.mem.write(address + 2, value)  # Already trims to 16 bit
+        # Memory
+        address = operand.location
+        if size == OP_SIZE_BYTE:
+            cpu.mem.write_byte(address, value)
+        elif size == OP_SIZE_WORD:
+            cpu.mem.write(address, value)
+        else:
+            cpu.mem.write_long(address, value)
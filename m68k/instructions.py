@@ -34,12 +34,12 @@ def _binary_op_write_result(cpu,
                             result,
                             op_size,
                             register_index,
-                            ea_address,
+                            ea_operand,
                             write_to_ea,
-                            ea_mode, ea_set, ea_cycles):
+                            ea_mode, ea_cycles):
     # Same for ADD, AND, OR and SUB
     if write_to_ea:
-        ea_set(cpu, ea_address, result)
+        ea.write(cpu, ea_operand, result)
 
         cycles = (12 if op_size == OP_SIZE_LONG else 8)
     else:
@@ -130,45 +130,55 @@ def _shift_value(cpu, value, shift_amount, op_size, direction, is_arith=True):
 
 def _evaluate_condition(cpu, condition):
     """Evaluate a branching condition."""
+    ccr = cpu.get_ccr()
+    c_bit = bool(ccr & CCR_C)
+    z_bit = bool(ccr & CCR_Z)
+    v_bit = bool(ccr & CCR_V)
+    n_bit = bool(ccr & CCR_N)
     if condition == 0:
         value = True
     elif condition == 1:
         value = False
     elif condition == 2:
-        value = not (cpu.get_c() or cpu.get_z())
+        value = not (c_bit or z_bit)
     elif condition == 3:
-        value = cpu.get_c() or cpu.get_z()
+        value = c_bit or z_bit
     elif condition == 4:
-        value = not cpu.get_c()
+        value = not c_bit
     elif condition == 5:
-        value = cpu.get_c()
+        value = c_bit
     elif condition == 6:
-        value = not cpu.get_z()
+        value = not z_bit
     elif condition == 7:
-        value = cpu.get_z()
+        value = z_bit
     elif condition == 8:
-        value = not cpu.get_v()
+        value = not v_bit
     elif condition == 9:
-        value = cpu.get_v()
+        value = v_bit
     elif condition == 10:
-        value = not cpu.get_n()
+        value = not n_bit
     elif condition == 11:
-        value = cpu.get_n()
+        value = n_bit
     elif condition == 12:
-        value = cpu.get_v() == cpu.get_n()
+        value = v_bit == n_bit
     elif condition == 13:
-        value = cpu.get_v() != cpu.get_n()
+        value = v_bit != n_bit
     elif condition == 14:
-        value = not cpu.get_z() and cpu.get_n() == cpu.get_v()
+        value = not z_bit and n_bit == v_bit
     else:
-        value = cpu.get_z() or cpu.get_n() != cpu.get_v()
+        value = z_bit or n_bit != v_bit
     return value
 
 
 def _subtract_set_ccr(cpu, dst, src, op_size, set_x=False, always_set_z=True):
     mask, msb_mask = _bit_masks(op_size)
     result = (dst - src) & mask
-    # Set CCR
+    if always_set_z or result:
+        # Set CCR
+        cpu.set_ccr_sub(dst, src, result, op_size, set_x)
+        return result
+
+    # Result is zero, but Z may only be set to 0
     res_msb = result & msb_mask
     dst_msb = dst & msb_mask
     src_msb = src & msb_mask
@@ -180,18 +190,13 @@ def _subtract_set_ccr(cpu, dst, src, op_size, set_x=False, always_set_z=True):
         (not src_msb and dst_msb and not res_msb)
         or (src_msb and not dst_msb and res_msb))
 
-    z_bit = not (result & mask)
-    ccr_mask = CCR_ALL
+    ccr_mask = CCR_ALL ^ CCR_Z
     if not set_x:
         ccr_mask = ccr_mask ^ CCR_X
-    if not always_set_z and z_bit:
-        # Only set z_bit to 0
-        ccr_mask = ccr_mask ^ CCR_Z
     cpu.set_ccr(
         ccr_mask,
         x=c_bit,
         n=bool(res_msb),
-        z=z_bit,
         v=v_bit,
         c=c_bit)
 
@@ -320,20 +325,21 @@ def abcd(cpu, register_src, register_dst, op_type):
     use_address = op_type == 1
     # Read operands
     if use_address:
-        src_get, _, src_address, _ = ea.accessors(
-            cpu, EA_MODE_A_PREDEC, register_src, OP_SIZE_BYTE)
-        src = src_get(cpu, src_address)
-
-        dst_get, dst_set, dst_address, _ = ea.accessors(
-            cpu, EA_MODE_A_PREDEC, register_dst, OP_SIZE_BYTE)
-        dst = dst_get(cpu, dst_address)
+        src_operand = cpu.src_operand
+        ea.resolve(
+            cpu, src_operand, EA_MODE_A_PREDEC, register_src, OP_SIZE_BYTE)
+        src = ea.read(cpu, src_operand)
+
+        dst_operand = cpu.dst_operand
+        ea.resolve(
+            cpu, dst_operand, EA_MODE_A_PREDEC, register_dst, OP_SIZE_BYTE)
+        dst = ea.read(cpu, dst_operand)
     else:
         # Data register to data register
         src = cpu.get_d(register_src, OP_SIZE_BYTE)
         dst = cpu.get_d(register_dst, OP_SIZE_BYTE)
         # For RPython, this needs to be set:
-        dst_set = None
-        dst_address = 0
+        dst_operand = cpu.dst_operand
 
     first_digit_raw = (src & 0xF) + (dst & 0xF) + cpu.get_x()
     # Always has to be a value from 0-9
@@ -362,7 +368,7 @@ def abcd(cpu, register_src, register_dst, op_type):
 
     # Write result
     if use_address:
-        dst_set(cpu, dst_address, result)
+        ea.write(cpu, dst_operand, result)
         cycles = 18
     else:
         cpu.set_d(register_dst, result, OP_SIZE_BYTE)
@@ -400,41 +406,28 @@ def add(cpu, register_index, op_type, op_size, ea_mode, ea_register):
                  and ea.is_valid(ea_mode, ea_register)
                  and (op_size != OP_SIZE_BYTE or ea_mode != EA_MODE_REG_A))):
         _raise_ea_error(ea_mode, ea_register)
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    v0 = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    v0 = ea.read(cpu, ea_operand)
     v1 = cpu.get_d(register_index, op_size)
 
     # Mask for the relevant bits of the result
-    mask, msb_mask = _bit_masks(op_size)
+    mask = _bit_masks(op_size)[0]
 
     # TODO This needs to be changed for 32-bit machines
     result_raw = v0 + v1
     result = result_raw & mask
 
     # Set CCR
-    c_bit = bool(result_raw & (mask + 1))  # The bit after the MSB is set
-    result_msb = result & msb_mask
-    v0_msb = v0 & msb_mask
-
-    cpu.set_ccr(
-        CCR_ALL,
-        x=c_bit,  # Same as C
-        n=bool(result_msb),
-        z=not result,
-        # Overflow is when the sign of 'v0' and 'v1' are the same, but
-        # 'result' has a different one.
-        v=bool((v0_msb == (v1 & msb_mask))
-               and (v0_msb != result_msb)),
-        c=c_bit)
+    cpu.set_ccr_add(v0, v1, result_raw, op_size)
 
     _binary_op_write_result(cpu,
                             result,
                             op_size,
                             register_index,
-                            ea_address,
+                            ea_operand,
                             write_to_ea,
-                            ea_mode, ea_set, ea_cycles)
+                            ea_mode, ea_cycles)
 
 
 def adda(cpu, register_index, op_size, ea_mode, ea_register):
@@ -457,11 +450,12 @@ def adda(cpu, register_index, op_size, ea_mode, ea_register):
     if not ea.is_valid(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
     is_word_op = op_size == 0
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu,
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(
+        cpu, ea_operand,
         ea_mode, ea_register,
         OP_SIZE_WORD if is_word_op else OP_SIZE_LONG)
-    src = ea_get(cpu, ea_address)
+    src = ea.read(cpu, ea_operand)
 
     if is_word_op:
         src = int_utils.sign_extend_16_to_32(src)
@@ -508,33 +502,20 @@ def addi(cpu, op_size, ea_mode, ea_register):
     # Read the immediate operand before resolving the effective address!
     v0 = _load_immediate(cpu, op_size)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    v1 = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    v1 = ea.read(cpu, ea_operand)
 
     # Mask for the relevant bits of the result
-    mask, msb_mask = _bit_masks(op_size)
+    mask = _bit_masks(op_size)[0]
 
     result_raw = v0 + v1
     result = result_raw & mask
 
     # Set CCR
-    c_bit = bool(result_raw & (mask + 1))  # The bit after the MSB is set
-    result_msb = result & msb_mask
-    v0_msb = v0 & msb_mask
-
-    cpu.set_ccr(
-        CCR_ALL,
-        x=c_bit,  # Same as C
-        n=bool(result_msb),
-        z=not result,
-        # Overflow is when the sign of 'v0' and 'v1' are the same, but
-        # 'result' has a different one.
-        v=bool((v0_msb == (v1 & msb_mask))
-               and (v0_msb != result_msb)),
-        c=c_bit)
+    cpu.set_ccr_add(v0, v1, result_raw, op_size)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     cycles = 16 if op_size == OP_SIZE_LONG else 8
     if ea_mode != EA_MODE_REG_D:
@@ -567,35 +548,24 @@ def addq(cpu, value, op_size, ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
     to_address = ea_mode == EA_MODE_REG_A
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_LONG if to_address else op_size)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(
+        cpu, ea_operand,
+        ea_mode, ea_register, OP_SIZE_LONG if to_address else op_size)
 
-    v0 = ea_get(cpu, ea_address)
+    v0 = ea.read(cpu, ea_operand)
     v1 = 8 if value == 0 else value
 
-    mask, msb_mask = _bit_masks(OP_SIZE_LONG if to_address else op_size)
+    mask = _bit_masks(OP_SIZE_LONG if to_address else op_size)[0]
 
     result_raw = v0 + v1
     result = result_raw & mask
 
     # Set CCR
-    c_bit = bool(result_raw & (mask + 1))  # The bit after the MSB is set
-    result_msb = result & msb_mask
-    v0_msb = v0 & msb_mask
-
     if not to_address:
-        cpu.set_ccr(
-            CCR_ALL,
-            x=c_bit,  # Same as C
-            n=bool(result_msb),
-            z=not result,
-            # Overflow is when the sign of 'v0' and 'v1' are the same, but
-            # 'result' has a different one.
-            v=bool((v0_msb == (v1 & msb_mask))
-                   and (v0_msb != result_msb)),
-            c=c_bit)
-
-    ea_set(cpu, ea_address, result)
+        cpu.set_ccr_add(v0, v1, result_raw, op_size)
+
+    ea.write(cpu, ea_operand, result)
 
     # Set cycles
     if ea_mode < 2:
@@ -630,20 +600,20 @@ def addx(cpu, register_src, register_dst, op_type, op_size):
     else:
         ea_mode = EA_MODE_REG_D
 
-    dst_get, dst_set, dst_address, _ = ea.accessors(
-        cpu, ea_mode, register_dst, op_size)
-    src_get, _, src_address, _ = ea.accessors(
-        cpu, ea_mode, register_src, op_size)
+    dst_operand = cpu.dst_operand
+    ea.resolve(cpu, dst_operand, ea_mode, register_dst, op_size)
+    src_operand = cpu.src_operand
+    ea.resolve(cpu, src_operand, ea_mode, register_src, op_size)
 
-    dst = dst_get(cpu, dst_address)
-    src = src_get(cpu, src_address)
+    dst = ea.read(cpu, dst_operand)
+    src = ea.read(cpu, src_operand)
 
     # Mask for the relevant bits of the result
     mask, msb_mask = _bit_masks(op_size)
 
     result = src + dst + cpu.get_x()
 
-    dst_set(cpu, dst_address, result)
+    ea.write(cpu, dst_operand, result)
 
     # Set CCR
     c_bit = bool(result & (mask + 1))  # The bit after the MSB is set
@@ -697,31 +667,23 @@ def and_(cpu, register_index, op_type, op_size, ea_mode, ea_register):
              or (not write_to_ea and ea.is_data(ea_mode, ea_register))):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, ea_set, address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    v0 = ea_get(cpu, address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    v0 = ea.read(cpu, ea_operand)
     v1 = cpu.get_d(register_index, op_size)
 
-    # Mask for the relevant bits of the result
-    msb_mask = _bit_masks(op_size)[1]
-
     result = v0 & v1
 
     # Set CCR
-    result_msb = result & msb_mask
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=bool(result_msb),
-                z=not result,
-                v=False,
-                c=False)
+    cpu.set_ccr_logic(result, op_size)
 
     _binary_op_write_result(cpu,
                             result,
                             op_size,
                             register_index,
-                            address,
+                            ea_operand,
                             write_to_ea,
-                            ea_mode, ea_set, ea_cycles)
+                            ea_mode, ea_cycles)
 
 
 def andi(cpu, op_size, ea_mode, ea_register):
@@ -743,19 +705,15 @@ def andi(cpu, op_size, ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
     v0 = _load_immediate(cpu, op_size)
-    msb_mask = _bit_masks(op_size)[1]
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
 
-    result = v0 & ea_get(cpu, ea_address)
+    result = v0 & ea.read(cpu, ea_operand)
 
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=bool(result & msb_mask),
-                z=not result,
-                v=0, c=0)
+    cpu.set_ccr_logic(result, op_size)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     if ea_mode < 2:
         cycles = 14 if op_size == OP_SIZE_LONG else 8
@@ -865,13 +823,13 @@ def asl_asr_to_mem(cpu, direction, ea_mode, ea_register):
     if not ea.is_memory_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
-    value = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
+    value = ea.read(cpu, ea_operand)
 
     result = _shift_value(cpu, value, 1, OP_SIZE_WORD, direction)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     cpu.increment_cycles(8 + ea_cycles)
 
@@ -938,17 +896,18 @@ def bchg(cpu, register_index, use_register, ea_mode, ea_register):
     target_data_register = ea_mode == EA_MODE_REG_D
     index &= (31 if target_data_register else 7)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu,
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(
+        cpu, ea_operand,
         ea_mode, ea_register,
         OP_SIZE_LONG if target_data_register else OP_SIZE_BYTE)
-    value = ea_get(cpu, ea_address)
+    value = ea.read(cpu, ea_operand)
 
     z_bit = not int_utils.select_bits(value, index)
     cpu.set_ccr(CCR_Z, z=z_bit)
 
     mask = 1 << index
-    ea_set(cpu, ea_address, (value | mask) if z_bit else (value & ~mask))
+    ea.write(cpu, ea_operand, (value | mask) if z_bit else (value & ~mask))
 
     cycles = \
         (8 if use_register else 12) + (0 if target_data_register else ea_cycles)
@@ -986,17 +945,18 @@ def bclr(cpu, register_index, use_register, ea_mode, ea_register):
     target_data_register = ea_mode == EA_MODE_REG_D
     index &= (31 if target_data_register else 7)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu,
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(
+        cpu, ea_operand,
         ea_mode, ea_register,
         OP_SIZE_LONG if target_data_register else OP_SIZE_BYTE)
-    value = ea_get(cpu, ea_address)
+    value = ea.read(cpu, ea_operand)
 
     z_bit = not int_utils.select_bits(value, index)
     cpu.set_ccr(CCR_Z, z=z_bit)
 
     mask = ~(1 << index)
-    ea_set(cpu, ea_address, value & mask)
+    ea.write(cpu, ea_operand, value & mask)
 
     cycles = \
         (8 if use_register else 12) + (2 if target_data_register else ea_cycles)
@@ -1056,17 +1016,18 @@ def bset(cpu, register_index, use_register, ea_mode, ea_register):
     target_data_register = ea_mode == EA_MODE_REG_D
     index &= (31 if target_data_register else 7)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu,
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(
+        cpu, ea_operand,
         ea_mode, ea_register,
         OP_SIZE_LONG if target_data_register else OP_SIZE_BYTE)
-    value = ea_get(cpu, ea_address)
+    value = ea.read(cpu, ea_operand)
 
     z_bit = not int_utils.select_bits(value, index)
     cpu.set_ccr(CCR_Z, z=z_bit)
 
     mask = 1 << index
-    ea_set(cpu, ea_address, value | mask)
+    ea.write(cpu, ea_operand, value | mask)
 
     cycles = \
         (8 if use_register else 12) + (0 if target_data_register else ea_cycles)
@@ -1133,11 +1094,12 @@ def btst(cpu, register_index, use_register, ea_mode, ea_register):
     target_data_register = ea_mode == EA_MODE_REG_D
     index &= (31 if target_data_register else 7)
 
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu,
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(
+        cpu, ea_operand,
         ea_mode, ea_register,
         OP_SIZE_LONG if target_data_register else OP_SIZE_BYTE)
-    value = ea_get(cpu, ea_address)
+    value = ea.read(cpu, ea_operand)
 
     z_bit = not int_utils.select_bits(value, index)
     cpu.set_ccr(CCR_Z, z=z_bit)
@@ -1162,9 +1124,9 @@ def chk(cpu, register_index, ea_mode, ea_register):
     """
     if not ea.is_data(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
-    upper_bound = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
+    upper_bound = ea.read(cpu, ea_operand)
 
     value = cpu.get_d(register_index, OP_SIZE_WORD)
 
@@ -1197,10 +1159,10 @@ def clr(cpu, op_size, ea_mode, ea_register):
         raise IllegalInstruction()
     if not ea.is_data_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
-    _, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
 
-    ea_set(cpu, ea_address, 0)
+    ea.write(cpu, ea_operand, 0)
 
     if ea_mode == EA_MODE_REG_D:
         cycles = 6 if op_size == OP_SIZE_LONG else 4
@@ -1233,9 +1195,9 @@ def cmp_(cpu, register_index, op_size, ea_mode, ea_register):
 
     dst = cpu.get_d(register_index, op_size)
 
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    src = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    src = ea.read(cpu, ea_operand)
 
     _subtract_set_ccr(cpu, dst, src, op_size)
 
@@ -1263,11 +1225,12 @@ def cmpa(cpu, register_index, op_size, ea_mode, ea_register):
 
     dst = cpu.get_a(register_index, OP_SIZE_LONG)
 
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu,
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(
+        cpu, ea_operand,
         ea_mode, ea_register,
         OP_SIZE_LONG if op_size == 1 else OP_SIZE_WORD)
-    src = ea_get(cpu, ea_address)
+    src = ea.read(cpu, ea_operand)
     if op_size == 0:
         src = int_utils.sign_extend_16_to_32(src)
 
@@ -1296,9 +1259,9 @@ def cmpi(cpu, op_size, ea_mode, ea_register):
 
     src = _load_immediate(cpu, op_size)
 
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    dst = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    dst = ea.read(cpu, ea_operand)
 
     _subtract_set_ccr(cpu, dst, src, OP_SIZE_LONG)
 
@@ -1326,13 +1289,13 @@ def cmpm(cpu, register_dst, register_src, op_size):
     """
     if op_size == 0b11:
         raise IllegalInstruction()
-    dst_get, _, dst_address, _ = ea.accessors(
-        cpu, EA_MODE_A_POSTINC, register_dst, op_size)
-    dst = dst_get(cpu, dst_address)
+    dst_operand = cpu.dst_operand
+    ea.resolve(cpu, dst_operand, EA_MODE_A_POSTINC, register_dst, op_size)
+    dst = ea.read(cpu, dst_operand)
 
-    src_get, _, src_address, _ = ea.accessors(
-        cpu, EA_MODE_A_POSTINC, register_src, op_size)
-    src = src_get(cpu, src_address)
+    src_operand = cpu.src_operand
+    ea.resolve(cpu, src_operand, EA_MODE_A_POSTINC, register_src, op_size)
+    src = ea.read(cpu, src_operand)
 
     _subtract_set_ccr(cpu, dst, src, op_size)
 
@@ -1391,9 +1354,9 @@ def divs(cpu, register_index, ea_mode, ea_register):
     if not ea.is_data(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
-    divisor = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
+    divisor = ea.read(cpu, ea_operand)
 
     if divisor == 0:
         cpu.cause_trap(5)
@@ -1453,9 +1416,9 @@ def divu(cpu, register_index, ea_mode, ea_register):
     if not ea.is_data(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
-    divisor = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
+    divisor = ea.read(cpu, ea_operand)
 
     if divisor == 0:
         cpu.cause_trap(5)
@@ -1504,25 +1467,20 @@ def eor(cpu, register_index, op_size, ea_mode, ea_register):
     if not ea.is_data_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    v0 = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    v0 = ea.read(cpu, ea_operand)
     v1 = cpu.get_d(register_index, op_size)
 
     # Mask for the relevant bits of the result
-    mask, msb_mask = _bit_masks(op_size)
+    mask = _bit_masks(op_size)[0]
 
     result = (v0 ^ v1) & mask
 
     # Set CCR
-    result_msb = result & msb_mask
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=bool(result_msb),
-                z=not result,
-                v=False,
-                c=False)
+    cpu.set_ccr_logic(result, op_size)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     cycles = 8 if op_size == OP_SIZE_LONG else 4
     if ea_mode != EA_MODE_REG_D:
@@ -1549,20 +1507,16 @@ def eori(cpu, op_size, ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
     v0 = _load_immediate(cpu, op_size)
-    mask, msb_mask = _bit_masks(op_size)
+    mask = _bit_masks(op_size)[0]
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
 
-    result = (v0 ^ ea_get(cpu, ea_address)) & mask
+    result = (v0 ^ ea.read(cpu, ea_operand)) & mask
 
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=bool(result & msb_mask),
-                z=not result,
-                v=False,
-                c=False)
+    cpu.set_ccr_logic(result, op_size)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     if ea_mode < 2:
         cycles = 16 if op_size == OP_SIZE_LONG else 8
@@ -1672,11 +1626,7 @@ def ext(cpu, register_index, op_size):
     size = OP_SIZE_LONG if is_word_to_long else OP_SIZE_WORD
     cpu.set_d(register_index, result, size)
 
-    msb_mask = _bit_masks(size)[1]
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=bool(result & msb_mask),
-                z=not result,
-                v=0, c=0)
+    cpu.set_ccr_logic(result, size)
 
     cpu.increment_cycles(4)
 
@@ -1700,8 +1650,9 @@ def jmp(cpu, ea_mode, ea_register):
     if not ea.is_control(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_address = ea.accessors(cpu, ea_mode, ea_register, OP_SIZE_LONG)[2]
-    cpu.set_pc(ea_address)
+    ea_operand = cpu.dst_operand
+    ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_LONG)
+    cpu.set_pc(ea_operand.location)
 
     if ea_mode == EA_MODE_A_INDIRECT:
         cycles = 8
@@ -1734,9 +1685,10 @@ def jsr(cpu, ea_mode, ea_register):
     if not ea.is_control(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_address = ea.accessors(cpu, ea_mode, ea_register, OP_SIZE_LONG)[2]
+    ea_operand = cpu.dst_operand
+    ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_LONG)
     cpu.push(cpu.get_pc(), OP_SIZE_LONG)
-    cpu.set_pc(ea_address)
+    cpu.set_pc(ea_operand.location)
 
     if ea_mode == EA_MODE_A_INDIRECT:
         cycles = 16
@@ -1771,9 +1723,9 @@ def lea(cpu, register_index, ea_mode, ea_register):
     if not ea.is_control(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    _, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_LONG)
-    cpu.set_a(register_index, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_LONG)
+    cpu.set_a(register_index, ea_operand.location)
 
     extra_cycles = \
         2 if (ea_mode == EA_MODE_A_INDX
@@ -1866,14 +1818,14 @@ def lsl_lsr_to_mem(cpu, direction, ea_mode, ea_register):
     if not ea.is_memory_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
-    value = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
+    value = ea.read(cpu, ea_operand)
 
     result = _shift_value(
         cpu, value, 1, OP_SIZE_WORD, direction, is_arith=False)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     cpu.increment_cycles(8 + ea_cycles)
 
@@ -1907,21 +1859,17 @@ def move(cpu, dst_mode, dst_register, src_mode, src_register, op_size):
         op_size = OP_SIZE_WORD
 
     # Resolve effective addresses
-    src_get, _, src_address, src_cycles = ea.accessors(
-        cpu, src_mode, src_register, op_size)
-    _, dst_set, dst_address, dst_cycles = ea.accessors(
-        cpu, dst_mode, dst_register, op_size)
+    src_operand = cpu.src_operand
+    src_cycles = ea.resolve(cpu, src_operand, src_mode, src_register, op_size)
+    dst_operand = cpu.dst_operand
+    dst_cycles = ea.resolve(cpu, dst_operand, dst_mode, dst_register, op_size)
 
     # Move value
-    value = src_get(cpu, src_address)
-    dst_set(cpu, dst_address, value)
+    value = ea.read(cpu, src_operand)
+    ea.write(cpu, dst_operand, value)
 
     # Set CCR
-    msb_mask = _bit_masks(op_size)[1]
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=bool(value & msb_mask),
-                z=not(value),
-                v=0, c=0)
+    cpu.set_ccr_logic(value, op_size)
 
     # Set cycles
     cpu.increment_cycles(
@@ -1955,11 +1903,11 @@ def movea(cpu, dst_register, src_mode, src_register, op_size):
         op_size = OP_SIZE_WORD
 
     # Resolve effective addresses
-    src_get, _, src_address, src_cycles = ea.accessors(
-        cpu, src_mode, src_register, op_size)
+    src_operand = cpu.src_operand
+    src_cycles = ea.resolve(cpu, src_operand, src_mode, src_register, op_size)
 
     # Move value
-    value = src_get(cpu, src_address)
+    value = ea.read(cpu, src_operand)
     if op_size == OP_SIZE_WORD:
         value = int_utils.sign_extend_16_to_32(value)
     cpu.set_a(dst_register, value)
@@ -1980,10 +1928,10 @@ def move_to_ccr(cpu, ea_mode, ea_register):
     if not ea.is_data(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
 
-    value = ea_get(cpu, ea_address)
+    value = ea.read(cpu, ea_operand)
 
     cpu.set_ccr(CCR_ALL,
                 x=bool(value & CCR_X),
@@ -2008,10 +1956,10 @@ def move_from_sr(cpu, ea_mode, ea_register):
     if not ea.is_data_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    _, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
 
-    ea_set(cpu, ea_address, cpu.get_sr_full())
+    ea.write(cpu, ea_operand, cpu.get_sr_full())
 
     cpu.increment_cycles((8 + ea_cycles) if ea_mode != EA_MODE_REG_D else 6)
 
@@ -2028,9 +1976,9 @@ def move_to_sr(cpu, ea_mode, ea_register):
     if not ea.is_data(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
-    value = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
+    value = ea.read(cpu, ea_operand)
     cpu.set_ccr(CCR_ALL,
                 int_utils.select_bits(value, 4),
                 int_utils.select_bits(value, 3),
@@ -2109,8 +2057,9 @@ def movem(cpu, direction, op_size, ea_mode, ea_register):
         base_address = cpu.get_a(ea_register)
         ea_cycles = 8 if op_size == OP_SIZE_LONG else 4
     else:
-        _, _, base_address, ea_cycles = ea.accessors(
-            cpu, ea_mode, ea_register, op_size)
+        ea_operand = cpu.dst_operand
+        ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+        base_address = ea_operand.location
 
     if direction == 0:
         # Register to memory
@@ -2141,8 +2090,7 @@ def movem(cpu, direction, op_size, ea_mode, ea_register):
                     # Is truncated automatically
                     cpu.mem.write(base_address, value)
                 else:
-                    cpu.mem.write(base_address, value >> 16)
-                    cpu.mem.write(base_address + 2, value)
+                    cpu.mem.write_long(base_address, value)
 
                 if not is_special_mode:
                     # Increment base now
@@ -2156,11 +2104,11 @@ def movem(cpu, direction, op_size, ea_mode, ea_register):
                 amount += 1
 
                 # Get the memory value
-                first = cpu.mem.read(base_address)
                 if op_size == OP_SIZE_WORD:
-                    value = int_utils.sign_extend_16_to_32(first)
+                    value = int_utils.sign_extend_16_to_32(
+                        cpu.mem.read(base_address))
                 else:
-                    value = (first << 16) | cpu.mem.read(base_address + 2)
+                    value = cpu.mem.read_long(base_address)
 
                 # 'value' contains the Long Word to write
                 if mask_index < 8:
@@ -2203,15 +2151,15 @@ def movep(cpu, data_register, address_register, direction, op_size):
     base_address = (cpu.get_a(address_register) + displacement) & 0xFFFFFFFF
     if direction == 0:
         # Memory to register
-        # Read the next two values, only consider the upper byte
+        # Read the bytes at every second address
         value = \
-            (cpu.mem.read(base_address) & 0xFF00) \
-            | (cpu.mem.read(base_address + 2) >> 8)
+            (cpu.mem.read_byte(base_address) << 8) \
+            | cpu.mem.read_byte(base_address + 2)
         if op_size == 1:
             # Read 2 more values. The ones before are the upper word
-            value = (value << 16) |\
-                (cpu.mem.read(base_address + 4) & 0xFF00) \
-                | (cpu.mem.read(base_address + 6) >> 8)
+            value = (value << 16) \
+                | (cpu.mem.read_byte(base_address + 4) << 8) \
+                | cpu.mem.read_byte(base_address + 6)
 
         cpu.set_d(data_register,
                   value,
@@ -2221,27 +2169,15 @@ def movep(cpu, data_register, address_register, direction, op_size):
         value = cpu.get_d(data_register, OP_SIZE_LONG)
         if op_size == 1:
             # First write the upper word
-            original = cpu.mem.read(base_address)
-            cpu.mem.write(
-                base_address,
-                (original & 0xFF) | ((value >> 16) & 0xFF00))
-            original = cpu.mem.read(base_address + 2)
-            cpu.mem.write(
-                base_address + 2,
-                (original & 0xFF) | ((value >> 8) & 0xFF00))
+            cpu.mem.write_byte(base_address, value >> 24)
+            cpu.mem.write_byte(base_address + 2, value >> 16)
             # Change the base address so that the next step writes to the
             # correct position
             base_address = base_address + 4
 
         # Write the registers lower word
-        original = cpu.mem.read(base_address)
-        cpu.mem.write(
-            base_address,
-            (original & 0xFF) | (value & 0xFF00))
-        original = cpu.mem.read(base_address + 2)
-        cpu.mem.write(
-            base_address + 2,
-            (original & 0xFF) | ((value << 8) & 0xFF00))
+        cpu.mem.write_byte(base_address, value >> 8)
+        cpu.mem.write_byte(base_address + 2, value)
 
     cpu.increment_cycles(24 if op_size == 1 else 16)
 
@@ -2283,9 +2219,9 @@ def muls(cpu, register_index, ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
     v0 = cpu.get_d(register_index, OP_SIZE_WORD)
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
-    v1 = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
+    v1 = ea.read(cpu, ea_operand)
 
     result = (int_utils.sign_extend_16_to_32(v0)
               * int_utils.sign_extend_16_to_32(v1)) & 0xFFFFFFFF
@@ -2343,9 +2279,9 @@ def mulu(cpu, register_index, ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
     v0 = cpu.get_d(register_index, OP_SIZE_WORD)
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
-    v1 = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
+    v1 = ea.read(cpu, ea_operand)
 
     result = v0 * v1
     cpu.set_d(register_index, result, OP_SIZE_LONG)
@@ -2379,9 +2315,9 @@ def nbcd(cpu, ea_mode, ea_register):
     # TODO rework algorithm
     if not ea.is_data_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_BYTE)
-    value = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_BYTE)
+    value = ea.read(cpu, ea_operand)
     # We assume that 'value' is a valid BCD
     dec_value = (value & 0xF) + ((value >> 4) * 10)
     result_raw = 99 - dec_value  # 9s complement
@@ -2396,7 +2332,7 @@ def nbcd(cpu, ea_mode, ea_register):
         second_digit = 0
     result = first_digit | (second_digit << 4)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     # Set CCR
     ccr_mask = CCR_X | CCR_C
@@ -2424,9 +2360,9 @@ def neg(cpu, op_size, ea_mode, ea_register):
         raise IllegalInstruction()
     if not ea.is_data_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    value = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    value = ea.read(cpu, ea_operand)
 
     msb_mask = _bit_masks(op_size)[1]
     if value == msb_mask:
@@ -2437,7 +2373,7 @@ def neg(cpu, op_size, ea_mode, ea_register):
         v_bit = False
         result = ~value + 1
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     c_bit = bool(result)
     cpu.set_ccr(CCR_ALL,
@@ -2470,9 +2406,9 @@ def negx(cpu, op_size, ea_mode, ea_register):
         raise IllegalInstruction()
     if not ea.is_data_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    value = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    value = ea.read(cpu, ea_operand)
     x_value = cpu.get_x()
 
     mask, msb_mask = _bit_masks(op_size)
@@ -2484,7 +2420,7 @@ def negx(cpu, op_size, ea_mode, ea_register):
         v_bit = False
         result = (~(value + x_value) + 1) & mask
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     c_bit = bool(result)
     ccr_mask = CCR_ALL
@@ -2526,19 +2462,15 @@ def not_(cpu, op_size, ea_mode, ea_register):
         raise IllegalInstruction()
     if not ea.is_data_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
 
-    mask, msb_mask = _bit_masks(op_size)
+    mask = _bit_masks(op_size)[0]
 
-    result = ~ea_get(cpu, ea_address) & mask
-    ea_set(cpu, ea_address, result)
+    result = ~ea.read(cpu, ea_operand) & mask
+    ea.write(cpu, ea_operand, result)
 
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=bool(result & msb_mask),
-                z=not result,
-                v=0,
-                c=0)
+    cpu.set_ccr_logic(result, op_size)
 
     if ea_mode == EA_MODE_REG_D:
         cycles = 6 if op_size == OP_SIZE_LONG else 4
@@ -2576,30 +2508,26 @@ def or_(cpu, register_index, op_type, op_size, ea_mode, ea_register):
              or (not write_to_ea and ea.is_data(ea_mode, ea_register))):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, ea_set, address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    v0 = ea_get(cpu, address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    v0 = ea.read(cpu, ea_operand)
     v1 = cpu.get_d(register_index, op_size)
 
     # Mask for the relevant bits of the result
-    mask, msb_mask = _bit_masks(op_size)
+    mask = _bit_masks(op_size)[0]
 
     result = (v0 | v1) & mask
 
     # Set CCR
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=bool(result & msb_mask),
-                z=not result,
-                v=False,
-                c=False)
+    cpu.set_ccr_logic(result, op_size)
 
     _binary_op_write_result(cpu,
                             result,
                             op_size,
                             register_index,
-                            address,
+                            ea_operand,
                             write_to_ea,
-                            ea_mode, ea_set, ea_cycles)
+                            ea_mode, ea_cycles)
 
 
 def ori(cpu, op_size, ea_mode, ea_register):
@@ -2621,20 +2549,16 @@ def ori(cpu, op_size, ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
     v0 = _load_immediate(cpu, op_size)
-    mask, msb_mask = _bit_masks(op_size)
+    mask = _bit_masks(op_size)[0]
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
 
-    result = (v0 | ea_get(cpu, ea_address)) & mask
+    result = (v0 | ea.read(cpu, ea_operand)) & mask
 
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=bool(result & msb_mask),
-                z=not result,
-                v=False,
-                c=False)
+    cpu.set_ccr_logic(result, op_size)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     if ea_mode < 2:
         cycles = 16 if op_size == OP_SIZE_LONG else 8
@@ -2695,9 +2619,9 @@ def pea(cpu, ea_mode, ea_register):
     """
     if not ea.is_control(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
-    _, _, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_LONG)
-    cpu.push(ea_address, OP_SIZE_LONG)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_LONG)
+    cpu.push(ea_operand.location, OP_SIZE_LONG)
     extra_cycles = \
         2 if (ea_mode == EA_MODE_A_INDX
               or (ea_mode == EA_MODE_OTHER
@@ -2775,13 +2699,13 @@ def rol_ror_to_mem(cpu, direction, ea_mode, ea_register):
     if not ea.is_memory_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
-    value = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
+    value = ea.read(cpu, ea_operand)
 
     result = _rotate_value(cpu, value, 1, OP_SIZE_WORD, direction)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     cpu.increment_cycles(8 + ea_cycles)
 
@@ -2850,13 +2774,13 @@ def roxl_roxr_to_mem(cpu, direction, ea_mode, ea_register):
     if not ea.is_memory_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_WORD)
-    value = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_WORD)
+    value = ea.read(cpu, ea_operand)
 
     result = _rotate_value_extend(cpu, value, 1, OP_SIZE_WORD, direction)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     cpu.increment_cycles(8 + ea_cycles)
 
@@ -2932,13 +2856,13 @@ def sbcd(cpu, register_dst, register_src, op_type):
     use_memory = op_type == 1
     ea_mode = EA_MODE_A_PREDEC if use_memory else EA_MODE_REG_D
 
-    src_get, _, src_address, _ = ea.accessors(
-        cpu, ea_mode, register_src, OP_SIZE_BYTE)
-    dst_get, dst_set, dst_address, _ = ea.accessors(
-        cpu, ea_mode, register_dst, OP_SIZE_BYTE)
+    src_operand = cpu.src_operand
+    ea.resolve(cpu, src_operand, ea_mode, register_src, OP_SIZE_BYTE)
+    dst_operand = cpu.dst_operand
+    ea.resolve(cpu, dst_operand, ea_mode, register_dst, OP_SIZE_BYTE)
 
-    src = src_get(cpu, src_address)
-    dst = dst_get(cpu, dst_address)
+    src = ea.read(cpu, src_operand)
+    dst = ea.read(cpu, dst_operand)
 
     src_dec = 10 * ((src & 0xF0) >> 4) + (src & 0xF)
     dst_dec = 10 * ((dst & 0xF0) >> 4) + (dst & 0xF)
@@ -2950,7 +2874,7 @@ def sbcd(cpu, register_dst, register_src, op_type):
     second_digit = (result_dec - first_digit) // 10
     result = (second_digit << 4) | first_digit
 
-    dst_set(cpu, dst_address, result)
+    ea.write(cpu, dst_operand, result)
 
     # Set CCR
     c_bit = src_dec > dst_dec
@@ -2978,9 +2902,9 @@ def scc(cpu, condition, ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
     value = 0xFF if _evaluate_condition(cpu, condition) else 0
-    _, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_BYTE)
-    ea_set(cpu, ea_address, value)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_BYTE)
+    ea.write(cpu, ea_operand, value)
 
     cpu.increment_cycles(
         (6 if value else 4)
@@ -3043,9 +2967,9 @@ def sub(cpu, register_index, op_type, op_size, ea_mode, ea_register):
                        or ea_mode != EA_MODE_REG_A)))):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    v0 = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    v0 = ea.read(cpu, ea_operand)
     v1 = cpu.get_d(register_index, op_size)
 
     dst, src = (v0, v1) if write_to_ea else (v1, v0)
@@ -3056,9 +2980,9 @@ def sub(cpu, register_index, op_type, op_size, ea_mode, ea_register):
                             result,
                             op_size,
                             register_index,
-                            ea_address,
+                            ea_operand,
                             write_to_ea,
-                            ea_mode, ea_set, ea_cycles)
+                            ea_mode, ea_cycles)
 
 
 def suba(cpu, register_index, op_size, ea_mode, ea_register):
@@ -3081,11 +3005,12 @@ def suba(cpu, register_index, op_size, ea_mode, ea_register):
     if not ea.is_valid(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
     is_word_op = op_size == 0
-    ea_get, _, ea_address, ea_cycles = ea.accessors(
-        cpu,
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(
+        cpu, ea_operand,
         ea_mode, ea_register,
         OP_SIZE_WORD if is_word_op else OP_SIZE_LONG)
-    src = ea_get(cpu, ea_address)
+    src = ea.read(cpu, ea_operand)
 
     if is_word_op:
         src = int_utils.sign_extend_16_to_32(src)
@@ -3132,13 +3057,13 @@ def subi(cpu, op_size, ea_mode, ea_register):
     # Read the immediate operand before resolving the effective address!
     v0 = _load_immediate(cpu, op_size)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    v1 = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    v1 = ea.read(cpu, ea_operand)
 
     result = _subtract_set_ccr(cpu, v1, v0, op_size, set_x=True)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     cycles = 16 if op_size == OP_SIZE_LONG else 8
     if ea_mode != EA_MODE_REG_D:
@@ -3171,10 +3096,12 @@ def subq(cpu, value, op_size, ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
     to_address = ea_mode == EA_MODE_REG_A
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_LONG if to_address else op_size)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(
+        cpu, ea_operand,
+        ea_mode, ea_register, OP_SIZE_LONG if to_address else op_size)
 
-    v0 = ea_get(cpu, ea_address)
+    v0 = ea.read(cpu, ea_operand)
     v1 = 8 if value == 0 else value
 
     if to_address:
@@ -3182,7 +3109,7 @@ def subq(cpu, value, op_size, ea_mode, ea_register):
     else:
         result = _subtract_set_ccr(cpu, v0, v1, op_size, set_x=True)
 
-    ea_set(cpu, ea_address, result)
+    ea.write(cpu, ea_operand, result)
 
     # Set cycles
     if ea_mode < 2:
@@ -3217,17 +3144,17 @@ def subx(cpu, register_dst, register_src, op_type, op_size):
     else:
         ea_mode = EA_MODE_REG_D
 
-    dst_get, dst_set, dst_address, _ = ea.accessors(
-        cpu, ea_mode, register_dst, op_size)
-    src_get, _, src_address, _ = ea.accessors(
-        cpu, ea_mode, register_src, op_size)
+    dst_operand = cpu.dst_operand
+    ea.resolve(cpu, dst_operand, ea_mode, register_dst, op_size)
+    src_operand = cpu.src_operand
+    ea.resolve(cpu, src_operand, ea_mode, register_src, op_size)
 
-    dst = dst_get(cpu, dst_address)
-    src = src_get(cpu, src_address) + cpu.get_x()
+    dst = ea.read(cpu, dst_operand)
+    src = ea.read(cpu, src_operand) + cpu.get_x()
 
     result = _subtract_set_ccr(cpu, dst, src, op_size, set_x=True, always_set_z=False)
 
-    dst_set(cpu, dst_address, result)
+    ea.write(cpu, dst_operand, result)
 
     # Write result
     if use_address:
@@ -3250,10 +3177,7 @@ def swap(cpu, register_index):
     result = (value >> 16) | ((value & 0xFFFF) << 16)
     cpu.set_d(register_index, result, OP_SIZE_LONG)
 
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=bool(0x80000000 & result),
-                z=not result,
-                v=False, x=False)
+    cpu.set_ccr_logic(result, OP_SIZE_LONG)
 
     cpu.increment_cycles(4)
 
@@ -3269,13 +3193,13 @@ def tas(cpu, ea_mode, ea_register):
     """
     if not ea.is_data_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, OP_SIZE_BYTE)
-    value = ea_get(cpu, ea_address)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, OP_SIZE_BYTE)
+    value = ea.read(cpu, ea_operand)
 
     n_bit = bool(value & 0x80)
     if not n_bit:
-        ea_set(cpu, ea_address, value | 0x80)
+        ea.write(cpu, ea_operand, value | 0x80)
 
     cpu.set_ccr(CCR_ALL ^ CCR_X,
                 n=n_bit,
@@ -3325,17 +3249,11 @@ def tst(cpu, op_size, ea_mode, ea_register):
     if not ea.is_data_alterable(ea_mode, ea_register):
         _raise_ea_error(ea_mode, ea_register)
 
-    ea_get, ea_set, ea_address, ea_cycles = ea.accessors(
-        cpu, ea_mode, ea_register, op_size)
-    value = ea_get(cpu, ea_address)
-
-    mask, msb_mask = _bit_masks(op_size)
-    n_bit = bool(value & msb_mask)
+    ea_operand = cpu.dst_operand
+    ea_cycles = ea.resolve(cpu, ea_operand, ea_mode, ea_register, op_size)
+    value = ea.read(cpu, ea_operand)
 
-    cpu.set_ccr(CCR_ALL ^ CCR_X,
-                n=n_bit,
-                z=not (value & mask),
-                v=False, c=False)
+    cpu.set_ccr_logic(value, op_size)
 
     cpu.increment_cycles(4  + ea_cycles)
 
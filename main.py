@@ -26,6 +26,9 @@ _EXIT_ARG_SCALE_FACTOR = 6
 _EXIT_ARG_SILENT_CYCLES = 7
 _EXIT_VAL_SILENT_CYCLES = 8
 _EXIT_ARG_QUIT_AFTER = 9
+_EXIT_ARG_FRAMESKIP = 10
+_EXIT_ARG_SAVE_STATE = 11
+_EXIT_STATE_MISSING = 12
 
 _F_INF = float("inf")
 _F_NIN = float("-inf")
@@ -102,6 +105,29 @@ def entry_point(argv):
 
     quit_after = max(-1, quit_after)
 
+    render_never = _pop_flag(args, ["--render-never"])
+    frameskip_str = _pop_arg(args, ["--frameskip"])
+    try:
+        frameskip = _parse_frameskip(frameskip_str, render_never)
+    except ValueError:
+        print("Illegal value for --frameskip: %s" % frameskip_str)
+        return _EXIT_ARG_FRAMESKIP
+
+    load_state_file = _pop_arg(args, ["--load-state"])
+    save_state_str = _pop_arg(args, ["--save-state-at-cycle"])
+    try:
+        save_state_cycle = \
+            -1 if save_state_str is None else int(save_state_str)
+    except ValueError:
+        print("Illegal value for --save-state-at-cycle: %s" % save_state_str)
+        return _EXIT_ARG_SAVE_STATE
+
+    if load_state_file is None:
+        load_state_file = ""
+    elif not os.path.isfile(load_state_file):
+        print("The state file %s does not exist" % load_state_file)
+        return _EXIT_STATE_MISSING
+
     if not args:
         print("No file name found")
         return _EXIT_NO_FILE
@@ -130,7 +156,10 @@ def entry_point(argv):
                           fail_on_invalid,
                           silent_cycles,
                           quit_after,
-                          debug_mode)
+                          debug_mode,
+                          frameskip,
+                          load_state_file,
+                          max(-1, save_state_cycle))
     return _EXIT_SUCCESS
 
 
@@ -138,7 +167,8 @@ def _print_usage(program_name):
     print("""\
 Usage:
 %s [-s/--scale scale_factor] [--no-display] [--quit-on-stop] [-v/--verbose]
-  file_name
+  [--frameskip frames] [--render-never] [--load-state state_file]
+  [--save-state-at-cycle cycle] file_name
 
 Arguments:
 
@@ -155,6 +185,7 @@ file_name
         purpouses.
         Note, that most screen operations (like the memory map, HBLANK and
         VBLANK) will still work properly.
+        Loops that only wait for an interrupt are skipped.
 
 --quit-on-stop
         Set this flag to quit the emulator when the M68k encounters a STOP
@@ -166,6 +197,7 @@ file_name
 
 --show-stats
         Set this flag to print some stats of the emulation after it finishes.
+        This includes the number of cycles skipped in idle loops.
 
 --dump-m68k-ram, --dump-vdp-vram, --dump-vdp-cram, --dump-z80-ram, --dump-rom
         These flags will cause the corresponding memory device to be dumped to
@@ -190,9 +222,49 @@ file_name
         Set this flag to enable stepping through the emulation instruction by
         instruction.
 
+--frameskip frames (default: 0)
+        Define an amount of frames to skip after each shown frame. Skipped
+        frames are emulated as usual, including HBLANK and VBLANK, but none of
+        their pixels are drawn. A negative value skips all frames.
+
+--render-never
+        Set this flag to skip all frames, see --frameskip. Without a display
+        no frame is ever drawn.
+
+--load-state state_file
+        Load a state of the console before the emulation starts. The state
+        must have been saved for the same file. The cycle counter continues
+        from the state, which also applies to --quit-after and
+        --save-state-at-cycle.
+
+--save-state-at-cycle cycle (default: -1)
+        Define a number of M68k cycles after which to save the state of the
+        console to the file_name with the extension ".state". Default is -1,
+        which never saves the state.
+
 """ % (program_name, _DEFAULT_SCALE_FACTOR))
 
 
+def _parse_frameskip(frameskip_str, render_never):
+    """
+    Get the amount of frames to skip after each drawn frame.
+
+    Parameters
+    ----------
+    frameskip_str: str | None
+        The value of --frameskip, or ``None`` if it was not given.
+
+    render_never: bool
+        Whether --render-never was given, which makes the result negative.
+
+    Raises a ``ValueError`` if ``frameskip_str`` is not an integer.
+    """
+    frameskip = 0 if frameskip_str is None else int(frameskip_str)
+    if render_never:
+        return -1
+    return frameskip
+
+
 def _pop_arg(args,
              names,
              required=False):
@@ -9,10 +9,11 @@ Created on Sat Sep 16 02:20:16 2023
 
 import os
 
-from rpython.rlib import rtime
+from rpython.rlib import rmmap, rtime
+from rpython.rlib.objectmodel import we_are_translated
 import m68k.cpu
-from megadrive import memory
-from megadrive.devices import display
+from megadrive import memory, scheduler, state
+from megadrive.devices import display, rsdl_display
 import debug
 from utils import rpython_utils
 
@@ -32,7 +33,10 @@ def run(file_name,
         fail_on_invalid,
         silent_cycles,
         quit_after,
-        debug_mode):
+        debug_mode,
+        frameskip=0,
+        load_state_file="",
+        save_state_cycle=-1):
     """
     Run the given Mega Drive file.
 
@@ -40,19 +44,23 @@ def run(file_name,
     ----------
     file_name: str
         The Mega Drive cartidge file that should be executed.
+
+    frameskip: int, optional
+        Amount of frames whose pixels are not drawn after each drawn frame.
+        Negative values never draw any pixels. Has no effect without a
+        display, which never draws pixels.
+
+    load_state_file: str, optional
+        File of a state to load before the emulation starts. The cycle counter
+        continues from the state, which also applies to ``quit_after`` and
+        ``save_state_cycle``.
+
+    save_state_cycle: int, optional
+        The cycle at which the state is saved to the file name of the program
+        with the extension ".state". Negative values never save the state.
     """
     # Read the file
-    if os.name == "nt":
-        fp = os.open(file_name, os.O_RDONLY | os.O_BINARY, 0o777)
-    else:
-        fp = os.open(file_name, os.O_RDONLY, 0o777)
-    program = ""
-    while True:
-        read = os.read(fp, 4096)
-        if not read:
-            break
-        program += read
-    os.close(fp)
+    program, mapped_program = _load_program(file_name)
 
     if verbose:
         print("start")
@@ -63,15 +71,31 @@ def run(file_name,
     if no_display:
         display_device = display.FakeDisplay()
     else:
-        display_device = display.RsdlDisplay(scale=scale)
+        display_device = rsdl_display.RsdlDisplay(scale=scale)
+        display_device.set_frameskip(frameskip)
 
-    mem = memory.Memory(program,
-                        display_device,
-                        verbose=is_verbose,
-                        fail_on_invalid=fail_on_invalid)
-    cpu68k = m68k.cpu.Cpu(mem, verbose=is_verbose)
+    # Only the tracing variants check for verbosity, so they are not used
+    # unless tracing has been requested
+    if verbose:
+        mem = memory.TracingMemory(program,
+                                   display_device,
+                                   verbose=is_verbose,
+                                   fail_on_invalid=fail_on_invalid,
+                                   mapped_program=mapped_program)
+        cpu68k = m68k.cpu.TracingCpu(mem, verbose=is_verbose)
+    else:
+        mem = memory.Memory(program,
+                            display_device,
+                            fail_on_invalid=fail_on_invalid,
+                            mapped_program=mapped_program)
+        cpu68k = m68k.cpu.Cpu(mem)
+    # Nobody watches the emulation in real time, so waiting for interrupts
+    # can be skipped
+    cpu68k.set_skip_idle_loops(no_display or no_sync)
     # Set the reference to RAM for Direct Memory Access
     display_device.set_m68k_ram(mem)
+    # DMA stalls the CPU
+    display_device.set_m68k_cpu(cpu68k)
 
     if debug_mode:
         debugger = debug.Debugger(cpu68k, mem, display_device)
@@ -94,19 +118,90 @@ def run(file_name,
     # This counter will contain the cycle of the M68k at which the next line
     # will be drawn.
     cycle_for_next_line = cycles_per_line
+    if load_state_file:
+        cycle_for_next_line = _load_state_file(load_state_file,
+                                               cpu68k,
+                                               mem,
+                                               display_device)
+        if cycle_for_next_line < 0:
+            display_device.stop()
+            return
+    # The CPU runs until the next event
+    verbose_cycle = silent_cycles + 1 if not is_verbose and verbose else -1
+    events = _create_events(cycle_for_next_line,
+                            quit_after,
+                            verbose_cycle,
+                            save_state_cycle)
     # This will contain the earliest time at which the next frame should be
     # drawn.
     start_time = rtime.time()
     next_frame = 0 if no_sync else start_time + seconds_per_frame
 
     draw_count = 0
+    render_count = 0
 
     while not quit_:
         try:
-            stop = cpu68k.step()
+            if debug_mode:
+                # The debugger needs control after each instruction
+                stop = cpu68k.step()
+            else:
+                # Run until the next event
+                stop = cpu68k.run(events.get_next_cycle())
             if mem.get_z80_reset():
                 pass  # Reset the Z80 CPU
             # TODO cpuz80.step()
+            if quit_on_stop and stop:
+                break
+
+            # Handle all events that are due
+            m68k_cycles = cpu68k.get_cycle()
+            while not quit_ and events.get_next_cycle() <= m68k_cycles:
+                event = events.pop()
+                if event == scheduler.EVENT_SAVE_STATE:
+                    _save_state_file(file_name + ".state",
+                                     cpu68k,
+                                     mem,
+                                     display_device,
+                                     cycle_for_next_line)
+                    save_state_cycle = -1
+                elif event == scheduler.EVENT_QUIT:
+                    if verbose:
+                        print("Stopping after %d cycles" % quit_after)
+                    quit_ = True
+                elif event == scheduler.EVENT_VERBOSE:
+                    cpu68k.set_verbose(True)
+                    mem.set_verbose(True)
+                    is_verbose = True
+                    verbose_cycle = -1
+                elif event == scheduler.EVENT_LINE:
+                    # Schedule the next line
+                    cycle_for_next_line += cycles_per_line
+                    events.schedule(int(cycle_for_next_line),
+                                    scheduler.EVENT_LINE)
+                    # Draw the line
+                    # Passing 'next_frame' will delay the drawing of the whole
+                    # screen until the current time has reached 'next_frame'.
+                    # Note that it will have no effect if not all lines have
+                    # been drawn yet.
+                    quit_, vblank, hblank, frame_drawn = \
+                        display_device.draw_line(next_frame)
+
+                    # Cause VBLANK or HBLANK interrupts
+                    if vblank:
+                        cpu68k.cause_interrupt(6)
+                    elif hblank:
+                        cpu68k.cause_interrupt(4)
+
+                    if frame_drawn:
+                        # Set the time for the next frame to be drawn
+                        current_time = rtime.time()
+                        next_frame = next_frame + seconds_per_frame
+                        if current_time >= next_frame and not no_sync:
+                            next_frame = current_time + seconds_per_frame
+                        draw_count += 1
+                        if display_device.is_frame_rendered():
+                            render_count += 1
         except rpython_utils.ExceptionWithMessage as e:
             print(cpu68k.__str__())
             print(display_device.__str__())
@@ -114,55 +209,32 @@ def run(file_name,
             if debug_mode:
                 debugger.post_mortem()
             break
-        if quit_on_stop and stop:
-            break
-
-        m68k_cycles = cpu68k.get_cycle()
-
-        if quit_after >= 0 and m68k_cycles >= quit_after:
-            if verbose:
-                print("Stopping after %d cycles" % quit_after)
-            break
-
-        if not is_verbose and verbose and m68k_cycles > silent_cycles:
-            cpu68k.set_verbose(True)
-            mem.set_verbose(True)
-
-        if m68k_cycles >= int(cycle_for_next_line):
-            # Increment the threshold for the next cylce
-            cycle_for_next_line += cycles_per_line
-            # Draw the line
-            # Passing 'next_frame' will delay the drawing of the whole screen
-            # until the current time has reached 'next_frame'.
-            # Note that it will have no effect if not all lines have been drawn
-            # yet.
-            try:
-                quit_, vblank, hblank, frame_drawn = \
-                    display_device.draw_line(next_frame)
-            except rpython_utils.ExceptionWithMessage as e:
-                print(cpu68k.__str__())
-                print(display_device.__str__())
-                print("A %s occured: %s" % (str(type(e)), e._message))
-                if debug_mode:
-                    debugger.post_mortem()
-                break
-
-            # Cause VBLANK or HBLANK interrupts
-            if vblank:
-                cpu68k.cause_interrupt(6)
-            elif hblank:
-                cpu68k.cause_interrupt(4)
-
-            if frame_drawn:
-                # Set the time for the next frame to be drawn
-                current_time = rtime.time()
-                next_frame = next_frame + seconds_per_frame
-                if current_time >= next_frame and not no_sync:
-                    next_frame = current_time + seconds_per_frame
-                draw_count += 1
 
         if debug_mode:
             debugger.step()
+            # Only the main loop knows the timing of the lines, so it saves and
+            # loads states for the debugger
+            state_file, is_save = debugger.pop_state_request()
+            while state_file:
+                if is_save:
+                    _save_state_file(state_file,
+                                     cpu68k,
+                                     mem,
+                                     display_device,
+                                     cycle_for_next_line)
+                else:
+                    loaded_cycle = _load_state_file(state_file,
+                                                    cpu68k,
+                                                    mem,
+                                                    display_device)
+                    if loaded_cycle >= 0:
+                        cycle_for_next_line = loaded_cycle
+                        events = _create_events(cycle_for_next_line,
+                                                quit_after,
+                                                verbose_cycle,
+                                                save_state_cycle)
+                debugger.step()
+                state_file, is_save = debugger.pop_state_request()
 
     total_time = rtime.time() - start_time
 
@@ -171,7 +243,10 @@ def run(file_name,
         print(display_device.__str__())
         print("Time taken %fs" % total_time)
         print("%f Hz" % (float(cpu68k.get_cycle()) / total_time))
+        print("skipped idle cycles %d" % cpu68k.get_skipped_cycles())
         print("draw calls %d" % draw_count)
+        print("rendered frames %d" % render_count)
+        print("DMA bytes %d" % display_device.get_dma_bytes())
         print("%f average frames per second" % (draw_count/total_time))
 
     if dump_m68k_ram:
@@ -196,3 +271,107 @@ def run(file_name,
         print("")
 
     display_device.stop()
+
+
+def _create_events(cycle_for_next_line,
+                   quit_after,
+                   verbose_cycle,
+                   save_state_cycle):
+    """
+    Create the scheduler for the main loop.
+
+    Negative cycles for the optional events do not schedule them.
+    """
+    events = scheduler.Scheduler()
+    events.schedule(int(cycle_for_next_line), scheduler.EVENT_LINE)
+    if quit_after >= 0:
+        events.schedule(quit_after, scheduler.EVENT_QUIT)
+    if verbose_cycle >= 0:
+        events.schedule(verbose_cycle, scheduler.EVENT_VERBOSE)
+    if save_state_cycle >= 0:
+        events.schedule(save_state_cycle, scheduler.EVENT_SAVE_STATE)
+    return events
+
+
+def _save_state_file(file_name,
+                     cpu68k,
+                     mem,
+                     display_device,
+                     cycle_for_next_line):
+    """Save the state of the console to the given file."""
+    data = state.save_state(cpu68k, mem, display_device, cycle_for_next_line)
+    try:
+        state.write_file(file_name, data)
+    except OSError:
+        print("Could not write the state to %s" % file_name)
+        return
+    print("Saved the state at cycle %d to %s"
+          % (cpu68k.get_cycle(), file_name))
+
+
+def _load_state_file(file_name, cpu68k, mem, display_device):
+    """
+    Load the state of the console from the given file.
+
+    Returns the cycle at which the next line is drawn, or a negative value if
+    the state could not be loaded.
+    """
+    try:
+        data = state.read_file(file_name)
+    except OSError:
+        print("Could not read the state from %s" % file_name)
+        return -1.0
+    try:
+        cycle_for_next_line = state.load_state(data,
+                                               cpu68k,
+                                               mem,
+                                               display_device)
+    except state.StateError as e:
+        print("Could not load the state from %s: %s"
+              % (file_name, e._message))
+        return -1.0
+    print("Loaded the state at cycle %d from %s"
+          % (cpu68k.get_cycle(), file_name))
+    return cycle_for_next_line
+
+
+def _load_program(file_name):
+    """
+    Load the Mega Drive cartridge file.
+
+    When translated, the file is mapped into memory, so that it is neither
+    read nor copied. Untranslated, reading from a mapping is a lot slower than
+    reading from a string, so the whole file is read instead.
+
+    Parameters
+    ----------
+    file_name: str
+        The Mega Drive cartidge file to load.
+
+    Returns
+    -------
+    program: str | None
+        The content of the file if it was read.
+
+    mapped_program: rpython.rlib.rmmap.MMap | None
+        The read-only mapping of the file if it was mapped.
+    """
+    if os.name == "nt":
+        fp = os.open(file_name, os.O_RDONLY | os.O_BINARY, 0o777)
+    else:
+        fp = os.open(file_name, os.O_RDONLY, 0o777)
+    try:
+        size = os.fstat(fp).st_size
+        if we_are_translated() and size > 0:
+            # Empty files can not be mapped
+            mapped_program = rmmap.mmap(fp, size, access=rmmap.ACCESS_READ)
+            return None, mapped_program
+        chunks = []
+        while True:
+            read = os.read(fp, 64 * 1024)
+            if not read:
+                break
+            chunks.append(read)
+        return "".join(chunks), None
+    finally:
+        os.close(fp)
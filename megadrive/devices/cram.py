@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Contains the VDP's color RAM (CRAM) together with its converted palette.
+
+CRAM holds 64 colors of one word each. Drawing needs them in RGBA8888
+format, so every color is converted once when it is written instead of
+every time a pixel uses it.
+
+Created on Sun Oct 18 19:41:12 2026
+
+@author: Simon Romanowski
+"""
+
+from megadrive.devices import ram
+from utils import int_utils
+
+
+# Amount of colors in CRAM
+COLOR_COUNT = 64
+
+# Map the 3-bit color to an 8-bit color
+_COLOR_TO_BYTE = [
+    0x00,  # 0b000
+    0x34,  # 0b001
+    0x57,  # 0b010
+    0x74,  # 0b011
+    0x90,  # 0b100
+    0xAC,  # 0b101
+    0xCE,  # 0b110
+    0xFF,  # 0b111
+]
+
+
+def to_rgba(md_color, brightness=0):
+    """
+    Convert from Mega Drive color format to RGBA8888.
+
+    Parameters
+    ----------
+    md_color: int
+        The color word as stored in CRAM.
+
+    brightness: int, optional
+        0 (default) for the normal color, -1 for its shadowed and 1 for its
+        highlighted variant. Shadow halves the intensity of each component,
+        highlight adds half of the full intensity to that.
+    """
+    # Format:
+    # | 15|                        ...                            | 0 |
+    # | - | - | - | - | b | b | b | - | g | g | g | - | r | r | r | - |
+    result = 0xFF
+    for shift, first_bit in [(24, 1), (16, 5), (8, 9)]:
+        component = _COLOR_TO_BYTE[
+            int_utils.select_bits(md_color, first_bit, first_bit + 2)]
+        if brightness < 0:
+            component >>= 1
+        elif brightness > 0:
+            component = 0x80 + (component >> 1)
+        result |= component << shift
+    return result
+
+
+class Cram(ram.ByteRam):
+    """
+    Byte RAM for the 64 colors that keeps them converted to RGBA8888.
+
+    The normal, shadowed and highlighted variant of each color are updated
+    whenever the color is written.
+    """
+
+    _immutable_fields_ = ["_colors", "_shadow_colors", "_highlight_colors"]
+
+    def __init__(self):
+        ram.ByteRam.__init__(self, COLOR_COUNT * 2)  # One word per color
+        self._colors = [0] * COLOR_COUNT
+        self._shadow_colors = [0] * COLOR_COUNT
+        self._highlight_colors = [0] * COLOR_COUNT
+        for color_index in range(COLOR_COUNT):
+            self._update(color_index)
+
+    def get_colors(self):
+        """Get the list of all colors in RGBA8888 format."""
+        return self._colors
+
+    def get_shadow_colors(self):
+        """Get the list of all shadowed colors in RGBA8888 format."""
+        return self._shadow_colors
+
+    def get_highlight_colors(self):
+        """Get the list of all highlighted colors in RGBA8888 format."""
+        return self._highlight_colors
+
+    def _update(self, color_index):
+        md_color = ram.ByteRam.read(self, color_index << 1)
+        self._colors[color_index] = to_rgba(md_color)
+        self._shadow_colors[color_index] = to_rgba(md_color, -1)
+        self._highlight_colors[color_index] = to_rgba(md_color, 1)
+
+    def _update_range(self, start, end):
+        """Update the colors from byte address ``start`` to ``end``."""
+        start = max(start, 0)
+        end = min(end, self._size - 1)
+        for color_index in range(start >> 1, (end >> 1) + 1):
+            self._update(color_index)
+
+    def write_byte(self, address, value):
+        ram.ByteRam.write_byte(self, address, value)
+        self._update_range(address, address)
+
+    def write(self, address, value):
+        ram.ByteRam.write(self, address, value)
+        self._update_range(address, address + 1)
+
+    def write_long(self, address, value):
+        ram.ByteRam.write_long(self, address, value)
+        self._update_range(address, address + 3)
+
+    def fill_bytes(self, start, amount, value):
+        ram.ByteRam.fill_bytes(self, start, amount, value)
+        self._update_range(start, start + amount - 1)
+
+    def copy_from(self, address, source, source_address, amount):
+        ram.ByteRam.copy_from(self, address, source, source_address, amount)
+        self._update_range(address, address + amount - 1)
+
+    def load_state(self, reader):
+        ram.ByteRam.load_state(self, reader)
+        self._update_range(0, self._size - 1)
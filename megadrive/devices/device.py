@@ -30,6 +30,53 @@ class Device(object):
             % (int_utils.to_32x_string(address),
                int_utils.to_32x_string(value)))
 
+    def read_byte(self, address):
+        """
+        Read the byte at the given address.
+
+        By default, this is the upper byte of the word at the address.
+        """
+        return (self.read(address) >> 8) & 0xFF
+
+    def write_byte(self, address, value):
+        """
+        Write the byte at the given address.
+
+        By default, the word at the address is read and written back with
+        the new upper byte.
+        """
+        self.write(address,
+                   (self.read(address) & 0xFF) | ((value & 0xFF) << 8))
+
+    def read_long(self, address):
+        """
+        Read the long word at the given address.
+
+        By default, the words at the address and the address + 2 are
+        combined.
+        """
+        return (self.read(address) << 16) | self.read(address + 2)
+
+    def write_long(self, address, value):
+        """
+        Write the long word at the given address.
+
+        By default, the upper word is written to the address and the lower
+        word to the address + 2.
+        """
+        self.write(address, (value >> 16) & 0xFFFF)
+        self.write(address + 2, value & 0xFFFF)
+
+    def read_bytes_into(self, address, data, data_address, amount):
+        """
+        Copy ``amount`` bytes from the given address on into the bytearray
+        ``data``, starting at ``data_address``.
+
+        By default, the bytes are read one at a time.
+        """
+        for offset in range(amount):
+            data[data_address + offset] = self.read_byte(address + offset)
+
 
 class NullDevice(Device):
     """Device that ignores all read- and write operations."""
@@ -41,3 +88,19 @@ class NullDevice(Device):
     def write(self, address, value):
         """Does nothing."""
         pass
+
+    def read_byte(self, address):
+        """Always returns 0."""
+        return 0
+
+    def write_byte(self, address, value):
+        """Does nothing."""
+        pass
+
+    def read_long(self, address):
+        """Always returns 0."""
+        return 0
+
+    def write_long(self, address, value):
+        """Does nothing."""
+        pass
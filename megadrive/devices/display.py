@@ -7,44 +7,21 @@ Created on Fri Sep 29 22:28:27 2023
 @author: Simon Romanowski
 """
 
-from rsdl import RSDL, RSDL_helper
-from rpython.rtyper.lltypesystem import rffi, lltype
-import rpython.rlib.rtime as time
-
-from megadrive.devices import device, ram
+from megadrive.devices import cram, device, pixel_buffer, ram, rom, vram
 from utils import int_utils
 from utils import rpython_utils
 
 
-# Map the 3-bit color to an 8-bit color
-_COLOR_TO_BYTE = [
-    0x00,  # 0b000
-    0x34,  # 0b001
-    0x57,  # 0b010
-    0x74,  # 0b011
-    0x90,  # 0b100
-    0xAC,  # 0b101
-    0xCE,  # 0b110
-    0xFF,  # 0b111
-]
-
 _SPRITE_PLANE_SIZE = (512, 512)
 _SPRITE_PLANE_START = (128, 128)
 
 
-# --- Types for rffi ---
-
-UINTP = lltype.Ptr(lltype.Array(rffi.UINT, hints={'nolength': True}))
-# These are 'FixedSizeArray' since when translating with RPython, 'Ptr'
-# variables cannot be allocated with 'lltype.malloc'.
-UINTPP = lltype.FixedSizeArray(rffi.UINTP, 1, hints={'nolength': True})
-INTP = lltype.FixedSizeArray(rffi.INT, 1, hints={'nolength': True})
-
-
-# --- Constants for RSDL ---
+# 68k cycles per line
+_CYCLES_PER_LINE = 488
 
-_NULL_RECT = lltype.nullptr(RSDL.Rect)
-_SDL_TRANSPARENT = rffi.r_uint(0)
+# Bytes a DMA from the 68k transfers per line during blanking, depending on
+# the 320 pixel mode
+_DMA_BYTES_PER_LINE = [167, 205]
 
 
 class Display(device.Device):
@@ -83,18 +60,28 @@ class Display(device.Device):
         self._scale = scale
         if self._scale < 1:
             raise rpython_utils.RValueError("Negative scale")
-        # Lists of colors
-        self._pixels_bg = None
-        self._pixels_plane_bg = None
-        self._pixels_plane_bg_prio = None
-        self._pixels_plane_fg = None
-        self._pixels_plane_fg_prio = None
-        self._pixels_plane_sp = None
-        self._pixels_plane_sp_prio = None
-        # List of pixels in order of descending priority
-        self._priority = None
+        # Colors of the finished frame
+        self._frame = None
+        # Colors of each layer for the line that is drawn
+        self._line_plane_bg = None
+        self._line_plane_bg_prio = None
+        self._line_plane_fg = None
+        self._line_plane_fg_prio = None
+        self._line_plane_sp = None
+        self._line_plane_sp_prio = None
+        # Color of the background for the line that is drawn
+        self._line_bg = 0
         # Limit for pixel list indices
         self._pixel_address_limit = self.width * self.height
+        # Amount of frames to skip after each drawn frame, negative to never
+        # draw any
+        self._frameskip = 0
+        # Frames skipped since the last drawn frame
+        self._skipped_frames = 0
+        # Whether the pixels of the current frame are drawn
+        self._render_frame = True
+        # Whether the pixels of the last finished frame were drawn
+        self._frame_rendered = False
 
         # --- Memory Devices ---
 
@@ -102,10 +89,14 @@ class Display(device.Device):
         # Colors with index 62 and 63 are invisible in shadow/highlight mode
         # 62: Highlight all pixels at the same location underneath this
         # 63: Shadow all pixels at the same location underneath this
-        self._cram = ram.Ram(64*2)  # One word per color
+        self._cram = cram.Cram()
+        # Colors of CRAM in RGBA8888 format
+        self._palette = self._cram.get_colors()
 
         # Video RAM (VRAM), 64KB
-        self._vram = ram.Ram(64 * 1024)
+        self._vram = vram.Vram(64 * 1024)
+        # Decoded pixels of the tiles in VRAM
+        self._tile_colors = self._vram.get_tile_colors()
 
         # Vertical scrolling RAM (VSRAM), 80B
         self._vsram = ram.Ram(80)
@@ -118,6 +109,14 @@ class Display(device.Device):
         # Needs to be set later, because it also needs a reference to this.
         self._m68k_ram = None
 
+        # Reference to the M68k, which is stalled by DMA
+        self._m68k_cpu = None
+
+        # Bytes written by DMA in total, in the current and in the last frame
+        self._dma_bytes = 0
+        self._dma_frame_bytes = 0
+        self._dma_last_frame_bytes = 0
+
         # --- Registers ---
 
         # --- Register 0, Mode Register 1 ---
@@ -157,6 +156,22 @@ class Display(device.Device):
         # --- Register 5, Sprite Table Location ---
         self._table_sprite = 0
 
+        # --- Parsed sprite table ---
+        # The sprites in the order of the linked list, up to the limit
+        self._sprite_x = [0] * 20
+        self._sprite_y = [0] * 20
+        self._sprite_width = [0] * 20
+        self._sprite_height = [0] * 20
+        self._sprite_prio = [False] * 20
+        self._sprite_color_offset = [0] * 20
+        self._sprite_vflip = [False] * 20
+        self._sprite_hflip = [False] * 20
+        self._sprite_address = [0] * 20
+        # Indices of the sprites that intersect with each line
+        self._sprite_lines = [[] for _ in range(self.height)]
+        # Whether the lists above match the sprite table
+        self._sprites_valid = False
+
         # --- Register 7, Background Color ---
         # Address for CRAM
         self._bg_color_ind = 0
@@ -230,26 +245,20 @@ class Display(device.Device):
         self._create_pixels()
 
     def _create_pixels(self):
-        # This should always be called when the width/height changes
-        self._pixels_bg = self._new_pixel_list()
-        self._pixels_plane_bg = self._new_pixel_list()
-        self._pixels_plane_bg_prio = self._new_pixel_list()
-        self._pixels_plane_fg = self._new_pixel_list()
-        self._pixels_plane_fg_prio = self._new_pixel_list()
-        self._pixels_plane_sp = self._new_pixel_list()
-        self._pixels_plane_sp_prio = self._new_pixel_list()
-        self._priority = [
-            self._pixels_plane_sp_prio,
-            self._pixels_plane_fg_prio,
-            self._pixels_plane_bg_prio,
-            self._pixels_plane_sp,
-            self._pixels_plane_fg,
-            self._pixels_plane_bg,
-        ]
+        # The buffers fit the largest resolution, so they are kept when the
+        # resolution changes
+        self._frame = pixel_buffer.PixelBuffer(
+            pixel_buffer.MAX_WIDTH * pixel_buffer.MAX_HEIGHT)
+        self._line_plane_bg = self._new_line_buffer()
+        self._line_plane_bg_prio = self._new_line_buffer()
+        self._line_plane_fg = self._new_line_buffer()
+        self._line_plane_fg_prio = self._new_line_buffer()
+        self._line_plane_sp = self._new_line_buffer()
+        self._line_plane_sp_prio = self._new_line_buffer()
         self._pixel_address_limit = self.width * self.height
 
-    def _new_pixel_list(self):
-        return [0 for _ in range(self.width * self.height)]
+    def _new_line_buffer(self):
+        return pixel_buffer.PixelBuffer(pixel_buffer.MAX_WIDTH)
 
     def _inc_vcounter(self):
         self._vcounter = (self._vcounter + 1) % self.height
@@ -259,12 +268,18 @@ class Display(device.Device):
         # Draw the line
         # We draw line by line, since the palette and vertical scroll may
         # change during HBLANK (in-between lines)
-        self._draw_line_pixels()
+        # Skipped frames only advance the counters
+        if self._render_frame:
+            self._draw_line_pixels()
 
         self._inc_vcounter()
 
         # Check for VBLANK
         vblank = self._vcounter == 0
+        if vblank:
+            self._dma_last_frame_bytes = self._dma_frame_bytes
+            self._dma_frame_bytes = 0
+            self._next_frame()
 
         hblank = self._check_hblank()
 
@@ -275,118 +290,192 @@ class Display(device.Device):
             vblank,
         )
 
+    def _next_frame(self):
+        """Decide whether the pixels of the frame that starts are drawn."""
+        self._frame_rendered = self._render_frame
+        if 0 <= self._frameskip <= self._skipped_frames:
+            self._render_frame = True
+            self._skipped_frames = 0
+        else:
+            self._render_frame = False
+            self._skipped_frames += 1
+
+    def set_frameskip(self, frameskip):
+        """
+        Set the amount of frames to skip after each drawn frame.
+
+        Skipped frames advance the counters and cause interrupts like drawn
+        frames, but none of their pixels are drawn. The setting applies to
+        the current frame if none of its lines has been drawn yet.
+
+        Parameters
+        ----------
+        frameskip: int
+            ``0`` draws every frame, ``n`` draws one frame out of ``n + 1``.
+            A negative value never draws any frame.
+        """
+        self._frameskip = frameskip
+        if self._vcounter == 0:
+            self._render_frame = frameskip >= 0
+            self._skipped_frames = 0
+        else:
+            # Draw the next frame
+            self._skipped_frames = frameskip
+
+    def is_frame_rendered(self):
+        """Whether the pixels of the last finished frame have been drawn."""
+        return self._frame_rendered
+
     def _draw_line_pixels(self):
-        # Store the pixels for the current line in the corresponding list
-        # in RGBA8888 format.
+        # Store the pixels of each layer for the current line in the
+        # corresponding list in RGBA8888 format.
         y_pos = self._vcounter
         fg_h_offset, bg_h_offset = self._get_hscroll()
-        # Start address for the row of pixels
-        pixel_row_address = self.width * y_pos
 
-        # The order in which we draw the pixels does not matter, since we
+        # The order in which we draw the layers does not matter, since we
         # consider the priority of each plane later
 
         # Draw foreground plane
         self._draw_line_plane(y_pos,
                               fg_h_offset,
-                              pixel_row_address,
-                              self._pixels_plane_fg,
-                              self._pixels_plane_fg_prio,
+                              self._line_plane_fg,
+                              self._line_plane_fg_prio,
                               0,
                               self._table_plane_fg,
                               True)
         # Draw background plane
         self._draw_line_plane(y_pos,
                               bg_h_offset,
-                              pixel_row_address,
-                              self._pixels_plane_bg,
-                              self._pixels_plane_bg_prio,
+                              self._line_plane_bg,
+                              self._line_plane_bg_prio,
                               1,
                               self._table_plane_bg,
                               False)
         # Draw sprites
-        self._draw_line_sprite(pixel_row_address, y_pos)
+        self._draw_line_sprite(y_pos)
         # Draw the background color
-        self._draw_line_background(pixel_row_address)
-
-    def _to_rgba(self, md_color):
-        """Convert from Mega Drive color format to RGBA8888."""
-        # Format:
-        # | 15|                        ...                            | 0 |
-        # | - | - | - | - | b | b | b | - | g | g | g | - | r | r | r | - |
-        red = _COLOR_TO_BYTE[int_utils.select_bits(md_color, 1, 3)]
-        green = _COLOR_TO_BYTE[int_utils.select_bits(md_color, 5, 7)]
-        blue = _COLOR_TO_BYTE[int_utils.select_bits(md_color, 9, 11)]
-        return (red << 24) | (green << 16) | (blue << 8) | 0xFF
-
-    def _draw_line_sprite(self, pixel_row_address, y_pos):
-        # TODO write directly to the pixel lists
-        # Store the colors for each pixel in this list
-        row_colors = [0 for _ in range(self.width)]
-        row_colors_prio = [0 for _ in range(self.width)]
-
-        # Iterate over all sprites
-        next_index = self._insert_sprite_data(self._table_sprite,
-                                              y_pos,
-                                              row_colors,
-                                              row_colors_prio)
-        # The amount of sprites that have been drawn yet
-        sprite_amount = 1
-        sprite_max = 20 if self._is_320_mode else 16
-        while next_index != 0 and sprite_amount < sprite_max:
-            next_index = self._insert_sprite_data(self._table_sprite
-                                                  + next_index,
-                                                  y_pos,
-                                                  row_colors,
-                                                  row_colors_prio)
-            sprite_amount += 1
+        self._draw_line_background()
+
+        self._compose_line(self.width * y_pos)
+
+    def _compose_line(self, pixel_row_address):
+        """
+        Write the topmost opaque color of each pixel of the current line to
+        the frame.
 
-        # Insert the generated colors
+        Returns whether any pixel of the line changed.
+        """
+        frame = self._frame
+        changed = False
         for x_pos in range(self.width):
+            color = self._line_color(x_pos)
             pixel_address = pixel_row_address + x_pos
-            color_address = row_colors[x_pos]
-            color_prio_address = row_colors_prio[x_pos]
-            color = \
-                0 if color_address == 0 \
-                else self._to_rgba(self._cram.read(color_address << 1))
-            color_prio = \
-                0 if color_prio_address == 0 \
-                else self._to_rgba(self._cram.read(color_prio_address << 1))
-            self._pixels_plane_sp[pixel_address] = color
-            self._pixels_plane_sp_prio[pixel_address] = color_prio
-
-    def _insert_sprite_data(self,
-                            entry_address,
-                            y_pos,
-                            row_colors,
-                            row_colors_prio):
-        (sprite_x_pos,
-         sprite_y_pos,
-         sprite_width,
-         sprite_height,
-         next_index,
-         is_prio,
-         color_offset,
-         vflip,
-         hflip,
-         sprite_address) = self._parse_sprite_table(entry_address)
-        # Check, if the sprite is visible at all
+            if frame[pixel_address] != color:
+                frame[pixel_address] = color
+                changed = True
+        return changed
+
+    @rpython_utils.always_inline
+    def _line_color(self, x_pos):
+        """Get the topmost opaque color of a pixel of the current line."""
+        # Layers in order of descending priority
+        color = self._line_plane_sp_prio[x_pos]
+        if color == 0:
+            color = self._line_plane_fg_prio[x_pos]
+        if color == 0:
+            color = self._line_plane_bg_prio[x_pos]
+        if color == 0:
+            color = self._line_plane_sp[x_pos]
+        if color == 0:
+            color = self._line_plane_fg[x_pos]
+        if color == 0:
+            color = self._line_plane_bg[x_pos]
+        if color == 0:
+            color = self._line_bg
+        return color
+
+    def _draw_line_sprite(self, y_pos):
+        if not self._sprites_valid or self._vram.is_watched_written():
+            self._parse_sprites()
+
+        self._line_plane_sp.fill(0, self.width, 0)
+        self._line_plane_sp_prio.fill(0, self.width, 0)
+
+        # Only visit the sprites on this line, in the order of the list
+        for sprite_index in self._sprite_lines[y_pos]:
+            self._insert_sprite_data(sprite_index, y_pos)
+
+    def _parse_sprites(self):
+        """
+        Parse the sprites from the sprite table.
+
+        The sprites are stored in the order of the linked list and every line
+        of the screen gets the indices of the sprites that intersect with it.
+        """
+        table = self._table_sprite
+        # The sprite table is parsed again once it changes
+        # Each entry is 8 bytes, the link has 7 bits
+        self._vram.watch(table, table + (0x80 << 3) - 1)
+        self._sprites_valid = True
+        for line in self._sprite_lines:
+            del line[:]
+
+        # The amount of sprites that are drawn
+        sprite_max = 20 if self._is_320_mode else 16
+        next_index = 0
+        sprite_amount = 0
+        while sprite_amount < sprite_max:
+            (x_pos,
+             y_pos,
+             sprite_width,
+             sprite_height,
+             next_index,
+             is_prio,
+             color_offset,
+             vflip,
+             hflip,
+             sprite_address) = self._parse_sprite_table(table + next_index)
+            self._sprite_x[sprite_amount] = x_pos
+            self._sprite_y[sprite_amount] = y_pos
+            self._sprite_width[sprite_amount] = sprite_width
+            self._sprite_height[sprite_amount] = sprite_height
+            self._sprite_prio[sprite_amount] = is_prio
+            self._sprite_color_offset[sprite_amount] = color_offset
+            self._sprite_vflip[sprite_amount] = vflip
+            self._sprite_hflip[sprite_amount] = hflip
+            self._sprite_address[sprite_amount] = sprite_address
+
+            # The first visible line is 128
+            first_line = max(y_pos - 128, 0)
+            end_line = min(y_pos - 128 + sprite_height, self.height)
+            for line in range(first_line, end_line):
+                self._sprite_lines[line].append(sprite_amount)
+
+            sprite_amount += 1
+            if next_index == 0:
+                break
+
+    def _insert_sprite_data(self, sprite_index, y_pos):
+        sprite_x_pos = self._sprite_x[sprite_index]
+        sprite_width = self._sprite_width[sprite_index]
+        sprite_height = self._sprite_height[sprite_index]
+        is_prio = self._sprite_prio[sprite_index]
+        color_offset = self._sprite_color_offset[sprite_index]
+        vflip = self._sprite_vflip[sprite_index]
+        hflip = self._sprite_hflip[sprite_index]
+        sprite_address = self._sprite_address[sprite_index]
         # The first visible row is 128
         min_x = 128
         # The last visible row is 128 + self.width - 1
         max_x = min_x + self.width
 
-        # Check, if the sprite intersects with the current line at all
-        # The first visible row is 128
-        plane_y_pos = y_pos + 128
-        # Check below the current line
-        if sprite_y_pos > plane_y_pos:
-            return next_index
-        # Check above the current line
-        if (sprite_y_pos + sprite_height) <= plane_y_pos:
-            return next_index
+        # The sprite intersects with the current line
+        # The first visible line is 128
+        pixel_y_pos = y_pos + 128 - self._sprite_y[sprite_index]
 
-        pixel_y_pos = plane_y_pos - sprite_y_pos
+        sp = self._line_plane_sp
+        sp_prio = self._line_plane_sp_prio
+        palette = self._palette
 
         # Iterate over the sprites pixels that are on this line
         sprite_start = sprite_x_pos - min_x
@@ -396,9 +485,9 @@ class Display(device.Device):
             x_pos = sprite_start + pixel_x_pos
             # Check if there already is some opaque color
             # Sprites appearing later in the list have lower priority
-            if row_colors_prio[x_pos] != 0:
+            if sp_prio[x_pos] != 0:
                 continue
-            if not is_prio and (row_colors[x_pos] != 0):
+            if not is_prio and (sp[x_pos] != 0):
                 continue
 
             color_index = self._get_sprite_pixel(sprite_address,
@@ -413,177 +502,189 @@ class Display(device.Device):
             if color_index == 0:
                 continue
 
-            color_address = color_offset + color_index
+            color = palette[color_offset + color_index]
 
             if is_prio:
-                row_colors_prio[x_pos] = color_address
+                sp_prio[x_pos] = color
             else:
-                row_colors[x_pos] = color_address
-
-        return next_index
+                sp[x_pos] = color
 
-    def _draw_line_background(self, pixel_row_address):
+    def _draw_line_background(self):
         # Color of the background (not the background plane)
-        background_color = self._to_rgba(
-            self._cram.read(self._bg_color_ind))
-        # Address for the pixel to set in the texture
-        for pixel_address in range(pixel_row_address,
-                                     pixel_row_address + self.width):
-            self._pixels_bg[pixel_address] = background_color
+        self._line_bg = self._palette[self._bg_color_ind >> 1]
 
     def _draw_line_plane(self,
                          y_pos,
                          h_offset,
-                         pixel_row_address,
                          pixels,
                          prio_pixels,
                          plane_index,
                          table_base,
                          use_window):
-        # Current x coordinate of the plane
-        # Never leave the current plane size with the indices
-        plane_x_pos = h_offset % self._plane_width
-
-        # Remember the last offset to avoid parsing nametable entries multiple
-        # times
-        last_table_entry_offset = -1
+        # Columns of the line that show the window instead of the plane
+        window_start = 0
+        window_end = 0
+        if use_window:
+            if ((self._window_draw_down and y_pos >= self._window_pos_ver)
+                    or (not self._window_draw_down
+                        and y_pos < self._window_pos_ver)):
+                # Vertical position, the whole line
+                window_end = self.width
+            elif self._window_draw_right:
+                # Horizontal position, right of it
+                window_start = min(self._window_pos_hor, self.width)
+                window_end = self.width
+            else:
+                # Horizontal position, left of it
+                window_end = min(self._window_pos_hor, self.width)
 
-        # Needed for RPython:
-        is_prio = 0
-        color_offset = 0
-        vflip = 0
-        hflip = 0
-        tile_address = 0
+        self._draw_plane_span(y_pos, h_offset, 0, window_start,
+                              pixels, prio_pixels, plane_index, table_base)
+        self._draw_window_span(y_pos, window_start, window_end,
+                               pixels, prio_pixels)
+        self._draw_plane_span(y_pos, h_offset, window_end, self.width,
+                              pixels, prio_pixels, plane_index, table_base)
 
+    def _draw_plane_span(self,
+                         y_pos,
+                         h_offset,
+                         x_start,
+                         x_end,
+                         pixels,
+                         prio_pixels,
+                         plane_index,
+                         table_base):
+        """Draw the columns from ``x_start`` to ``x_end`` of a plane."""
+        # 2 bytes per entry, 'plane_width/8' entries per row
+        # One row is for 8 pixels.
+        table_row_length = (self._plane_width >> 3) << 1
         # 'x_pos' is the column of the pixel on the texture that we draw next,
         # wheras 'plane_x_pos' is the column of the pixel on the plane we are
         # drawing. These are not the same due to scrolling.
-        for x_pos in range(self.width):
+        # Never leave the current plane size with the indices
+        x_pos = x_start
+        plane_x_pos = (h_offset + x_start) % self._plane_width
+        while x_pos < x_end:
+            # Draw up to the end of the tile, vertical scrolling is the same
+            # for all of its pixels
+            first_pixel = plane_x_pos & 0b111
+            amount = min(8 - first_pixel, x_end - x_pos)
             v_offset = self._get_vscroll(plane_x_pos, plane_index)
             plane_y_pos = (y_pos + v_offset) % self._plane_height
-            # 2 bytes per entry, 'plane_width/8' entries per row
-            # One row is for 8 pixels.
-            table_row_offset = \
-                ((self._plane_width >> 3) << 1) * (plane_y_pos >> 3)
-            # Y position of the current pixel inside the tile
-            tile_row = plane_y_pos & 0b111
-            # Start address of the tile nametable entries
-            table_start = table_base + table_row_offset
-
-            # Offset into the nametable for the current column
             # Each entry points to a 8x8 tile, thus we divide by 8
             # Each entry is 2 bytes wide, thus we multiply by 2 afterwards
-            table_entry_offset = (plane_x_pos >> 3) << 1
-
-            # Try to use the last table entry
-            if last_table_entry_offset != table_entry_offset:
-                last_table_entry_offset = table_entry_offset
-
-                (is_prio,
-                 color_offset,
-                 vflip,
-                 hflip,
-                 tile_address) = self._load_nametable_entry(
-                    table_start + table_entry_offset)
+            entry_address = \
+                table_base \
+                + table_row_length * (plane_y_pos >> 3) \
+                + ((plane_x_pos >> 3) << 1)
+            self._draw_tile_row(entry_address,
+                                plane_y_pos & 0b111,
+                                first_pixel,
+                                x_pos,
+                                amount,
+                                pixels,
+                                prio_pixels)
+            x_pos += amount
+            plane_x_pos = (plane_x_pos + amount) % self._plane_width
+
+    def _draw_window_span(self, y_pos, x_start, x_end, pixels, prio_pixels):
+        """Draw the columns from ``x_start`` to ``x_end`` of the window."""
+        # The window is not scrolled
+        table_start = \
+            self._table_plane_wn + (((self._plane_width >> 3) * (y_pos >> 3))
+                                    << 1)
+        x_pos = x_start
+        while x_pos < x_end:
+            first_pixel = x_pos & 0b111
+            amount = min(8 - first_pixel, x_end - x_pos)
+            self._draw_tile_row(table_start + ((x_pos >> 3) << 1),
+                                y_pos & 0b111,
+                                first_pixel,
+                                x_pos,
+                                amount,
+                                pixels,
+                                prio_pixels)
+            x_pos += amount
+
+    def _draw_tile_row(self,
+                       entry_address,
+                       tile_row,
+                       first_pixel,
+                       x_start,
+                       amount,
+                       pixels,
+                       prio_pixels):
+        """
+        Draw ``amount`` pixels of one row of the tile of a nametable entry.
 
-            # X position of the current pixel inside the tile
-            pixel_x_pos = plane_x_pos & 0b111
+        The first pixel is the one in column ``first_pixel`` of the tile row,
+        which is drawn at column ``x_start`` of the line.
+        """
+        (is_prio,
+         color_offset,
+         vflip,
+         hflip,
+         tile_address) = self._load_nametable_entry(entry_address)
 
+        # Consider vertical flip
+        if vflip:
+            tile_row = 7 - tile_row
+        row_offset = \
+            self._vram.get_tile(tile_address >> vram.TILE_SHIFT) \
+            + (tile_row << 3)
+        tile_colors = self._tile_colors
+        palette = self._palette
+
+        for index in range(amount):
+            pixel_x_pos = first_pixel + index
             # Consider horizontal flip
             if hflip:
                 pixel_x_pos = 7 - pixel_x_pos
+            color_index = tile_colors[row_offset + pixel_x_pos]
 
-            # Consider vertical flip
-            pixel_y_pos = (7 - tile_row) if vflip else tile_row
-
-            # TODO do this cleaner
-            # Check for window
-            if use_window:
-                is_window = (
-                    # Vertical position
-                    ((self._window_draw_down
-                      and y_pos >= self._window_pos_ver)
-                     or
-                     (not self._window_draw_down
-                      and y_pos < self._window_pos_ver))
-                    or
-                    # Horizontal position
-                    ((self._window_draw_right
-                      and x_pos >= self._window_pos_hor)
-                     or
-                     (not self._window_draw_right
-                      and x_pos < self._window_pos_hor))
-                )
-                if is_window:
-                    window_offset = \
-                        (((self._plane_width >> 3) * (y_pos >> 3)) << 1) \
-                        + ((x_pos >> 3) << 1)
-                    (is_prio,
-                     color_offset,
-                     vflip,
-                     hflip,
-                     tile_address) = self._load_nametable_entry(
-                        self._table_plane_wn + window_offset)
-
-                    # X position of the current pixel inside the tile
-                    pixel_x_pos = x_pos & 0b111
-
-                    # Consider horizontal flip
-                    if hflip:
-                        pixel_x_pos = 7 - pixel_x_pos
-
-                    # Y position of the current pixel inside the tile
-                    pixel_y_pos = y_pos & 0b111
-
-                    # Consider vertical flip
-                    if vflip:
-                        pixel_y_pos = 7 - pixel_x_pos
-
-            # Load the pixel
-            color_index = \
-                color_offset \
-                + self._get_tile_color(tile_address,
-                                       pixel_x_pos,
-                                       pixel_y_pos)
-
-            # Get the color from CRAM and convert it
-            # Each color is 2 bytes
+            # Get the converted color from CRAM
             # Color 0 in all palettes is transparent
             color = \
                 0 \
-                if (color_index & 0xF) == 0 \
-                else self._to_rgba(self._cram.read(color_index << 1))
-
-            # Address for the pixel to set in the texture
-            pixel_address = pixel_row_address + x_pos
+                if color_index == 0 \
+                else palette[color_offset + color_index]
 
             # Draw the pixel on the plane
+            x_pos = x_start + index
             if is_prio:
-                prio_pixels[pixel_address] = color
+                prio_pixels[x_pos] = color
+                pixels[x_pos] = 0
             else:
-                prio_pixels[pixel_address] = 0
-                pixels[pixel_address] = color
-
-            # Never leave the current plane size with the index (which might
-            # otherwise happen due to horizontal scrolling)
-            plane_x_pos = (plane_x_pos + 1) % self._plane_width
+                prio_pixels[x_pos] = 0
+                pixels[x_pos] = color
 
     def get_pixel(self, pixel_address):
         if pixel_address < 0 or pixel_address >= self._pixel_address_limit:
             raise rpython_utils.RIndexError("Invalid pixel address (%d)"
                                             % (pixel_address))
-        for pixels in self._priority:
-            color = pixels[pixel_address]
-            if color != 0:
-                break
-        else:
-            color = self._pixels_bg[pixel_address]
-        return color
+        return self._frame[pixel_address]
 
     def set_m68k_ram(self, m68k_ram):
         """Set the reference to the M68k RAM."""
         self._m68k_ram = m68k_ram
 
+    def set_m68k_cpu(self, m68k_cpu):
+        """
+        Set the reference to the M68k CPU.
+
+        A DMA from 68k memory stalls the CPU, so the cycles it takes are added
+        to the CPU's cycle counter. Without a CPU, DMA takes no time.
+        """
+        self._m68k_cpu = m68k_cpu
+
+    def get_dma_bytes(self):
+        """Get the amount of bytes written by DMA so far."""
+        return self._dma_bytes
+
+    def get_dma_bytes_last_frame(self):
+        """Get the amount of bytes written by DMA during the last frame."""
+        return self._dma_last_frame_bytes
+
     def write(self, address, value):
         """
         Write to the VDP controller.
@@ -634,6 +735,7 @@ class Display(device.Device):
                 self._vram.fill_bytes(self._address,
                                       self._dma_length,
                                       value >> 8)
+                self._count_dma_bytes(self._dma_length)
         elif address < 8:
             # Control Port
             # The written value might be a long word to select the addressing
@@ -750,6 +852,44 @@ class Display(device.Device):
             "Unknown VDP read address 0x%s"
             % int_utils.to_32x_string(address))
 
+    def read_byte(self, address):
+        """
+        Read one byte of the VDP ports.
+
+        The even address returns the upper byte of the port's word, the odd
+        address the lower one. Reading the data port advances the address
+        just like reading a word.
+        """
+        value = self.read(address & ~1)
+        if address & 1:
+            return value & 0xFF
+        return value >> 8
+
+    def write_byte(self, address, value):
+        """
+        Write one byte to the VDP ports.
+
+        The VDP receives the byte in both halves of the word.
+        """
+        value &= 0xFF
+        self.write(address & ~1, (value << 8) | value)
+
+    def write_long(self, address, value):
+        """
+        Write a long word to the VDP ports.
+
+        A long word written to the control port is a complete command to
+        select the address unless it writes to the registers. The data port
+        receives two words.
+        """
+        upper_word = (value >> 16) & 0xFFFF
+        if address == 4 and not self._write_buffer \
+                and int_utils.select_bits(upper_word, 13, 15) != 0b100:
+            self.set_addressing(value & 0xFFFFFFFF)
+        else:
+            self.write(address, upper_word)
+            self.write(address + 2, value & 0xFFFF)
+
     def set_addressing(self, value):
         """Set the currently active memory device and address."""
         # Set all the ignored value to 0
@@ -795,14 +935,129 @@ class Display(device.Device):
 
     def _dma_transfer(self):
         # We can assume that the DMA type is not VRAM fill
-        # Address is always word-aligned and amount is always an even amount of
-        # bytes.
-        source_device = self._vram if self._dma_type == 3 else self._m68k_ram
-        for offset in range(0, self._dma_length, 2):
-            source_address = self._dma_address + offset
-            target_address = self._address + offset
-            value = source_device.read(source_address)
-            self._selected_memory.write(target_address, value)
+        if self._dma_type == 3:
+            self._dma_copy()
+        else:
+            self._dma_from_m68k()
+
+    def _dma_from_m68k(self):
+        """
+        Copy words from the 68k address space to the selected memory.
+
+        With an auto-increment of 2, the words from RAM and ROM are copied
+        in runs that end where the source or the target address wraps
+        around. Otherwise, they are copied one word at a time.
+        """
+        target = self._selected_memory
+        # The target address wraps around within the memory
+        if target is self._vram:
+            target_mask = 0xFFFF
+        else:
+            target_mask = 0x7F
+        target_size = target.get_size()
+        target_address = self._address
+        increment = self._increment_address
+
+        source_address = self._dma_address
+        words = self._dma_length >> 1
+        remaining = words
+        while remaining > 0:
+            # Copy up to the end of the source page, the device is the same
+            # for all of its words
+            amount = min(remaining, (0x10000 - (source_address & 0xFFFF)) >> 1)
+            source = self._m68k_ram.get_page_device(source_address)
+            source_mask = self._m68k_ram.get_page_mask(source_address)
+            is_block_source = isinstance(source, ram.ByteRam) \
+                or isinstance(source, rom.Rom)
+            if increment == 2 and is_block_source:
+                copied = 0
+                while copied < amount:
+                    source_offset = \
+                        (source_address + (copied << 1)) & source_mask
+                    address = target_address & target_mask & ~1
+                    # Words up to where the source or the target wraps around
+                    run = min(amount - copied,
+                              min((source_mask + 1 - source_offset) >> 1,
+                                  (target_mask + 1 - address) >> 1))
+                    # Writes beyond the end of VSRAM are lost
+                    kept = min(run, max(0, target_size - address) >> 1)
+                    if kept > 0:
+                        target.copy_from(address,
+                                         source,
+                                         source_offset,
+                                         kept << 1)
+                    target_address += run << 1
+                    copied += run
+            else:
+                for offset in range(0, amount << 1, 2):
+                    if source is None:
+                        value = self._m68k_ram.read(source_address + offset)
+                    else:
+                        value = source.read((source_address + offset)
+                                            & source_mask)
+                    address = target_address & target_mask
+                    # Writes beyond the end of VSRAM are lost
+                    if address < target_size:
+                        target.write(address & ~1, value)
+                    target_address += increment
+            # The source address wraps around within 128KB
+            source_address = \
+                (source_address & ~0x1FFFF) \
+                | ((source_address + (amount << 1)) & 0x1FFFF)
+            remaining -= amount
+
+        self._address = target_address & 0xFFFF
+        self._dma_address = source_address
+        self._count_dma_bytes(words << 1)
+
+        # The 68k is stalled until the transfer is finished
+        if self._m68k_cpu is not None:
+            bytes_per_line = _DMA_BYTES_PER_LINE[1 if self._is_320_mode else 0]
+            self._m68k_cpu.increment_cycles(
+                ((words << 1) * _CYCLES_PER_LINE) // bytes_per_line)
+
+    def _dma_copy(self):
+        """
+        Copy bytes within VRAM.
+
+        With an auto-increment of 1, the bytes are copied in runs that end
+        where the source or the target address wraps around. Otherwise, they
+        are copied one byte at a time.
+        """
+        # The source registers hold a byte address here, which is not shifted
+        # like the word address of 68k transfers
+        source_address = (self._dma_address >> 1) & 0xFFFF
+        target_address = self._address
+        increment = self._increment_address
+        # The length counts bytes instead of words
+        amount = self._dma_length >> 1
+        if increment == 1:
+            copied = 0
+            while copied < amount:
+                source_offset = (source_address + copied) & 0xFFFF
+                address = target_address & 0xFFFF
+                run = min(amount - copied,
+                          min(0x10000 - source_offset, 0x10000 - address))
+                # Overlapping ranges repeat the bytes just like copying one
+                # byte at a time
+                self._vram.copy_from(address, self._vram, source_offset, run)
+                target_address += run
+                copied += run
+        else:
+            for offset in range(amount):
+                self._vram.write_byte(
+                    target_address & 0xFFFF,
+                    self._vram.read_byte((source_address + offset) & 0xFFFF))
+                target_address += increment
+        self._address = target_address & 0xFFFF
+        source_address = (source_address + amount) & 0xFFFF
+        self._dma_address = \
+            (self._dma_address & ~0x1FFFE) | (source_address << 1)
+        self._count_dma_bytes(amount)
+
+    def _count_dma_bytes(self, amount):
+        self._dma_bytes += amount
+        self._dma_frame_bytes += amount
 
     def set_register(self, register_index, value):
         """Set one of the VDP registers."""
@@ -854,6 +1109,7 @@ class Display(device.Device):
             # 0x400 if 320 pixel mode is active
             self._table_sprite = \
                 int_utils.select_bits(value, start_index, end_index) * 0x200
+            self._sprites_valid = False
 
         elif register_index == 6:
             # Extra sprite table bit
@@ -861,6 +1117,7 @@ class Display(device.Device):
                 # Value bit 5 is the address bit 16
                 self._table_sprite = \
                     ((value & 0b100000) << 11) | (self._table_sprite & 0xFFFF)
+                self._sprites_valid = False
 
         elif register_index == 7:
             # Background Color
@@ -980,7 +1237,155 @@ class Display(device.Device):
 
     def stop(self):
         """Do display-specific cleanup."""
-        pass
+        self._frame.free()
+        self._line_plane_bg.free()
+        self._line_plane_bg_prio.free()
+        self._line_plane_fg.free()
+        self._line_plane_fg_prio.free()
+        self._line_plane_sp.free()
+        self._line_plane_sp_prio.free()
+
+    def save_state(self, writer):
+        """
+        Write the registers and memories to a ``megadrive.state.StateWriter``.
+
+        Of the pixels, only the lines of the current frame above the next one
+        are saved, so that the frame is complete when it is shown after
+        loading. The line buffers are drawn again.
+        """
+        writer.write_i64(self._address)
+        writer.write_u8(len(self._write_buffer))
+        for value in self._write_buffer:
+            writer.write_u16(value)
+        writer.write_u16(self._vcounter)
+        writer.write_bool(self._dma_vram_fill)
+        if self._selected_memory is self._vram:
+            writer.write_u8(1)
+        elif self._selected_memory is self._vsram:
+            writer.write_u8(2)
+        else:
+            writer.write_u8(0)
+        writer.write_i64(self._dma_bytes)
+        writer.write_i64(self._dma_frame_bytes)
+        writer.write_i64(self._dma_last_frame_bytes)
+
+        writer.write_bool(self._disable_display)
+        writer.write_bool(self._freeze_hv_counter)
+        writer.write_bool(self._low_color_mode)
+        writer.write_bool(self._do_horizontal_interrupts)
+        writer.write_bool(self._blank_left)
+        writer.write_bool(self._is_mega_drive_mode)
+        writer.write_bool(self._is_pal)
+        writer.write_bool(self._enable_dma)
+        writer.write_bool(self._do_vertical_interrupts)
+        writer.write_bool(self._enable_tiles_and_sprites)
+        writer.write_bool(self._use_extended_vram)
+        writer.write_u32(self._table_plane_fg)
+        writer.write_u32(self._table_plane_wn)
+        writer.write_u32(self._table_plane_bg)
+        writer.write_u32(self._table_sprite)
+        writer.write_u8(self._bg_color_ind)
+        writer.write_u16(self._hblank_amount)
+        writer.write_u16(self._hblank_counter)
+        writer.write_u8(self._hscroll_mode)
+        writer.write_bool(self._vscroll_mode)
+        writer.write_bool(self._do_external_interrupts)
+        writer.write_u8(self._interlace_mode)
+        writer.write_bool(self._shadow_highlight_mode)
+        writer.write_bool(self._is_320_mode)
+        writer.write_u32(self._hscroll_data)
+        writer.write_u8(self._increment_address)
+        writer.write_u16(self._plane_width)
+        writer.write_u16(self._plane_height)
+        writer.write_u16(self._window_pos_hor)
+        writer.write_bool(self._window_draw_right)
+        writer.write_u16(self._window_pos_ver)
+        writer.write_bool(self._window_draw_down)
+        writer.write_u32(self._dma_length)
+        writer.write_u32(self._dma_address)
+        writer.write_u8(self._dma_type)
+
+        self._vram.save_state(writer)
+        self._cram.save_state(writer)
+        self._vsram.save_state(writer)
+
+        # The lines of the current frame that have been drawn already, the
+        # others are drawn after loading
+        drawn = self.width * self._vcounter
+        writer.write_u32(drawn)
+        for pixel_address in range(drawn):
+            writer.write_u32(self._frame[pixel_address])
+
+    def load_state(self, reader):
+        """
+        Read the registers and memories written by ``save_state`` from a
+        ``megadrive.state.StateReader``.
+        """
+        self._address = reader.read_i64()
+        del self._write_buffer[:]
+        for _ in range(reader.read_u8()):
+            self._write_buffer.append(reader.read_u16())
+        self._vcounter = reader.read_u16() % self.height
+        self._dma_vram_fill = reader.read_bool()
+        memory_index = reader.read_u8()
+        if memory_index == 1:
+            self._selected_memory = self._vram
+        elif memory_index == 2:
+            self._selected_memory = self._vsram
+        else:
+            self._selected_memory = self._cram
+        self._dma_bytes = reader.read_i64()
+        self._dma_frame_bytes = reader.read_i64()
+        self._dma_last_frame_bytes = reader.read_i64()
+
+        self._disable_display = reader.read_bool()
+        self._freeze_hv_counter = reader.read_bool()
+        self._low_color_mode = reader.read_bool()
+        self._do_horizontal_interrupts = reader.read_bool()
+        self._blank_left = reader.read_bool()
+        self._is_mega_drive_mode = reader.read_bool()
+        self._is_pal = reader.read_bool()
+        self._enable_dma = reader.read_bool()
+        self._do_vertical_interrupts = reader.read_bool()
+        self._enable_tiles_and_sprites = reader.read_bool()
+        self._use_extended_vram = reader.read_bool()
+        self._table_plane_fg = reader.read_u32()
+        self._table_plane_wn = reader.read_u32()
+        self._table_plane_bg = reader.read_u32()
+        self._table_sprite = reader.read_u32()
+        self._bg_color_ind = reader.read_u8()
+        self._hblank_amount = reader.read_u16()
+        self._hblank_counter = reader.read_u16()
+        self._hscroll_mode = reader.read_u8()
+        self._vscroll_mode = reader.read_bool()
+        self._do_external_interrupts = reader.read_bool()
+        self._interlace_mode = reader.read_u8()
+        self._shadow_highlight_mode = reader.read_bool()
+        self._update_320_mode(reader.read_bool())
+        self._hscroll_data = reader.read_u32()
+        self._increment_address = reader.read_u8()
+        self._plane_width = reader.read_u16()
+        self._plane_height = reader.read_u16()
+        self._window_pos_hor = reader.read_u16()
+        self._window_draw_right = reader.read_bool()
+        self._window_pos_ver = reader.read_u16()
+        self._window_draw_down = reader.read_bool()
+        self._dma_length = reader.read_u32()
+        self._dma_address = reader.read_u32()
+        self._dma_type = reader.read_u8()
+
+        self._vram.load_state(reader)
+        self._cram.load_state(reader)
+        self._vsram.load_state(reader)
+        self._sprites_valid = False
+
+        drawn = reader.read_u32()
+        if drawn != self.width * self._vcounter:
+            raise rpython_utils.StateError(
+                "%d pixels do not fill %d lines of the frame"
+                % (drawn, self._vcounter))
+        for pixel_address in range(drawn):
+            self._frame[pixel_address] = reader.read_u32()
 
     def _check_hblank(self):
         self._hblank_counter -= 1
@@ -1013,18 +1418,10 @@ class Display(device.Device):
         return is_prio, color_offset, vflip, hflip, tile_address
 
     def _get_tile_color(self, tile_address, pixel_x, pixel_y):
-        # Tiles are placed row for row in VRAM
-        # Each tile is 8x8=64 pixels, each pixel takes one nibble (4 bits)
-        # Each row is 4 bytes
-        pixel_byte_address = tile_address + (pixel_y << 2) + (pixel_x >> 1)
-        # Load the selected byte
-        color_byte = self._vram.read(pixel_byte_address) >> 8
-        # Select the first or second nibble
-        if pixel_x & 1:
-            color = color_byte & 0xF
-        else:
-            color = (color_byte & 0xF0) >> 4
-        return color
+        # Tiles are decoded to one color index per pixel, row for row
+        # Each tile is 8x8=64 pixels and takes 32 bytes in VRAM
+        tile_offset = self._vram.get_tile(tile_address >> vram.TILE_SHIFT)
+        return self._tile_colors[tile_offset + (pixel_y << 3) + pixel_x]
 
     def _get_sprite_pixel(self,
                           sprite_address,
@@ -1152,8 +1549,12 @@ class Display(device.Device):
     def _update_320_mode(self, is_320_mode):
         self._is_320_mode = is_320_mode
         self.width = 320 if self._is_320_mode else 256
-        # Re-create the pixel lists
-        self._create_pixels()
+        # The amount of sprites depends on the mode
+        self._sprites_valid = False
+        # The frame is laid out for the new width, the lines that have been
+        # drawn already are cleared
+        self._pixel_address_limit = self.width * self.height
+        self._frame.fill(0, self.width * self._vcounter, 0)
 
     def __str__(self):
         field_lines = [
@@ -1291,324 +1692,19 @@ class Display(device.Device):
             % self._dma_type,
             "",
             "VSRAM = [%s]"
-            % ", ".join([hex(x) for x in self._vsram._qwords])
+            % ", ".join([hex(self._vsram.read(address))
+                         for address in range(0, 80, 2)])
         ]
         return "Display{\n\t" + "\n\t".join(field_lines) + "\n}"
 
 
-class _PlaneTexture:
-    """Helper class for RsdlDisplay."""
-
-    def __init__(self, renderer, width, height):
-        # Every texture needs the texture itself and a pixel and pitch pointer
-        # variable:
-        # SDL_Texture* texture
-        # unsigned int** pixel_pointer
-        # int* pitch
-        self.texture = RSDL.CreateTexture(
-            renderer,
-            RSDL.PIXELFORMAT_RGBA8888,
-            RSDL.TEXTUREACCESS_STREAMING,
-            width,
-            height)
-        self.pixel_pointer = lltype.malloc(UINTPP, flavor="raw")
-        self.pitch_pointer = lltype.malloc(INTP, flavor="raw")
-        # Need to cast these to the same type that SDL_LockTexture needs
-        self._pixel_pointer_cast = rffi.cast(rffi.VOIDPP, self.pixel_pointer)
-        self._pitch_pointer_cast = rffi.cast(rffi.INTP, self.pitch_pointer)
-
-        # Set the blend mode for the texture to allow for transparency
-        RSDL.SetTextureBlendMode(self.texture, RSDL.BLENDMODE_BLEND)
-
-    def lock(self):
-        RSDL.LockTexture(self.texture,
-                         _NULL_RECT,
-                         self._pixel_pointer_cast,
-                         self._pitch_pointer_cast)
-
-    def unlock(self):
-        RSDL.UnlockTexture(self.texture)
-
-    def get_pixels(self):
-        """
-        List of raw pixel data (write-only). May include row padding.
-
-        Should only be called after locking.
-        """
-        return self.pixel_pointer[0]
-
-    def get_row_length(self):
-        """
-        Length (in list entries) for one row of pixels.
-
-        May only be called after locking the texture.
-        """
-        # pitch = texture width + padding
-        return int(self.pitch_pointer[0]) // 4
-
-    def free(self):
-        lltype.free(self.pixel_pointer, flavor="raw")
-        lltype.free(self.pitch_pointer, flavor="raw")
-        RSDL.DestroyTexture(self.texture)
-
-
-# For 64-Bit Windows the eci.py from rsdl had to be modified to use the x64
-# version of SDL 2.0.12
-# Other than that, VS 2022 Dev PowerShell v17.7.4 was used with cl.exe
-# version 19.37.32824 from Build Tools installation and RPython from Oktober
-# 2023.
-# Somehow, this only workd from Windows Terminal App, not from standalone
-# Developer PowerShell
-# Also, some SDL functions and constants have been added to rsdl/RSDL.py and
-# rsdl/constants.py
-class RsdlDisplay(Display):
-    """Display implementation using SDL 2."""
-
-    def __init__(self, scale=1.0):
-        Display.__init__(self, scale=scale)
-
-        RSDL.Init(RSDL.INIT_EVERYTHING)
-
-        window_width = int(self.width * self._scale)
-        window_height = int(self.height * self._scale)
-
-        self._window = RSDL.CreateWindow("Revelation",
-                                         RSDL.WINDOWPOS_CENTERED,
-                                         RSDL.WINDOWPOS_CENTERED,
-                                         window_width,
-                                         window_height,
-                                         RSDL.WINDOW_SHOWN)
-        self._renderer = RSDL.CreateRenderer(
-            self._window, -1, RSDL.RENDERER_ACCELERATED)
-
-        self._event = lltype.malloc(RSDL.Event, flavor="raw")
-        # Flag that indicates if the textures are currently locked
-        self._is_locked = False
-
-        # The texture to draw on
-        self._texture = None
-
-        # Flags for the controller
-        self._button_up = False
-        self._button_down = False
-        self._button_left = False
-        self._button_right = False
-        self._button_b = False
-        self._button_c = False
-        self._button_a = False
-        self._button_start = False
-
-        self._create_textures()
-        self._clear_screen()
-
-    def _create_textures(self):
-        self._texture = _PlaneTexture(
-            self._renderer,
-            self.width,
-            self.height)
-
-    def _free_textures(self):
-        self._texture.free()
-
-    def stop(self):
-        """Free allocated resources and stop SDL."""
-        # Free allocated resources
-        lltype.free(self._event, flavor="raw")
-        self._free_textures()
-        # Destroy window and renderer
-        RSDL.DestroyRenderer(self._renderer)
-        RSDL.DestroyWindow(self._window)
-
-        RSDL.Quit()
-
-    def show_next_frame(self):
-        """Draw lines until the next frame will be shown."""
-        keep_drawing = True
-        while keep_drawing:
-            self.draw_line()
-            keep_drawing = self._vcounter != 0
-
-    def draw_line(self, next_frame_time=0.0):
-        """
-        Draw the next line on the screen.
-
-        Note, that the result is only displayed once the last line of the
-        screen has been drawn.
-
-        Parameters
-        ----------
-        next_frame_time: float, optional
-            The earliest timestamp at which the next frame should be drawn.
-            In other words, when this method is about to draw the frame it has
-            created , it will wait until ``time.time()`` is at least
-            ``next_frame_time``.
-            Default is ``0.0``, meaning that no waiting will ever occur.
-
-        Returns
-        -------
-        quit_: bool
-            ``True`` iff the user requested to quit.
-
-        vblank: bool
-            ``True`` iff a VBLANK happens. This usually happens after each drawn
-            frame, but it can be disabled.
-
-        hblank: bool
-            ``True`` iff an HBLANK happens. This usually happens after each
-            drawn line, but it can be disabled and there may be a counter for
-            it.
-
-        frame_drawn: bool
-            ``True`` iff the last line of the screen has just been drawn. As
-            opposed to ``vblank`` this will always be ``True`` when the frame
-            has been drawn, regardless of the VDP's settings.
-        """
-        quit, vblank, hblank, frame_drawn = \
-            Display.draw_line(self, next_frame_time)
-
-        if frame_drawn:
-            # Handle the SDL events that have been queued up
-            quit |= self._handle_events()
-            # TODO since we only need one texture now this can be cleaned up
-            self._lock_all_textures()
-            self._draw_textures()
-            self._unlock_all_textures()
-            self._copy_textures()
-            # Wait for the right time to show the frame
-            sleep_duration = next_frame_time - time.time()
-            time.sleep(max(0.0, sleep_duration))
-            RSDL.RenderPresent(self._renderer)
-
-        return quit, vblank, hblank, frame_drawn
-
-    def _lock_all_textures(self):
-        self._texture.lock()
-        self._is_locked = True
-
-    def _unlock_all_textures(self):
-        self._texture.unlock()
-        self._is_locked = False
-
-    def _copy_textures(self):
-        # TODO only on texture
-        # Copy the texture data to the renderer
-        # NULL will use the full area of texture and renderer
-        # The textures will be scaled to fit the window size
-        RSDL.RenderCopy(self._renderer,
-                        self._texture.texture,
-                        _NULL_RECT,
-                        _NULL_RECT)
-
-    def _draw_textures(self):
-        """Draw the current frame on the textures."""
-        # We assume the texture has been locked
-        pixels = self._texture.get_pixels()
-        row_length = self._texture.get_row_length()
-        texture_index = 0
-        for line_offset in range(0, self._pixel_address_limit, self.width):
-            for x_pos in range(self.width):
-                color = self._to_sdl_rgba(self.get_pixel(x_pos + line_offset))
-                pixels[texture_index + x_pos] = color
-            texture_index += row_length
-
-    def _handle_events(self):
-        quit_ = False
-        event_counter = 6  # Handle only a certain amount of events per frame
-
-        while RSDL.PollEvent(self._event) > 0 and event_counter > 0:
-            event_type = rffi.cast(lltype.Unsigned, self._event.c_type)
-            if event_type == RSDL.QUIT:
-                quit_ = True
-            if event_type in (RSDL.KEYDOWN, RSDL.KEYUP):
-                keyboard_event = rffi.cast(RSDL.KeyboardEventPtr, self._event)
-                keysim = keyboard_event.c_keysym
-                sym = rffi.cast(lltype.Unsigned, keysim.c_sym)
-                value = event_type == RSDL.KEYDOWN
-
-                # TODO make the key mapping modifiable
-                if sym == RSDL.K_UP:
-                    self._button_up = value
-                elif sym == RSDL.K_DOWN:
-                    self._button_down = value
-                elif sym == RSDL.K_LEFT:
-                    self._button_left = value
-                elif sym == RSDL.K_RIGHT:
-                    self._button_right = value
-                elif sym == RSDL.K_q:
-                    self._button_a = value
-                elif sym == RSDL.K_w:
-                    self._button_b = value
-                elif sym == RSDL.K_e:
-                    self._button_c = value
-
-            # TODO support more events
-
-            event_counter -= 1
-
-        self._m68k_ram.set_buttons(1,
-                                   self._button_up, self._button_down,
-                                   self._button_left, self._button_right,
-                                   self._button_a, self._button_b,
-                                   self._button_c,
-                                   self._button_start)
-
-        return quit_
-
-    def _clear_screen(self):
-        """Fill the screen with black."""
-        bg_rect = RSDL_helper.mallocrect(0, 0,
-                                         int(self.width * self._scale),
-                                         int(self.height * self._scale))
-        RSDL.SetRenderDrawColor(self._renderer, 0, 0, 0, 255)
-        RSDL.RenderFillRect(self._renderer, bg_rect)
-        RSDL.RenderPresent(self._renderer)
-        lltype.free(bg_rect, flavor="raw")
-
-    def _update_320_mode(self, is_320_mode):
-        is_change = is_320_mode != self._is_320_mode
-        Display._update_320_mode(self, is_320_mode)
-        if is_change:
-            was_locked = self._is_locked
-            if was_locked:
-                self._unlock_all_textures()
-            # Re-scale all textures
-            self._free_textures()
-            self._create_textures()
-            if was_locked:
-                self._lock_all_textures()
-        RSDL.SetWindowSize(self._window,
-                           int(self.width * self._scale),
-                           int(self.height * self._scale))
-
-    def _to_sdl_rgba(self, color):
-        return rffi.r_uint(color)
-
-
-
 class FakeDisplay(Display):
-    """Fake display implementation that does nothing."""
-
-    def draw_line(self, next_frame_time=0.0):
-        """Pretend to draw a line."""
-        return Display.draw_line(self, next_frame_time)
+    """Fake display implementation that never draws any pixels."""
 
-    def _draw_line_plane(self,
-                         y_pos,
-                         h_offset,
-                         pixel_row_address,
-                         pixels,
-                         prio_pixels,
-                         plane_index,
-                         table_base,
-                         use_window):
-        # To save performance, this method will be disabled, since there are
-        # no side effects without displaying the image.
-        # We still draw sprites because of collision detection.
-        return
-
-    def _draw_line_background(self, pixel_row_address):
-        # See above
-        return
+    def __init__(self, scale=1.0):
+        Display.__init__(self, scale)
+        # Nobody can see the frames, so all of them are skipped
+        self.set_frameskip(-1)
 
 
 def _bool_to_str(b):
@@ -138,6 +138,28 @@ class IoRegisters(Device):
         else:
             self._value_p2 = value
 
+    def save_state(self, writer):
+        """Write the registers to a ``megadrive.state.StateWriter``."""
+        writer.write_u8(self._mask_p1)
+        writer.write_u8(self._mask_p2)
+        writer.write_u8(self._mask_modem)
+        writer.write_u8(self._value_p1)
+        writer.write_u8(self._value_p2)
+        writer.write_u8(self._value_modem)
+        writer.write_bool(self._mode_p1)
+        writer.write_bool(self._mode_p2)
+
+    def load_state(self, reader):
+        """Read the registers from a ``megadrive.state.StateReader``."""
+        self._mask_p1 = reader.read_u8()
+        self._mask_p2 = reader.read_u8()
+        self._mask_modem = reader.read_u8()
+        self._value_p1 = reader.read_u8()
+        self._value_p2 = reader.read_u8()
+        self._value_modem = reader.read_u8()
+        self._mode_p1 = reader.read_bool()
+        self._mode_p2 = reader.read_bool()
+
 
 class TmssRegister(Device):
     """Simulates the TMSS"""
@@ -165,6 +187,14 @@ class Z80ResetRegister(Device):
     def write(self, address, value):
         self._is_resetting = not (value & 0x100)
 
+    def save_state(self, writer):
+        """Write the register to a ``megadrive.state.StateWriter``."""
+        writer.write_bool(self._is_resetting)
+
+    def load_state(self, reader):
+        """Read the register from a ``megadrive.state.StateReader``."""
+        self._is_resetting = reader.read_bool()
+
 
 class Z80RequestRegister(Device):
     """Simulate the Z80 bus request."""
@@ -178,3 +208,11 @@ class Z80RequestRegister(Device):
 
     def write(self, address, value):
         self._accessible = bool(value & 0x100)
+
+    def save_state(self, writer):
+        """Write the register to a ``megadrive.state.StateWriter``."""
+        writer.write_bool(self._accessible)
+
+    def load_state(self, reader):
+        """Read the register from a ``megadrive.state.StateReader``."""
+        self._accessible = reader.read_bool()
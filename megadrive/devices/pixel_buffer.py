@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Contains a compact buffer for pixels in RGBA8888 format.
+
+Each pixel takes 32 bits instead of a full integer object. The translated
+emulator stores them in a raw array outside of the garbage collected heap,
+while the untranslated one uses the ``array`` module.
+
+Created on Sun Oct 18 22:14:52 2026
+
+@author: Simon Romanowski
+"""
+
+import array
+
+try:
+    from rpython.rtyper.lltypesystem import rffi, lltype
+except ImportError:
+    # The raw arrays are only used when translated
+    rffi = None
+    lltype = None
+
+from utils.rpython_utils import we_are_translated
+
+
+# Largest resolution of the Mega Drive, in H40 mode on PAL
+MAX_WIDTH = 320
+MAX_HEIGHT = 240
+
+if rffi is not None:
+    _PIXEL_ARRAY = rffi.CArray(rffi.UINT)
+else:
+    _PIXEL_ARRAY = None
+
+
+class PixelBuffer(object):
+    """
+    Fixed amount of pixels in RGBA8888 format, all initially 0.
+
+    Pixels are read and written like list entries. Indices are not checked.
+
+    Parameters
+    ----------
+    size: int
+        Amount of pixels in the buffer.
+    """
+
+    _immutable_fields_ = ["_pixels", "_size"]
+
+    def __init__(self, size):
+        self._size = size
+        if we_are_translated():
+            self._pixels = lltype.malloc(_PIXEL_ARRAY,
+                                         size,
+                                         flavor="raw",
+                                         zero=True)
+        else:
+            self._pixels = array.array("I", [0]) * size
+
+    def get_size(self):
+        """Get the amount of pixels in the buffer."""
+        return self._size
+
+    def __getitem__(self, index):
+        if we_are_translated():
+            return rffi.cast(lltype.Signed, self._pixels[index])
+        return int(self._pixels[index])
+
+    def __setitem__(self, index, color):
+        if we_are_translated():
+            self._pixels[index] = rffi.cast(rffi.UINT, color)
+        else:
+            self._pixels[index] = color
+
+    def fill(self, start, amount, color):
+        """Set ``amount`` pixels from index ``start`` on to ``color``."""
+        for index in range(start, start + amount):
+            self[index] = color
+
+    def free(self):
+        """Release the memory of the buffer, which may not be used anymore."""
+        if we_are_translated():
+            lltype.free(self._pixels, flavor="raw")
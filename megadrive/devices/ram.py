@@ -310,9 +310,250 @@ class Ram8Bit64(Ram64):
         self._qwords[index] = new_value
 
 
+class ByteRam(Device):
+    """
+    16-bit RAM that stores one byte per entry of a flat buffer.
+
+    Words and long words are combined from single bytes in Big-Endian format,
+    so no address needs special treatment.
+
+    Parameters
+    ----------
+    size: int
+        Amount of bytes that the memory should support.
+    """
+
+    _immutable_fields_ = ["_bytes", "_size"]
+
+    def __init__(self, size):
+        self._bytes = bytearray("\x00" * size)
+        self._size = size
+
+    def get_size(self):
+        """Get the amount of bytes in this RAM."""
+        return self._size
+
+    def save_state(self, writer):
+        """Write all bytes to a ``megadrive.state.StateWriter``."""
+        writer.write_u32(self._size)
+        for address in range(self._size):
+            writer.write_u8(self._bytes[address])
+
+    def load_state(self, reader):
+        """Read all bytes from a ``megadrive.state.StateReader``."""
+        size = reader.read_u32()
+        if size != self._size:
+            raise rpython_utils.StateError(
+                "RAM of %d bytes cannot be loaded into %d bytes"
+                % (size, self._size))
+        for address in range(self._size):
+            self._bytes[address] = reader.read_u8()
+
+    def _check_address(self, address):
+        if address < 0 or address >= self._size:
+            raise rpython_utils.RIndexError(
+                "address: 0x%s" % int_utils.to_32x_string(address))
+
+    def read_byte(self, address):
+        """
+        Read the byte at the given address.
+
+        Parameters
+        ----------
+        address: int
+            The address of the byte to read.
+        """
+        self._check_address(address)
+        return self._bytes[address]
+
+    def write_byte(self, address, value):
+        """
+        Write the byte at the given address.
+
+        Parameters
+        ----------
+        address: int
+            The address of the byte to write.
+
+        value: int
+            The new value of the byte. Only the lower 8 bit are considered.
+        """
+        self._check_address(address)
+        self._bytes[address] = value & 0xFF
+
+    def read(self, address):
+        """
+        Read the word at the given address.
+
+        Parameters
+        ----------
+        address: int
+            The address of the word to read. The value is returned in
+            Big-Endian format, meaning that the byte at address ``address``
+            will be the higher-order byte of the resulting word. If this is
+            the last address, the lower-order byte is 0.
+        """
+        self._check_address(address)
+        value = self._bytes[address] << 8
+        if address + 1 < self._size:
+            value |= self._bytes[address + 1]
+        return value
+
+    def write(self, address, value):
+        """
+        Write the word at the given address.
+
+        Parameters
+        ----------
+        address: int
+            The address of the word to write. The value is interpreted in
+            Big-Endian format, meaning that the byte at address ``address``
+            will be the higher-order byte of ``value``. If this is the last
+            address, the lower-order byte is ignored.
+
+        value: int
+            The new value of the word at the given address.
+            Only the lower 16 bit are considered.
+        """
+        self._check_address(address)
+        self._bytes[address] = (value >> 8) & 0xFF
+        if address + 1 < self._size:
+            self._bytes[address + 1] = value & 0xFF
+
+    def read_long(self, address):
+        """
+        Read the long word at the given address in Big-Endian format.
+
+        Parameters
+        ----------
+        address: int
+            The address of the long word to read. All 4 bytes must be inside
+            of the RAM.
+        """
+        self._check_address(address)
+        self._check_address(address + 3)
+        data = self._bytes
+        return \
+            (data[address] << 24) \
+            | (data[address + 1] << 16) \
+            | (data[address + 2] << 8) \
+            | data[address + 3]
+
+    def write_long(self, address, value):
+        """
+        Write the long word at the given address in Big-Endian format.
+
+        Parameters
+        ----------
+        address: int
+            The address of the long word to write. All 4 bytes must be inside
+            of the RAM.
+
+        value: int
+            The new value of the long word. Only the lower 32 bit are
+            considered.
+        """
+        self._check_address(address)
+        self._check_address(address + 3)
+        data = self._bytes
+        data[address] = (value >> 24) & 0xFF
+        data[address + 1] = (value >> 16) & 0xFF
+        data[address + 2] = (value >> 8) & 0xFF
+        data[address + 3] = value & 0xFF
+
+    def read_bytes_into(self, address, data, data_address, amount):
+        """
+        Copy ``amount`` bytes from the given address on into the bytearray
+        ``data``, starting at ``data_address``.
+
+        The bytes are copied in ascending order, so ``data`` may be the
+        buffer of this RAM itself. All bytes must be inside of the RAM.
+        """
+        if amount <= 0:
+            return
+        self._check_address(address)
+        self._check_address(address + amount - 1)
+        source = self._bytes
+        for offset in range(amount):
+            data[data_address + offset] = source[address + offset]
+
+    def copy_from(self, address, source, source_address, amount):
+        """
+        Copy ``amount`` bytes from another device to the given address.
+
+        Parameters
+        ----------
+        address: int
+            The address of the first byte to write. All bytes must be inside
+            of the RAM.
+
+        source: megadrive.devices.device.Device
+            The device to read the bytes from with ``read_bytes_into``. May be
+            this RAM itself.
+
+        source_address: int
+            The address of the first byte in ``source``.
+
+        amount: int
+            The amount of bytes to copy.
+        """
+        if amount <= 0:
+            return
+        self._check_address(address)
+        self._check_address(address + amount - 1)
+        source.read_bytes_into(source_address, self._bytes, address, amount)
+
+    def fill_bytes(self, start, amount, value):
+        """
+        Fill a certain RAM area with the given byte.
+
+        Bytes that would be outside of the RAM are ignored.
+
+        Parameters
+        ----------
+        start: int
+            The start address of the fill operation.
+
+        amount: int
+            The amount of bytes to fill.
+
+        value: int
+            The byte value to use when filling.
+        """
+        value = value & 0xFF
+        end = min(start + amount, self._size)
+        data = self._bytes
+        for address in range(max(start, 0), end):
+            data[address] = value
+
+    def dump(self, start_address=0):
+        """Print this registers content in rows of 16 bytes."""
+        # We print 16 bytes per line
+        # Print header:
+        os.write(
+            1,
+            "         "
+            "| _0 | _1 | _2 | _3 | _4 | _5 | _6 | _7 "
+            "| _8 | _9 | _A | _B | _C | _D | _E | _F |\n"
+            "---------"
+            "|----|----|----|----|----|----|----|----"
+            "|----|----|----|----|----|----|----|----|\n")
+        for offset in range(self._size):
+            if offset & 0xF == 0:
+                os.write(1, int_utils.to_32x_string(start_address + offset))
+                os.write(1, " | ")
+            byte_hex = int_utils.to_32x_string(self._bytes[offset])[6:8]
+            os.write(1, byte_hex)
+            os.write(1, " | ")
+            if offset & 0xF == 0xF:
+                os.write(1, "\n")
+
+
+# All devices use the byte buffer, 'Ram64' is kept as an alternative
+Ram = ByteRam
+
 if sys.maxint > ((1<<32) - 1):
     # 64-bit
-    Ram = Ram64
     Ram8Bit = Ram8Bit64
 else:
     raise RuntimeError("Only 64-bit is supported")
@@ -7,7 +7,6 @@ Created on Sat Sep 30 10:25:48 2023
 @author: Simon Romanowski
 """
 
-import sys
 import os
 
 from utils import int_utils, rpython_utils
@@ -15,41 +14,67 @@ from utils import int_utils, rpython_utils
 from megadrive.devices.device import Device
 
 
-class Rom64(Device):
+# Maximum size of a program in bytes
+MAX_PROGRAM_SIZE = 1024 * 1024 * 4
+
+
+class Rom(Device):
     """
-    16-bit ROM for 64-bit machines.
+    16-bit ROM that reads the words directly from the program image.
+
+    The image is either a string or a read-only memory mapping of the
+    cartridge file. It is never copied or converted, so creating the ROM
+    takes the same time for every program size. Addresses beyond the end of
+    the image read as 0xFF bytes, the illegal instruction 0xFFFF.
 
     Parameters
     ----------
     program: None | str, optional
         Optional sequence of bytes that represent the program to load into ROM.
-        Maximum allowed size is 4MB.
+        Maximum allowed size is 4MB. Ignored if ``mapped`` is given.
+
+    mapped: None | rpython.rlib.rmmap.MMap, optional
+        Optional memory mapping of the program. Maximum allowed size is 4MB.
     """
 
-    def __init__(self, program=None):
-        self._qwords = []
-
-        if program is not None:
-            prog_len = len(program)
-            if prog_len > (1024 * 1024 * 4):
-                raise rpython_utils.RValueError("Program exceeds maximum size")
-            p_index = 0
-            shifts = range(56, -1, -8)
-            while p_index < prog_len:
-                # Combine 8 chars to one integer
-                value = 0
-                for shift in shifts:
-                    if p_index < prog_len:
-                        p_value = ord(program[p_index])
-                        p_index += 1
-                    else:
-                        p_value = 0xFF  # Illegal instruction 0xFF to fill rest
-                    value |= p_value << shift
-                self._qwords.append(value)
-
-    def get_rom_list(self):
-        """Get a list of all Quad Words in ROM."""
-        return self._qwords
+    # The content of the ROM never changes after loading the program
+    _immutable_fields_ = ["_program", "_mapped", "_size"]
+
+    def __init__(self, program=None, mapped=None):
+        if mapped is not None:
+            size = mapped.len()
+            program = ""
+        elif program is None:
+            program = ""
+            size = 0
+        else:
+            size = len(program)
+        if size > MAX_PROGRAM_SIZE:
+            raise rpython_utils.RValueError("Program exceeds maximum size")
+        self._program = program
+        self._mapped = mapped
+        self._size = size
+
+    def get_size(self):
+        """Get the size of the program in bytes."""
+        return self._size
+
+    def get_checksum(self):
+        """Get the 32-bit FNV-1a hash of the program."""
+        checksum = 0x811C9DC5
+        for address in range(self._size):
+            checksum = \
+                ((checksum ^ self._read_byte(address)) * 0x01000193) \
+                & 0xFFFFFFFF
+        return checksum
+
+    def _read_byte(self, address):
+        if address < 0 or address >= self._size:
+            # Out-of-bounds access just returns an illegal instruction
+            return 0xFF
+        if self._mapped is not None:
+            return ord(self._mapped.data[address])
+        return ord(self._program[address])
 
     def read(self, address):
         """
@@ -61,38 +86,56 @@ class Rom64(Device):
             A value from 0 to 0x3F_FFFF that indicates the internal address
             of the requested word.
         """
-        # Index of the integer that contains the upper byte of the requested
-        # word.
-        index = address >> 3
-
-        if index < len(self._qwords):
-            # The lower-order 2 bits are indices into the actual integers in
-            # 'self._qwords'.
-            lower = address & 0b111
-            raw_value = self._qwords[index]
-
-            if lower == 7:
-                # Need to combine the lowes byte with the highest byte from the
-                # integer at the next index.
-                value = (raw_value & 0xFF) << 8
-                if index < len(self._qwords) - 1:  # Avoid index errors
-                    raw_next = self._qwords[index + 1]
-                else:
-                    raw_next = 0xFFFFFFFFFFFFFFFF
-                value += raw_next >> 56
-            else:
-                # Mask selects the bytes to use from 'raw_value'
-                shift = 8 * (6 - lower)
-                value = (raw_value >> shift) & 0xFFFF
-        else:
-            # Out-of-bounds access just returns an illegal instruction
-            value = 0xFFFF
+        return self.read_const(address)
+
+    @rpython_utils.elidable
+    def read_const(self, address):
+        """
+        Same as ``read``.
 
-        return value
+        The ROM never changes, so the JIT may constant-fold calls of this
+        method. It must not be overridden, because the JIT does not allow
+        indirect calls of such methods.
+        """
+        if 0 <= address and address + 1 < self._size:
+            # Whole word within the image
+            if self._mapped is not None:
+                data = self._mapped.data
+                return (ord(data[address]) << 8) | ord(data[address + 1])
+            program = self._program
+            return (ord(program[address]) << 8) | ord(program[address + 1])
+        return (self._read_byte(address) << 8) | self._read_byte(address + 1)
+
+    def read_byte(self, address):
+        return self._read_byte(address)
+
+    def read_long(self, address):
+        return (self.read_const(address) << 16) \
+            | self.read_const(address + 2)
+
+    def read_bytes_into(self, address, data, data_address, amount):
+        # Bytes within the image, the rest reads as 0xFF
+        inside = max(0, min(amount, self._size - address))
+        if self._mapped is not None:
+            image = self._mapped.data
+            for offset in range(inside):
+                data[data_address + offset] = ord(image[address + offset])
+        else:
+            program = self._program
+            for offset in range(inside):
+                data[data_address + offset] = ord(program[address + offset])
+        for offset in range(inside, amount):
+            data[data_address + offset] = 0xFF
 
     def write(self, address, value):
         pass  # Ignore write
 
+    def write_byte(self, address, value):
+        pass  # Ignore write
+
+    def write_long(self, address, value):
+        pass  # Ignore write
+
     def dump(self):
         """Print this registers content in rows of 16 bytes."""
         # We print 16 bytes per line
@@ -105,29 +148,13 @@ class Rom64(Device):
             "---------"
             "|----|----|----|----|----|----|----|----"
             "|----|----|----|----|----|----|----|----|\n")
-        print_newline = False
-        print_offset = True
-        address_offset = 0
-        for qword in self._qwords:
-            if print_offset:
-                os.write(1, int_utils.to_32x_string(address_offset))
-                os.write(1, " | ")
-            shift = 56
-            while shift >= 0:
-                current_byte = (qword >> shift) & 0xFF
-                qword_hex = int_utils.to_32x_string(current_byte)[6:8]
-                os.write(1, qword_hex)
+        # Whole lines, the rest is filled like out-of-bounds reads
+        for offset in range((self._size + 0xF) & ~0xF):
+            if offset & 0xF == 0:
+                os.write(1, int_utils.to_32x_string(offset))
                 os.write(1, " | ")
-                shift -= 8
-            if print_newline:
+            byte_hex = int_utils.to_32x_string(self._read_byte(offset))[6:8]
+            os.write(1, byte_hex)
+            os.write(1, " | ")
+            if offset & 0xF == 0xF:
                 os.write(1, "\n")
-            print_newline = not print_newline
-            print_offset = not print_offset
-            address_offset += 8
-
-
-if sys.maxint > ((1<<32) - 1):
-    # 64-bit
-    Rom = Rom64
-else:
-    raise RuntimeError("Only 64-bit is supported")
\ No newline at end of file
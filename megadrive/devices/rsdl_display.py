@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""
+Shows the frames of the Mega Drive's VDP in an SDL 2 window.
+
+Only this module needs SDL, so the VDP in ``megadrive.devices.display`` can
+be used without it.
+
+Created on Sun Oct 18 23:41:26 2026
+
+@author: Simon Romanowski
+"""
+
+from rsdl import RSDL, RSDL_helper
+from rpython.rtyper.lltypesystem import rffi, lltype
+import rpython.rlib.rtime as time
+
+from megadrive.devices.display import Display
+
+
+# --- Types for rffi ---
+
+UINTP = lltype.Ptr(lltype.Array(rffi.UINT, hints={'nolength': True}))
+# These are 'FixedSizeArray' since when translating with RPython, 'Ptr'
+# variables cannot be allocated with 'lltype.malloc'.
+UINTPP = lltype.FixedSizeArray(rffi.UINTP, 1, hints={'nolength': True})
+INTP = lltype.FixedSizeArray(rffi.INT, 1, hints={'nolength': True})
+
+
+# --- Constants for RSDL ---
+
+_NULL_RECT = lltype.nullptr(RSDL.Rect)
+_SDL_TRANSPARENT = rffi.r_uint(0)
+
+
+class _PlaneTexture:
+    """Helper class for RsdlDisplay."""
+
+    def __init__(self, renderer, width, height):
+        # Every texture needs the texture itself and a pixel and pitch pointer
+        # variable:
+        # SDL_Texture* texture
+        # unsigned int** pixel_pointer
+        # int* pitch
+        self.texture = RSDL.CreateTexture(
+            renderer,
+            RSDL.PIXELFORMAT_RGBA8888,
+            RSDL.TEXTUREACCESS_STREAMING,
+            width,
+            height)
+        self.pixel_pointer = lltype.malloc(UINTPP, flavor="raw")
+        self.pitch_pointer = lltype.malloc(INTP, flavor="raw")
+        # Need to cast these to the same type that SDL_LockTexture needs
+        self._pixel_pointer_cast = rffi.cast(rffi.VOIDPP, self.pixel_pointer)
+        self._pitch_pointer_cast = rffi.cast(rffi.INTP, self.pitch_pointer)
+
+        # Set the blend mode for the texture to allow for transparency
+        RSDL.SetTextureBlendMode(self.texture, RSDL.BLENDMODE_BLEND)
+
+    def lock(self):
+        RSDL.LockTexture(self.texture,
+                         _NULL_RECT,
+                         self._pixel_pointer_cast,
+                         self._pitch_pointer_cast)
+
+    def unlock(self):
+        RSDL.UnlockTexture(self.texture)
+
+    def get_pixels(self):
+        """
+        List of raw pixel data (write-only). May include row padding.
+
+        Should only be called after locking.
+        """
+        return self.pixel_pointer[0]
+
+    def get_row_length(self):
+        """
+        Length (in list entries) for one row of pixels.
+
+        May only be called after locking the texture.
+        """
+        # pitch = texture width + padding
+        return int(self.pitch_pointer[0]) // 4
+
+    def free(self):
+        lltype.free(self.pixel_pointer, flavor="raw")
+        lltype.free(self.pitch_pointer, flavor="raw")
+        RSDL.DestroyTexture(self.texture)
+
+
+# For 64-Bit Windows the eci.py from rsdl had to be modified to use the x64
+# version of SDL 2.0.12
+# Other than that, VS 2022 Dev PowerShell v17.7.4 was used with cl.exe
+# version 19.37.32824 from Build Tools installation and RPython from Oktober
+# 2023.
+# Somehow, this only workd from Windows Terminal App, not from standalone
+# Developer PowerShell
+# Also, some SDL functions and constants have been added to rsdl/RSDL.py and
+# rsdl/constants.py
+class RsdlDisplay(Display):
+    """Display implementation using SDL 2."""
+
+    def __init__(self, scale=1.0):
+        Display.__init__(self, scale=scale)
+
+        RSDL.Init(RSDL.INIT_EVERYTHING)
+
+        window_width = int(self.width * self._scale)
+        window_height = int(self.height * self._scale)
+
+        self._window = RSDL.CreateWindow("Revelation",
+                                         RSDL.WINDOWPOS_CENTERED,
+                                         RSDL.WINDOWPOS_CENTERED,
+                                         window_width,
+                                         window_height,
+                                         RSDL.WINDOW_SHOWN)
+        self._renderer = RSDL.CreateRenderer(
+            self._window, -1, RSDL.RENDERER_ACCELERATED)
+
+        self._event = lltype.malloc(RSDL.Event, flavor="raw")
+        # Flag that indicates if the textures are currently locked
+        self._is_locked = False
+        # Whether any pixel of the frame that is being drawn changed
+        self._frame_changed = False
+        # Whether the texture does not show the frame, even if no pixel
+        # changes
+        self._texture_outdated = False
+
+        # The texture to draw on
+        self._texture = None
+
+        # Flags for the controller
+        self._button_up = False
+        self._button_down = False
+        self._button_left = False
+        self._button_right = False
+        self._button_b = False
+        self._button_c = False
+        self._button_a = False
+        self._button_start = False
+
+        self._create_textures()
+        self._clear_screen()
+
+    def _create_textures(self):
+        self._texture = _PlaneTexture(
+            self._renderer,
+            self.width,
+            self.height)
+
+    def _free_textures(self):
+        self._texture.free()
+
+    def stop(self):
+        """Free allocated resources and stop SDL."""
+        # Free allocated resources
+        lltype.free(self._event, flavor="raw")
+        self._free_textures()
+        # Destroy window and renderer
+        RSDL.DestroyRenderer(self._renderer)
+        RSDL.DestroyWindow(self._window)
+
+        RSDL.Quit()
+
+        Display.stop(self)
+
+    def show_next_frame(self):
+        """Draw lines until the next frame will be shown."""
+        keep_drawing = True
+        while keep_drawing:
+            self.draw_line()
+            keep_drawing = self._vcounter != 0
+
+    def draw_line(self, next_frame_time=0.0):
+        """
+        Draw the next line on the screen.
+
+        Note, that the result is only displayed once the last line of the
+        screen has been drawn.
+
+        Parameters
+        ----------
+        next_frame_time: float, optional
+            The earliest timestamp at which the next frame should be drawn.
+            In other words, when this method is about to draw the frame it has
+            created , it will wait until ``time.time()`` is at least
+            ``next_frame_time``.
+            Default is ``0.0``, meaning that no waiting will ever occur.
+
+        Returns
+        -------
+        quit_: bool
+            ``True`` iff the user requested to quit.
+
+        vblank: bool
+            ``True`` iff a VBLANK happens. This usually happens after each drawn
+            frame, but it can be disabled.
+
+        hblank: bool
+            ``True`` iff an HBLANK happens. This usually happens after each
+            drawn line, but it can be disabled and there may be a counter for
+            it.
+
+        frame_drawn: bool
+            ``True`` iff the last line of the screen has just been drawn. As
+            opposed to ``vblank`` this will always be ``True`` when the frame
+            has been drawn, regardless of the VDP's settings.
+        """
+        quit, vblank, hblank, frame_drawn = \
+            Display.draw_line(self, next_frame_time)
+
+        if frame_drawn:
+            # Handle the SDL events that have been queued up
+            quit |= self._handle_events()
+            # A texture that was recreated by the last line is still empty
+            if self._texture_outdated and not self._is_locked:
+                self._lock_all_textures()
+                self._draw_texture_rows(0, self.width * (self.height - 1))
+                self._frame_changed = True
+            # The texture is locked from the first changed line of a rendered
+            # frame until its end
+            if self._is_locked:
+                self._unlock_all_textures()
+            # Wait for the right time to show the frame
+            sleep_duration = next_frame_time - time.time()
+            time.sleep(max(0.0, sleep_duration))
+            # Otherwise the screen keeps showing the same frame
+            if self._frame_changed:
+                self._copy_textures()
+                RSDL.RenderPresent(self._renderer)
+                self._frame_changed = False
+
+        return quit, vblank, hblank, frame_drawn
+
+    def _lock_all_textures(self):
+        self._texture.lock()
+        self._is_locked = True
+        self._texture_outdated = False
+
+    def _unlock_all_textures(self):
+        self._texture.unlock()
+        self._is_locked = False
+
+    def _copy_textures(self):
+        # TODO only on texture
+        # Copy the texture data to the renderer
+        # NULL will use the full area of texture and renderer
+        # The textures will be scaled to fit the window size
+        RSDL.RenderCopy(self._renderer,
+                        self._texture.texture,
+                        _NULL_RECT,
+                        _NULL_RECT)
+
+    def _compose_line(self, pixel_row_address):
+        """
+        Compose the current line into the frame, and into the texture once it
+        is locked.
+
+        The texture is only locked by the first line of a frame that changes,
+        so frames without changes are never uploaded. Returns whether any
+        pixel of the line changed.
+        """
+        if not self._is_locked:
+            changed = Display._compose_line(self, pixel_row_address)
+            if changed or self._texture_outdated:
+                # Locking loses the previous content of the texture, so the
+                # lines above and this one are written from the frame
+                self._lock_all_textures()
+                self._draw_texture_rows(0, pixel_row_address)
+                self._frame_changed = True
+            return changed
+        pixels = self._texture.get_pixels()
+        texture_index = ((pixel_row_address // self.width)
+                         * self._texture.get_row_length())
+        frame = self._frame
+        changed = False
+        for x_pos in range(self.width):
+            color = self._line_color(x_pos)
+            pixel_address = pixel_row_address + x_pos
+            if frame[pixel_address] != color:
+                frame[pixel_address] = color
+                changed = True
+            pixels[texture_index + x_pos] = self._to_sdl_rgba(color)
+        return changed
+
+    def _draw_texture_rows(self, first_row_address, last_row_address):
+        """
+        Write the lines of the frame from ``first_row_address`` to
+        ``last_row_address`` to the locked texture.
+        """
+        pixels = self._texture.get_pixels()
+        row_length = self._texture.get_row_length()
+        frame = self._frame
+        texture_index = (first_row_address // self.width) * row_length
+        for row_address in range(first_row_address,
+                                 last_row_address + 1,
+                                 self.width):
+            for x_pos in range(self.width):
+                color = self._to_sdl_rgba(frame[row_address + x_pos])
+                pixels[texture_index + x_pos] = color
+            texture_index += row_length
+
+    def _handle_events(self):
+        quit_ = False
+        event_counter = 6  # Handle only a certain amount of events per frame
+
+        while RSDL.PollEvent(self._event) > 0 and event_counter > 0:
+            event_type = rffi.cast(lltype.Unsigned, self._event.c_type)
+            if event_type == RSDL.QUIT:
+                quit_ = True
+            if event_type in (RSDL.KEYDOWN, RSDL.KEYUP):
+                keyboard_event = rffi.cast(RSDL.KeyboardEventPtr, self._event)
+                keysim = keyboard_event.c_keysym
+                sym = rffi.cast(lltype.Unsigned, keysim.c_sym)
+                value = event_type == RSDL.KEYDOWN
+
+                # TODO make the key mapping modifiable
+                if sym == RSDL.K_UP:
+                    self._button_up = value
+                elif sym == RSDL.K_DOWN:
+                    self._button_down = value
+                elif sym == RSDL.K_LEFT:
+                    self._button_left = value
+                elif sym == RSDL.K_RIGHT:
+                    self._button_right = value
+                elif sym == RSDL.K_q:
+                    self._button_a = value
+                elif sym == RSDL.K_w:
+                    self._button_b = value
+                elif sym == RSDL.K_e:
+                    self._button_c = value
+
+            # TODO support more events
+
+            event_counter -= 1
+
+        self._m68k_ram.set_buttons(1,
+                                   self._button_up, self._button_down,
+                                   self._button_left, self._button_right,
+                                   self._button_a, self._button_b,
+                                   self._button_c,
+                                   self._button_start)
+
+        return quit_
+
+    def _clear_screen(self):
+        """Fill the screen with black."""
+        bg_rect = RSDL_helper.mallocrect(0, 0,
+                                         int(self.width * self._scale),
+                                         int(self.height * self._scale))
+        RSDL.SetRenderDrawColor(self._renderer, 0, 0, 0, 255)
+        RSDL.RenderFillRect(self._renderer, bg_rect)
+        RSDL.RenderPresent(self._renderer)
+        lltype.free(bg_rect, flavor="raw")
+
+    def _update_320_mode(self, is_320_mode):
+        is_change = is_320_mode != self._is_320_mode
+        Display._update_320_mode(self, is_320_mode)
+        if is_change:
+            # The lines of the frame that were already written are lost
+            if self._is_locked:
+                self._unlock_all_textures()
+            # Re-scale all textures
+            self._free_textures()
+            self._create_textures()
+            # The new texture has to be written and shown even if no pixel
+            # changes
+            self._texture_outdated = True
+        RSDL.SetWindowSize(self._window,
+                           int(self.width * self._scale),
+                           int(self.height * self._scale))
+
+    def load_state(self, reader):
+        Display.load_state(self, reader)
+        # The texture still shows the frame from before loading
+        self._texture_outdated = True
+
+    def _to_sdl_rgba(self, color):
+        return rffi.r_uint(color)
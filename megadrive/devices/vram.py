@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Contains the VDP's video RAM (VRAM) together with a cache of decoded tiles.
+
+Tiles are 8x8 pixels with 4 bits per pixel, stored row for row in 32 bytes.
+Drawing reads one pixel at a time, so each tile is unpacked into 64 color
+indices the first time it is drawn. Every write to a tile drops its decoded
+form, which is rebuilt on the next access. Writes to one range of addresses
+can also be watched, which the VDP uses for its sprite table.
+
+Created on Sun Oct 18 19:24:41 2026
+
+@author: Simon Romanowski
+"""
+
+from megadrive.devices import ram
+
+
+# Each tile takes 32 bytes of VRAM
+TILE_SHIFT = 5
+
+# Each decoded tile takes 64 color indices
+TILE_PIXELS = 64
+
+
+class Vram(ram.ByteRam):
+    """
+    Byte RAM that keeps the color indices of its tiles decoded.
+
+    Parameters
+    ----------
+    size: int
+        Amount of bytes that the memory should support. Must be a power of 2
+        and a multiple of 32.
+    """
+
+    _immutable_fields_ = ["_tile_colors", "_tile_valid", "_tile_mask"]
+
+    def __init__(self, size):
+        ram.ByteRam.__init__(self, size)
+        tile_count = size >> TILE_SHIFT
+        self._tile_mask = tile_count - 1
+        # Color index from 0 to 15 of every pixel, tile for tile and row for
+        # row
+        self._tile_colors = [0] * (tile_count * TILE_PIXELS)
+        # Whether the decoded form of a tile is up to date
+        self._tile_valid = [False] * tile_count
+        # Range of addresses whose changes are reported, see ``watch``
+        self._watch_start = 0
+        self._watch_end = -1
+        self._watch_written = False
+
+    def get_tile_colors(self):
+        """
+        Get the list of decoded color indices.
+
+        The entries of a tile are only valid after calling ``get_tile``.
+        """
+        return self._tile_colors
+
+    def get_tile(self, tile_index):
+        """
+        Get the position of a decoded tile in the list of color indices.
+
+        The tile is decoded first if it changed since the last call. The color
+        index of the pixel at (x, y) is found at the returned position plus
+        ``(y << 3) + x``.
+
+        Parameters
+        ----------
+        tile_index: int
+            The index of the tile, its address in VRAM divided by 32. Indices
+            beyond the end of the VRAM wrap around.
+        """
+        tile_index &= self._tile_mask
+        offset = tile_index * TILE_PIXELS
+        if not self._tile_valid[tile_index]:
+            self._decode_tile(tile_index, offset)
+        return offset
+
+    def watch(self, start, end):
+        """
+        Watch the addresses from ``start`` to ``end`` for writes.
+
+        Replaces the previously watched range and resets
+        ``is_watched_written``.
+        """
+        self._watch_start = start
+        self._watch_end = end
+        self._watch_written = False
+
+    def is_watched_written(self):
+        """Whether the watched range was written since ``watch``."""
+        return self._watch_written
+
+    def _decode_tile(self, tile_index, offset):
+        data = self._bytes
+        colors = self._tile_colors
+        address = tile_index << TILE_SHIFT
+        for byte_index in range(32):
+            color_byte = data[address + byte_index]
+            # The upper nibble is the left pixel
+            colors[offset + (byte_index << 1)] = color_byte >> 4
+            colors[offset + (byte_index << 1) + 1] = color_byte & 0xF
+        self._tile_valid[tile_index] = True
+
+    def _invalidate(self, start, end):
+        """Drop the decoded tiles from address ``start`` to ``end``."""
+        start = max(start, 0)
+        end = min(end, self._size - 1)
+        if start <= self._watch_end and end >= self._watch_start:
+            self._watch_written = True
+        for tile_index in range(start >> TILE_SHIFT,
+                                (end >> TILE_SHIFT) + 1):
+            self._tile_valid[tile_index] = False
+
+    def write_byte(self, address, value):
+        ram.ByteRam.write_byte(self, address, value)
+        self._invalidate(address, address)
+
+    def write(self, address, value):
+        ram.ByteRam.write(self, address, value)
+        self._invalidate(address, address + 1)
+
+    def write_long(self, address, value):
+        ram.ByteRam.write_long(self, address, value)
+        self._invalidate(address, address + 3)
+
+    def fill_bytes(self, start, amount, value):
+        ram.ByteRam.fill_bytes(self, start, amount, value)
+        self._invalidate(start, start + amount - 1)
+
+    def copy_from(self, address, source, source_address, amount):
+        ram.ByteRam.copy_from(self, address, source, source_address, amount)
+        self._invalidate(address, address + amount - 1)
+
+    def load_state(self, reader):
+        ram.ByteRam.load_state(self, reader)
+        self._invalidate(0, self._size - 1)
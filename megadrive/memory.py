@@ -13,6 +13,10 @@ from megadrive.devices import ram, rom, other, device
 from utils import int_utils
 
 
+# Index of the entry in the port tables for addresses that map to nothing
+_NO_PORT = 0x200
+
+
 class MappingError(rpython_utils.ExceptionWithMessage):
     """
     Raised when an address is attempted to be accessed that is not mapped.
@@ -38,17 +42,33 @@ class Memory(device.Device):
         causing no graphics to be displayed.
         If this is ``None``, it will also cause an error if attempting to
         write to the VDP.
+
+    fail_on_invalid: bool, optional
+        Whether accessing an address that is not mapped to a device raises a
+        ``MappingError``. Default is ``False``, ignoring such accesses.
+
+    mapped_program: None | rpython.rlib.rmmap.MMap, optional
+        Read-only memory mapping of the program. If given, it is used instead
+        of ``program``.
     """
 
+    # The devices are never replaced. '_code_cache' rarely changes.
+    _immutable_fields_ = [
+        "_ram", "_rom", "_io_registers", "_tmss", "_display", "_sound_ram",
+        "_z80_reset", "_z80_bus_request", "_null_dev", "_fail_on_invalid",
+        "_code_cache?", "_pages[*]", "_page_masks[*]", "_ports[*]",
+        "_port_masks[*]", "_port_limits[*]",
+    ]
+
     def __init__(self,
                  program=None,
                  display_device=None,
-                 verbose=False,
-                 fail_on_invalid=False):
+                 fail_on_invalid=False,
+                 mapped_program=None):
         # Main memory is 64KB (68k memory)
         self._ram = ram.Ram(64*1024)
 
-        self._rom = rom.Rom(program)
+        self._rom = rom.Rom(program, mapped_program)
 
         self._io_registers = other.IoRegisters()
 
@@ -62,20 +82,146 @@ class Memory(device.Device):
 
         self._z80_bus_request = other.Z80RequestRegister()
 
-        self._verbose = verbose
-
         self._null_dev = device.NullDevice()
 
         self._fail_on_invalid = fail_on_invalid
 
-    def get_rom_list(self):
-        """Get a list of all Long Words in ROM."""
-        return self._rom.get_rom_list()
+        # Cache of decoded instructions that must know about writes to RAM
+        self._code_cache = None
+
+        # Number of accesses so far that might have changed the state of the
+        # console. Used to detect loops that only wait for an interrupt.
+        self._side_effect_count = 0
+
+        # Devices by the upper 8 bits of the 24-bit address, each covering a
+        # 64KB page, and the masks that give the device's internal address.
+        # The I/O and VDP pages are 'None' and are mapped by the port tables.
+        # The same is true for unmapped pages if invalid accesses should fail.
+        pages = [None] * 256
+        page_masks = [0] * 256
+        for page in range(256):
+            if page < 0x40:
+                # Cartridge ROM
+                pages[page] = self._rom
+                page_masks[page] = 0x3FFFFF
+            elif page == 0xFF:
+                # 68k RAM
+                pages[page] = self._ram
+                page_masks[page] = 0xFFFF
+            elif page == 0xA0:
+                # Z80 RAM
+                pages[page] = self._sound_ram
+                page_masks[page] = 0x1FFF
+            elif page == 0xA1 or page == 0xC0 or fail_on_invalid:
+                # I/O region, VDP or unmapped
+                pages[page] = None
+            else:
+                # Unmapped
+                pages[page] = self._null_dev
+        self._pages = pages
+        self._page_masks = page_masks
+
+        # Devices in the I/O page 0xA1 and the VDP page 0xC0 by bits 8 to 15
+        # of the address, see '_get_port'. The masks give the device's
+        # internal address and the limits the highest value of the lower 8
+        # bits that is still mapped. The last entry maps to nothing.
+        ports = [self._null_dev] * (_NO_PORT + 1)
+        port_masks = [0] * (_NO_PORT + 1)
+        port_limits = [-1] * (_NO_PORT + 1)
+        # IO registers (Controllers etc.)
+        ports[0x00] = self._io_registers
+        port_masks[0x00] = 0x1F
+        port_limits[0x00] = 0x1F
+        # Z80 bus request
+        ports[0x11] = self._z80_bus_request
+        port_limits[0x11] = 0x01
+        # Z80 reset
+        ports[0x12] = self._z80_reset
+        port_limits[0x12] = 0x01
+        # TMSS register (for licensing check)
+        ports[0x40] = self._tmss
+        port_limits[0x40] = 0x03
+        # VDP (display controller)
+        ports[0x100] = self._display
+        port_masks[0x100] = 0x1F
+        port_limits[0x100] = 0x1F
+        self._ports = ports
+        self._port_masks = port_masks
+        self._port_limits = port_limits
+
+    def set_code_cache(self, code_cache):
+        """
+        Set the cache to notify about writes to 68k RAM.
+
+        Parameters
+        ----------
+        code_cache: m68k.block_cache.BlockCache | None
+            The cache whose blocks in RAM should be dropped when the RAM
+            changes, or ``None`` to disable notifications.
+        """
+        self._code_cache = code_cache
+
+    def get_rom(self):
+        """Get the cartridge ROM device."""
+        return self._rom
+
+    def get_page_device(self, address):
+        """
+        Get the device that the 64KB page of the given address maps to.
+
+        Within the page, the address for the device is the given address
+        masked with ``get_page_mask``. Returns ``None`` if the page contains
+        several devices, which are only available through ``read`` and
+        ``write``.
+        """
+        return self._pages[(address >> 16) & 0xFF]
+
+    def get_page_mask(self, address):
+        """Get the mask for addresses in the page, see ``get_page_device``."""
+        return self._page_masks[(address >> 16) & 0xFF]
+
+    def get_side_effect_count(self):
+        """
+        Get the number of accesses that might have had side effects.
+
+        All writes are counted. Reads are counted unless they access ROM, 68k
+        RAM or the VDP status and H/V counter ports, whose values do not
+        change while only the CPU executes.
+        If this value did not change between two points in time, the memory
+        was only read from without side effects.
+        """
+        return self._side_effect_count
+
+    def _get_port(self, address):
+        """
+        Get the index into the port tables for an address whose page is not
+        in ``self._pages``.
+
+        Returns ``_NO_PORT`` for unmapped addresses, or raises a
+        ``MappingError`` if invalid accesses should fail.
+        """
+        page = address >> 16
+        if page == 0xA1:
+            port = (address >> 8) & 0xFF
+        elif page == 0xC0:
+            port = 0x100 | ((address >> 8) & 0xFF)
+        else:
+            # Unmapped page, only missing if invalid accesses should fail
+            port = -1
+        if port < 0 or (address & 0xFF) > self._port_limits[port]:
+            if self._fail_on_invalid:
+                # Raises the error
+                self._get_device(address)
+            return _NO_PORT
+        return port
 
     def _get_device(self, address):
         """
         Get the device that the given memory address maps to.
 
+        Only used to report unmapped addresses, accesses use ``self._pages``
+        and ``_get_port``.
+
         Parameters
         ----------
         address: int
@@ -128,6 +274,33 @@ class Memory(device.Device):
                                % int_utils.to_32x_string(address))
         return (self._null_dev, 0)
 
+    def save_state(self, writer):
+        """
+        Write the state of the RAMs and registers to a
+        ``megadrive.state.StateWriter``.
+
+        The ROM never changes, the VDP is saved on its own.
+        """
+        self._ram.save_state(writer)
+        self._io_registers.save_state(writer)
+        self._sound_ram.save_state(writer)
+        self._z80_reset.save_state(writer)
+        self._z80_bus_request.save_state(writer)
+
+    def load_state(self, reader):
+        """
+        Read the state written by ``save_state`` from a
+        ``megadrive.state.StateReader``.
+        """
+        self._ram.load_state(reader)
+        self._io_registers.load_state(reader)
+        self._sound_ram.load_state(reader)
+        self._z80_reset.load_state(reader)
+        self._z80_bus_request.load_state(reader)
+        # The code in RAM may be different now
+        if self._code_cache is not None:
+            self._code_cache.clear()
+
     def get_z80_reset(self):
         """Returns ``True`` iff the Z80 should be reset."""
         return not (self._z80_reset.read(0) & 0x100)
@@ -159,8 +332,38 @@ class Memory(device.Device):
                                        a, b, c,
                                        start)
 
+    def is_verbose(self):
+        """Returns ``True`` iff memory accesses are printed."""
+        return False
+
     def set_verbose(self, verbose):
-        self._verbose = bool(verbose)
+        """
+        Enable or disable printing of memory accesses.
+
+        Has no effect, only ``TracingMemory`` prints memory accesses.
+        """
+
+    def _count_read(self, device, adj_address):
+        """Count a read access if it might have side effects."""
+        # Reading the VDP data port advances its address, all other devices
+        # outside of ROM and RAM are treated the same way to be safe
+        is_vdp_status = device is self._display \
+            and adj_address >= 4 and adj_address < 0x10
+        if device is not self._rom and device is not self._ram \
+                and not is_vdp_status:
+            self._side_effect_count += 1
+
+    def _count_write(self, device, adj_address, size):
+        """
+        Count a write access and notify the code cache about writes to RAM.
+
+        ``size`` is the amount of bytes written.
+        """
+        self._side_effect_count += 1
+        if device is self._ram and self._code_cache is not None:
+            self._code_cache.invalidate(adj_address)
+            if size > 2:
+                self._code_cache.invalidate(adj_address + 2)
 
     def read(self, address):
         """
@@ -172,18 +375,18 @@ class Memory(device.Device):
             A value from 0x000000 to 0xFFFFFF that indicates the address of the
             requested word. Only the lower 24 bits are considered.
         """
-        if self._verbose:
-            print("### Mem: reading 0x%s" % int_utils.to_32x_string(address))
         # Address space is 24-bit
         address = address & 0xFFFFFF
-        device, adj_address = self._get_device(address)
-
-        result = device.read(adj_address)
-
-        if self._verbose:
-            print("### Mem: value 0x%s" % int_utils.to_32x_string(result))
-
-        return result
+        page = address >> 16
+        device = self._pages[page]
+        if device is None:
+            port = self._get_port(address)
+            device = self._ports[port]
+            adj_address = address & self._port_masks[port]
+        else:
+            adj_address = address & self._page_masks[page]
+        self._count_read(device, adj_address)
+        return device.read(adj_address)
 
     def write(self, address, value):
         """
@@ -198,12 +401,227 @@ class Memory(device.Device):
             The new value of the word at the given address.
             Only the lower 16 bit are considered.
         """
-        if self._verbose:
-            print("### Mem: writing 0x%s to 0x%s"
-                  % (int_utils.to_32x_string(value),
-                     int_utils.to_32x_string(address)))
         # Address space is 24-bit
         address = address & 0xFFFFFF
         value &= 0xFFFF
-        device, adj_address = self._get_device(address)
+        page = address >> 16
+        device = self._pages[page]
+        if device is None:
+            port = self._get_port(address)
+            device = self._ports[port]
+            adj_address = address & self._port_masks[port]
+        else:
+            adj_address = address & self._page_masks[page]
+        self._count_write(device, adj_address, 2)
         return device.write(adj_address, value)
+
+    def read_byte(self, address):
+        """
+        Read the byte at the given address in memory.
+
+        Parameters
+        ----------
+        address: int
+            A value from 0x000000 to 0xFFFFFF that indicates the address of the
+            requested byte. Only the lower 24 bits are considered.
+        """
+        address = address & 0xFFFFFF
+        page = address >> 16
+        device = self._pages[page]
+        if device is None:
+            port = self._get_port(address)
+            device = self._ports[port]
+            adj_address = address & self._port_masks[port]
+        else:
+            adj_address = address & self._page_masks[page]
+        self._count_read(device, adj_address)
+        return device.read_byte(adj_address)
+
+    def write_byte(self, address, value):
+        """
+        Write the byte at the given address to the given value.
+
+        Parameters
+        ----------
+        address: int
+            The address of the byte to be written.
+
+        value: int
+            The new value of the byte at the given address.
+            Only the lower 8 bit are considered.
+        """
+        address = address & 0xFFFFFF
+        value &= 0xFF
+        page = address >> 16
+        device = self._pages[page]
+        if device is None:
+            port = self._get_port(address)
+            device = self._ports[port]
+            adj_address = address & self._port_masks[port]
+        else:
+            adj_address = address & self._page_masks[page]
+        self._count_write(device, adj_address, 1)
+        device.write_byte(adj_address, value)
+
+    def read_long(self, address):
+        """
+        Read the long word at the given address in memory.
+
+        Parameters
+        ----------
+        address: int
+            A value from 0x000000 to 0xFFFFFF that indicates the address of the
+            requested long word. Only the lower 24 bits are considered.
+        """
+        address = address & 0xFFFFFF
+        page = address >> 16
+        device = self._pages[page]
+        if device is None:
+            port = self._get_port(address)
+            device = self._ports[port]
+            mask = self._port_masks[port]
+        else:
+            mask = self._page_masks[page]
+        adj_address = address & mask
+        if adj_address + 3 > mask:
+            # The words wrap around the device or are in different devices
+            return (self.read(address) << 16) | self.read(address + 2)
+        self._count_read(device, adj_address)
+        return device.read_long(adj_address)
+
+    def write_long(self, address, value):
+        """
+        Write the long word at the given address to the given value.
+
+        Parameters
+        ----------
+        address: int
+            The address of the long word to be written.
+
+        value: int
+            The new value of the long word at the given address.
+            Only the lower 32 bit are considered.
+        """
+        address = address & 0xFFFFFF
+        value &= 0xFFFFFFFF
+        page = address >> 16
+        device = self._pages[page]
+        if device is None:
+            port = self._get_port(address)
+            device = self._ports[port]
+            mask = self._port_masks[port]
+        else:
+            mask = self._page_masks[page]
+        adj_address = address & mask
+        if adj_address + 3 > mask:
+            # The words wrap around the device or are in different devices
+            self.write(address, value >> 16)
+            self.write(address + 2, value)
+            return
+        self._count_write(device, adj_address, 4)
+        device.write_long(adj_address, value)
+
+
+class TracingMemory(Memory):
+    """
+    Memory that prints every access while it is verbose.
+
+    ``Memory`` never checks for verbosity, so that the emulation is not slowed
+    down by tracing. This class is used instead if tracing is requested.
+
+    Parameters
+    ----------
+    program: str | None, optional
+        See ``Memory``.
+
+    display_device: None | megadrive.devices.display.Display, optional
+        See ``Memory``.
+
+    verbose: bool, optional
+        Whether memory accesses should be printed from the start. Default is
+        ``True``.
+
+    fail_on_invalid: bool, optional
+        See ``Memory``.
+
+    mapped_program: None | rpython.rlib.rmmap.MMap, optional
+        See ``Memory``.
+    """
+
+    # Only changes when the verbosity is switched
+    _immutable_fields_ = ["_verbose?"]
+
+    def __init__(self,
+                 program=None,
+                 display_device=None,
+                 verbose=True,
+                 fail_on_invalid=False,
+                 mapped_program=None):
+        Memory.__init__(self,
+                        program,
+                        display_device,
+                        fail_on_invalid=fail_on_invalid,
+                        mapped_program=mapped_program)
+        self._verbose = verbose
+
+    def is_verbose(self):
+        return self._verbose
+
+    def set_verbose(self, verbose):
+        self._verbose = bool(verbose)
+
+    def read(self, address):
+        if self._verbose:
+            print("### Mem: reading 0x%s" % int_utils.to_32x_string(address))
+
+        result = Memory.read(self, address)
+
+        if self._verbose:
+            print("### Mem: value 0x%s" % int_utils.to_32x_string(result))
+
+        return result
+
+    def write(self, address, value):
+        if self._verbose:
+            print("### Mem: writing 0x%s to 0x%s"
+                  % (int_utils.to_32x_string(value),
+                     int_utils.to_32x_string(address)))
+        return Memory.write(self, address, value)
+
+    def read_byte(self, address):
+        if self._verbose:
+            print("### Mem: reading byte 0x%s"
+                  % int_utils.to_32x_string(address))
+
+        result = Memory.read_byte(self, address)
+
+        if self._verbose:
+            print("### Mem: value 0x%s" % int_utils.to_32x_string(result))
+
+        return result
+
+    def write_byte(self, address, value):
+        if self._verbose:
+            print("### Mem: writing byte 0x%s to 0x%s"
+                  % (int_utils.to_32x_string(value),
+                     int_utils.to_32x_string(address)))
+        Memory.write_byte(self, address, value)
+
+    def read_long(self, address):
+        if self._verbose:
+            print("### Mem: reading long 0x%s"
+                  % int_utils.to_32x_string(address))
+
+        result = Memory.read_long(self, address)
+
+        if self._verbose:
+            print("### Mem: value 0x%s" % int_utils.to_32x_string(result))
+
+        return result
+
+    def write_long(self, address, value):
+        if self._verbose:
+            print("### Mem: writing long 0x%s to 0x%s"
+                  % (int_utils.to_32x_string(value),
+                     int_utils.to_32x_string(address)))
+        Memory.write_long(self, address, value)
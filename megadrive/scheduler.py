@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Schedules the events that interrupt the execution of the CPUs.
+
+Every event has a kind and the cycle of the 68k at which it happens. The
+events are kept in a binary heap, so the CPU can always run up to the next
+one without checking anything else in between.
+
+Created on Sun Oct 18 21:02:16 2026
+
+@author: Simon Romanowski
+"""
+
+# --- Kinds of events ---
+# Events at the same cycle are handled in the order of their kinds
+
+# Save the state of the console, before anything else happens at that cycle
+EVENT_SAVE_STATE = 0
+# Stop the emulation
+EVENT_QUIT = 1
+# Start tracing after the silent cycles
+EVENT_VERBOSE = 2
+# Draw the next line, which may cause HBLANK and VBLANK
+EVENT_LINE = 3
+
+# Bits of an entry in the heap that hold the kind of event
+_KIND_BITS = 4
+_KIND_MASK = (1 << _KIND_BITS) - 1
+
+
+class Scheduler(object):
+    """Queue of events, ordered by the cycle they happen at."""
+
+    def __init__(self):
+        # Binary heap, each entry is the cycle shifted above the kind
+        self._heap = []
+
+    def schedule(self, cycle, kind):
+        """
+        Add an event.
+
+        Parameters
+        ----------
+        cycle: int
+            The cycle of the 68k at which the event happens.
+
+        kind: int
+            One of the ``EVENT_*`` constants.
+        """
+        heap = self._heap
+        heap.append((cycle << _KIND_BITS) | kind)
+        # Move the new entry up until its parent is not later
+        index = len(heap) - 1
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[index] = heap[parent]
+            index = parent
+        heap[index] = entry
+
+    def get_next_cycle(self):
+        """
+        Get the cycle of the next event.
+
+        There must be at least one event.
+        """
+        return self._heap[0] >> _KIND_BITS
+
+    def pop(self):
+        """
+        Remove the next event and return its kind.
+
+        There must be at least one event.
+        """
+        heap = self._heap
+        first = heap[0]
+        last = heap.pop()
+        if heap:
+            # Move the last entry down from the top until no child is earlier
+            size = len(heap)
+            index = 0
+            while True:
+                child = (index << 1) + 1
+                if child >= size:
+                    break
+                if child + 1 < size and heap[child + 1] < heap[child]:
+                    child += 1
+                if last <= heap[child]:
+                    break
+                heap[index] = heap[child]
+                index = child
+            heap[index] = last
+        return first & _KIND_MASK
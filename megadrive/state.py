@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""
+Saves and restores the state of the whole console.
+
+A state is a binary blob in little-endian byte order. It starts with a header
+of the magic bytes and the format version, followed by sections. Each section
+has a tag of 4 characters and the length of its content, so sections can be
+found without understanding the ones before them. Unknown sections are
+ignored, missing ones cause a ``StateError``.
+
+The state contains everything that influences the emulation: the registers
+of the 68k, the RAMs, the I/O and Z80 registers and the VDP with its
+registers and memories. Caches like the decoded instructions, tiles and
+sprites are rebuilt after loading. The program is not part of the state, but
+a checksum makes sure that a state is only loaded for the same program.
+
+Created on Sun Oct 18 22:48:37 2026
+
+@author: Simon Romanowski
+"""
+
+import os
+
+from utils.rpython_utils import StateError
+
+try:
+    from rpython.rlib.longlong2float import float2longlong, longlong2float
+except ImportError:
+    import struct
+
+    def float2longlong(value):
+        return struct.unpack("<q", struct.pack("<d", value))[0]
+
+    def longlong2float(value):
+        return struct.unpack("<d", struct.pack("<q", value))[0]
+
+try:
+    from rpython.rlib.rarithmetic import intmask
+except ImportError:
+    def intmask(value):
+        value &= 0xFFFFFFFFFFFFFFFF
+        if value & 0x8000000000000000:
+            value -= 0x10000000000000000
+        return value
+
+try:
+    from rpython.rlib.rstring import StringBuilder
+except ImportError:
+    class StringBuilder(object):
+
+        def __init__(self):
+            self._parts = []
+
+        def append(self, s):
+            self._parts.append(s)
+
+        def build(self):
+            return "".join(self._parts)
+
+
+# First bytes of every state
+MAGIC = "RVLS"
+
+# Increased whenever the content of a section changes
+VERSION = 2
+
+# --- Tags of the sections ---
+# Size and checksum of the program
+SECTION_ROM = "ROM "
+# Timing of the main loop
+SECTION_TIME = "TIME"
+# 68k registers
+SECTION_M68K = "M68K"
+# RAMs, I/O and Z80 registers
+SECTION_MEMORY = "MEM "
+# VDP registers and memories
+SECTION_VDP = "VDP "
+
+# Length of the section tags
+_TAG_LENGTH = 4
+
+
+class StateWriter(object):
+    """Collects the sections of a state."""
+
+    def __init__(self):
+        self._data = StringBuilder()
+        self._data.append(MAGIC)
+        self._section = None
+        self._section_tag = ""
+        self._write_raw_u16(self._data, VERSION)
+
+    def begin_section(self, tag):
+        """
+        Start a new section, all values are written to it until
+        ``end_section``.
+        """
+        self._section = StringBuilder()
+        self._section_tag = tag
+
+    def end_section(self):
+        """Finish the current section."""
+        content = self._section.build()
+        self._data.append(self._section_tag)
+        self._write_raw_u32(self._data, len(content))
+        self._data.append(content)
+        self._section = None
+
+    def get_data(self):
+        """Get the whole state."""
+        return self._data.build()
+
+    def write_u8(self, value):
+        self._section.append(chr(value & 0xFF))
+
+    def write_bool(self, value):
+        self.write_u8(1 if value else 0)
+
+    def write_u16(self, value):
+        self._write_raw_u16(self._section, value)
+
+    def write_u32(self, value):
+        self._write_raw_u32(self._section, value)
+
+    def write_i64(self, value):
+        for shift in range(0, 64, 8):
+            self._section.append(chr((value >> shift) & 0xFF))
+
+    def write_float(self, value):
+        self.write_i64(float2longlong(value))
+
+    def _write_raw_u16(self, builder, value):
+        builder.append(chr(value & 0xFF))
+        builder.append(chr((value >> 8) & 0xFF))
+
+    def _write_raw_u32(self, builder, value):
+        for shift in range(0, 32, 8):
+            builder.append(chr((value >> shift) & 0xFF))
+
+
+class StateReader(object):
+    """
+    Reads the sections of a state.
+
+    Parameters
+    ----------
+    data: str
+        The whole state, as created by ``StateWriter``.
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._position = 0
+        self._end = len(data)
+        self._section_tag = ""
+        if data[:len(MAGIC)] != MAGIC:
+            raise StateError("Not a state")
+        self._position = len(MAGIC)
+        version = self.read_u16()
+        if version != VERSION:
+            raise StateError("Unsupported state version %d" % version)
+        # Start and end of each section by its tag
+        self._section_starts = {}
+        self._section_ends = {}
+        while self._position < len(data):
+            tag = self._read_string(_TAG_LENGTH)
+            length = self.read_u32()
+            start = self._position
+            if start + length > len(data):
+                raise StateError("Section '%s' is truncated" % tag)
+            self._section_starts[tag] = start
+            self._section_ends[tag] = start + length
+            self._position = start + length
+
+    def begin_section(self, tag):
+        """Read the values from the section with the given tag."""
+        if tag not in self._section_starts:
+            raise StateError("Section '%s' is missing" % tag)
+        self._position = self._section_starts[tag]
+        self._end = self._section_ends[tag]
+        self._section_tag = tag
+
+    def end_section(self):
+        """Make sure that the whole section has been read."""
+        if self._position != self._end:
+            raise StateError("Section '%s' has %d unknown bytes"
+                             % (self._section_tag, self._end - self._position))
+
+    def read_u8(self):
+        if self._position >= self._end:
+            raise StateError("Section '%s' ends early" % self._section_tag)
+        value = ord(self._data[self._position])
+        self._position += 1
+        return value
+
+    def read_bool(self):
+        return self.read_u8() != 0
+
+    def read_u16(self):
+        return self.read_u8() | (self.read_u8() << 8)
+
+    def read_u32(self):
+        value = 0
+        for shift in range(0, 32, 8):
+            value |= self.read_u8() << shift
+        return value
+
+    def read_i64(self):
+        value = 0
+        for shift in range(0, 64, 8):
+            value |= self.read_u8() << shift
+        # Untranslated, the value is not limited to 64 bits on its own
+        return intmask(value)
+
+    def read_float(self):
+        return longlong2float(self.read_i64())
+
+    def _read_string(self, length):
+        if self._position + length > self._end:
+            raise StateError("State ends early")
+        start = self._position
+        assert start >= 0
+        self._position += length
+        return self._data[start:start + length]
+
+
+def save_state(cpu68k, mem, display_device, next_line_cycle):
+    """
+    Save the state of the console.
+
+    Parameters
+    ----------
+    cpu68k: m68k.cpu.Cpu
+        The 68k to save.
+
+    mem: megadrive.memory.Memory
+        The memory of the 68k, including the program whose checksum is saved.
+
+    display_device: megadrive.devices.display.Display
+        The VDP to save.
+
+    next_line_cycle: float
+        The cycle of the 68k at which the next line is drawn.
+
+    Returns
+    -------
+    data: str
+        The state, to be restored with ``load_state``.
+    """
+    writer = StateWriter()
+
+    rom = mem.get_rom()
+    writer.begin_section(SECTION_ROM)
+    writer.write_u32(rom.get_size())
+    writer.write_u32(rom.get_checksum())
+    writer.end_section()
+
+    writer.begin_section(SECTION_TIME)
+    writer.write_float(next_line_cycle)
+    writer.end_section()
+
+    writer.begin_section(SECTION_M68K)
+    cpu68k.save_state(writer)
+    writer.end_section()
+
+    writer.begin_section(SECTION_MEMORY)
+    mem.save_state(writer)
+    writer.end_section()
+
+    writer.begin_section(SECTION_VDP)
+    display_device.save_state(writer)
+    writer.end_section()
+
+    return writer.get_data()
+
+
+def load_state(data, cpu68k, mem, display_device):
+    """
+    Restore a state that was created by ``save_state``.
+
+    The state must have been saved for the same program. If it cannot be
+    loaded, a ``StateError`` is raised and the console keeps its current
+    state.
+
+    Returns
+    -------
+    next_line_cycle: float
+        The cycle of the 68k at which the next line is drawn.
+    """
+    reader = StateReader(data)
+
+    rom = mem.get_rom()
+    reader.begin_section(SECTION_ROM)
+    if reader.read_u32() != rom.get_size() \
+            or reader.read_u32() != rom.get_checksum():
+        raise StateError("The state was saved for a different program")
+    reader.end_section()
+
+    reader.begin_section(SECTION_TIME)
+    next_line_cycle = reader.read_float()
+    reader.end_section()
+
+    # Make sure that all sections exist before changing anything
+    for tag in [SECTION_M68K, SECTION_MEMORY, SECTION_VDP]:
+        reader.begin_section(tag)
+
+    # The content of a section is only checked while it is loaded, after the
+    # sections before it have been applied. The current state is restored if
+    # one of them is invalid.
+    backup = save_state(cpu68k, mem, display_device, next_line_cycle)
+    try:
+        _load_sections(reader, cpu68k, mem, display_device)
+    except StateError:
+        _load_sections(StateReader(backup), cpu68k, mem, display_device)
+        raise
+
+    return next_line_cycle
+
+
+def _load_sections(reader, cpu68k, mem, display_device):
+    """Load the sections of the 68k, the memory and the VDP."""
+    reader.begin_section(SECTION_M68K)
+    cpu68k.load_state(reader)
+    reader.end_section()
+
+    reader.begin_section(SECTION_MEMORY)
+    mem.load_state(reader)
+    reader.end_section()
+
+    reader.begin_section(SECTION_VDP)
+    display_device.load_state(reader)
+    reader.end_section()
+
+
+def write_file(file_name, data):
+    """Write a state to the given file, replacing its content."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    if os.name == "nt":
+        flags |= os.O_BINARY
+    fp = os.open(file_name, flags, 0o666)
+    try:
+        written = 0
+        while written < len(data):
+            written += os.write(fp, data[written:])
+    finally:
+        os.close(fp)
+
+
+def read_file(file_name):
+    """Read a state from the given file."""
+    flags = os.O_RDONLY
+    if os.name == "nt":
+        flags |= os.O_BINARY
+    fp = os.open(file_name, flags, 0o777)
+    try:
+        chunks = []
+        while True:
+            read = os.read(fp, 64 * 1024)
+            if not read:
+                break
+            chunks.append(read)
+        return "".join(chunks)
+    finally:
+        os.close(fp)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Test the cache of pre-decoded instructions.
+
+Created on Sun Oct 18 14:52:19 2026
+
+@author: Simon Romanowski
+"""
+
+import unittest
+
+import m68k.block_cache as block_cache
+import m68k.cpu as cpu
+import m68k.decoder as decoder
+import megadrive.memory as mem
+
+
+def _init_cpu(program, pc):
+    m = mem.Memory(program)
+    c = cpu.Cpu(m)
+    c.set_pc(pc)
+    return c, m
+
+
+class TestBlock(unittest.TestCase):
+
+    def test_closed_by_branch(self):
+        block = block_cache.Block(0x200)
+        block.append(0x200, 0x7001, decoder.DECODE_TABLE[0x7001])
+        assert not block.closed
+        block.append(0x202, 0x60FC, decoder.DECODE_TABLE[0x60FC])
+        assert block.closed
+        assert block.pcs == [0x200, 0x202]
+        assert block.op_codes == [0x7001, 0x60FC]
+
+    def test_cacheable(self):
+        assert block_cache.is_cacheable(0x000200)
+        assert block_cache.is_cacheable(0x3FFFFE)
+        assert block_cache.is_cacheable(0xFF0000)
+        assert block_cache.is_cacheable(0xFFFFFE)
+        assert not block_cache.is_cacheable(0xA00000)
+        assert not block_cache.is_cacheable(0xC00000)
+
+
+class TestBlockCache(unittest.TestCase):
+
+    def test_rom_loop(self):
+        # 0x0: MOVEQ #1, D0
+        # 0x2: ADDQ.L #1, D1
+        # 0x4: BRA.S 0x0
+        program = "\x70\x01\x52\x81\x60\xFA"
+        c, _ = _init_cpu(program, 0)
+        for _ in range(9):
+            c.step()
+        assert c.get_d(1) == 3, "D1 was 0x%X" % c.get_d(1)
+        block = c._block_cache.get(0)
+        assert block.pcs == [0, 2, 4]
+        assert block.closed
+
+    def test_ram_invalidation(self):
+        c, m = _init_cpu(None, 0xFF0000)
+        # MOVEQ #1, D0
+        m.write(0xFF0000, 0x7001)
+        # BRA.S 0xFF0000
+        m.write(0xFF0002, 0x60FC)
+        c.step()
+        c.step()
+        assert c.get_d(0) == 1
+        assert c.get_pc() == 0xFF0000
+        # MOVEQ #2, D0
+        m.write(0xFF0000, 0x7002)
+        c.step()
+        assert c.get_d(0) == 2, "Executed stale instruction"
+
+    def test_ram_write_other_page(self):
+        c, m = _init_cpu(None, 0xFF0000)
+        m.write(0xFF0000, 0x7001)
+        m.write(0xFF0002, 0x60FC)
+        c.step()
+        c.step()
+        block = c._block_cache.get(0xFF0000)
+        m.write(0xFF1000, 0x1234)
+        assert block.valid
+        assert c._block_cache.get(0xFF0000) is block
+        m.write(0xFF0002, 0x60FC)
+        assert not block.valid
+        assert c._block_cache.get(0xFF0000) is not block
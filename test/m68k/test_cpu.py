@@ -7,6 +7,8 @@ Created on Sat Sep 16 20:24:06 2023
 @author: Simon Romanowski
 """
 
+import StringIO
+import sys
 import unittest
 
 import m68k.cpu as cpu
@@ -27,6 +29,143 @@ class TestCpu(unittest.TestCase):
                     t1=0, s=1, i=0,
                     usp=0, ssp=0x1234)
 
+    def test_stack_pointer_swap(self):
+        m = mem.Memory()
+        c = cpu.Cpu(m)
+        c.set_ssp(0x1000)
+        c.set_usp(0x2000)
+        assert c.get_a(7) == 0x1000
+        c.set_sr(0x20, s=False)
+        assert c.get_a(7) == 0x2000
+        c.set_a(7, 0x2004)
+        assert c.get_usp() == 0x2004
+        assert c.get_ssp() == 0x1000
+        c.set_sr(0x20, s=True)
+        assert c.get_a(7) == 0x1000
+        assert c.get_usp() == 0x2004
+
+    def test_register_sizes(self):
+        m = mem.Memory()
+        c = cpu.Cpu(m)
+        c.set_d(3, 0x12345678)
+        c.set_d(3, 0xABCDEF, 1)
+        assert c.get_d(3) == 0x1234CDEF
+        c.set_d(3, 0x1FF, 0)
+        assert c.get_d(3) == 0x1234CDFF
+        assert c.get_d(3, 1) == 0xCDFF
+        assert c.get_d(3, 0) == 0xFF
+        c.set_a(2, -1)
+        assert c.get_a(2) == 0xFFFFFFFF
+
+    def test_lazy_ccr_keeps_x(self):
+        m = mem.Memory()
+        c = cpu.Cpu(m)
+        # 0xFF + 0x01 as byte: carry and zero
+        c.set_ccr_add(0xFF, 0x01, 0x100, 0)
+        # Logical operations and comparisons do not change X
+        c.set_ccr_logic(0x80, 0)
+        c.set_ccr_sub(0x10, 0x10, 0, 0, False)
+        assert c.get_ccr() == 0b10100, "CCR was 0b{:05b}".format(c.get_ccr())
+
+    def test_lazy_ccr_partial_set(self):
+        m = mem.Memory()
+        c = cpu.Cpu(m)
+        # 0x00 - 0x01 as word: borrow and negative
+        c.set_ccr_sub(0, 1, 0xFFFF, 1, True)
+        c.set_ccr(0b00010, v=True)
+        assert c.get_ccr() == 0b11011, "CCR was 0b{:05b}".format(c.get_ccr())
+        assert c.get_sr_full() & 0b11111 == 0b11011
+
+    def test_run_until_cycle(self):
+        # MOVEQ #1, D0 (4 cycles)
+        # ADDQ.L #1, D1 (8 cycles)
+        # BRA.S 0x0 (10 cycles)
+        c = cpu.Cpu(mem.Memory("\x70\x01\x52\x81\x60\xFA"))
+        c.set_pc(0)
+        assert not c.run(30)
+        # The last instruction is finished after passing the deadline
+        assert c.get_cycle() == 34, "Cycle was %d" % c.get_cycle()
+        assert c.get_d(1) == 2
+        assert c.get_pc() == 4
+
+    def test_run_stopped(self):
+        # STOP #0x2700
+        c = cpu.Cpu(mem.Memory("\x4E\x72\x27\x00"))
+        c.set_pc(0)
+        assert c.run(100)
+        assert c.get_cycle() < 100
+        # Waiting for an interrupt skips to the deadline
+        assert c.run(200)
+        assert c.get_cycle() == 200
+        assert c.get_pc() == 4
+
+    def test_run_skip_idle_loop(self):
+        # TST.W 0xFF0000 (16 cycles)
+        # BEQ.S 0x0 (10 cycles)
+        program = "\x4A\x79\x00\xFF\x00\x00\x67\xF8"
+        c_skip = cpu.Cpu(mem.Memory(program))
+        c_skip.set_pc(0)
+        c_skip.set_skip_idle_loops(True)
+        c_step = cpu.Cpu(mem.Memory(program))
+        c_step.set_pc(0)
+        for until_cycle in (1000, 1013, 5000):
+            assert not c_skip.run(until_cycle)
+            assert not c_step.run(until_cycle)
+            # Skipping must not be noticeable
+            assert c_skip.get_cycle() == c_step.get_cycle()
+            assert c_skip.get_pc() == c_step.get_pc()
+            assert c_skip.get_ccr() == c_step.get_ccr()
+        assert c_skip.get_skipped_cycles() > 0
+        assert c_step.get_skipped_cycles() == 0
+
+    def test_run_skip_idle_loop_changing(self):
+        # ADDQ.L #1, D1 (8 cycles)
+        # BRA.S 0x0 (10 cycles)
+        c = cpu.Cpu(mem.Memory("\x52\x81\x60\xFC"))
+        c.set_pc(0)
+        c.set_skip_idle_loops(True)
+        assert not c.run(180)
+        assert c.get_d(1) == 10
+        assert c.get_skipped_cycles() == 0
+
+    def test_fetch_next(self):
+        m = mem.Memory("\x12\x34\x56")
+        c = cpu.Cpu(m)
+        # Cartridge ROM, the end of the image reads as 0xFF bytes
+        c.set_pc(0)
+        assert c.fetch_next() == 0x1234
+        assert c.fetch_next() == 0x56FF
+        assert c.fetch_next() == 0xFFFF
+        assert c.get_pc() == 6
+        # 68k RAM, only the lower 24 bits of the PC are an address
+        m.write(0xFF0010, 0xABCD)
+        c.set_pc(0xFFFF0010)
+        assert c.fetch_next() == 0xABCD
+        assert c.get_pc() == 0xFFFF0012
+
+    def test_tracing_cpu(self):
+        # MOVEQ #1, D0
+        # MOVEQ #2, D1
+        m = mem.TracingMemory("\x70\x01\x72\x02", verbose=False)
+        c = cpu.TracingCpu(m, verbose=False)
+        c.set_pc(0)
+        stdout = sys.stdout
+        sys.stdout = StringIO.StringIO()
+        try:
+            c.step()
+            silent_output = sys.stdout.getvalue()
+            c.set_verbose(True)
+            m.set_verbose(True)
+            c.step()
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        assert silent_output == ""
+        assert "### Executing opcode: 0x7202" in output
+        assert "### Mem: reading 0x00000002" in output
+        assert c.get_d(0) == 1
+        assert c.get_d(1) == 2
+
     def test_str_0(self):
         expected = """cycle = 0
 ------------------------------------
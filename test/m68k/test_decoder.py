@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Test the precomputed decoding of operation words.
+
+Created on Sun Oct 18 11:20:47 2026
+
+@author: Simon Romanowski
+"""
+
+import unittest
+
+import m68k.decoder as decoder
+
+
+def _fields(entry):
+    return (
+        entry & 0xFF,
+        (entry >> 8) & 0xFF,
+        (entry >> 16) & 0xFF,
+        (entry >> 24) & 0xFF,
+        (entry >> 32) & 0xFF,
+        (entry >> 40) & 0xFF,
+    )
+
+
+class TestDecodeTable(unittest.TestCase):
+
+    def _test(self, op_code, expected):
+        result = _fields(decoder.DECODE_TABLE[op_code])
+        assert result == expected, (
+            "Expected 0x{:04X} to decode to {}, but was {}.").format(
+                op_code, expected, result)
+
+    def test_size(self):
+        assert len(decoder.DECODE_TABLE) == 0x10000
+        assert len(decoder.HANDLERS) == len(decoder.HANDLER_NAMES)
+
+    def test_nop(self):
+        self._test(0x4E71, (decoder.NOP, 0, 0, 0, 0, 0))
+
+    def test_ori_to_ccr(self):
+        self._test(0x003C, (decoder.ORI_TO_CCR, 0, 0, 0, 0, 0))
+
+    def test_move_long(self):
+        # MOVE.L D1, (A2)
+        self._test(0x2481, (decoder.MOVE, 2, 2, 0, 1, 2))
+
+    def test_movea_word(self):
+        # MOVEA.W A3, A4
+        self._test(0x384B, (decoder.MOVEA, 4, 1, 3, 3, 0))
+
+    def test_moveq(self):
+        # MOVEQ #-1, D5
+        self._test(0x7AFF, (decoder.MOVEQ, 5, 0xFF, 0, 0, 0))
+
+    def test_bcc(self):
+        # BNE.S *+4
+        self._test(0x6602, (decoder.BCC, 6, 2, 0, 0, 0))
+
+    def test_dbcc(self):
+        # DBF D3
+        self._test(0x51CB, (decoder.DBCC, 3, 1, 0, 0, 0))
+
+    def test_add(self):
+        # ADD.W D2, (A0)+
+        self._test(0xD558, (decoder.ADD, 2, 1, 1, 3, 0))
+
+    def test_unknown(self):
+        for op_code in [0xA000, 0xAFFF, 0xF000, 0xFFFF, 0x4AFB, 0x7100]:
+            self._test(op_code, (decoder.UNKNOWN, 0, 0, 0, 0, 0))
+
+    def test_handler_names(self):
+        assert decoder.HANDLER_NAMES[decoder.MOVE_TO_SR] == "MOVE to SR"
+        assert decoder.HANDLER_NAMES[decoder.DBCC] == "DBcc"
@@ -9,7 +9,14 @@ Created on Wed Sep 20 14:29:32 2023
 
 import unittest
 
+import m68k.cpu as cpu
 import m68k.effective_address as ea
+import megadrive.memory as mem
+from m68k.constants import (
+    OP_SIZE_BYTE, OP_SIZE_WORD, OP_SIZE_LONG,
+    EA_MODE_REG_A, EA_MODE_A_POSTINC, EA_MODE_A_PREDEC, EA_MODE_OTHER,
+    EA_REGISTER_IMMEDIATE,
+)
 
 
 class TestSplit(unittest.TestCase):
@@ -250,5 +257,54 @@ class TestCategories(unittest.TestCase):
                     ea_mode, ea_register)
 
 
+class TestOperand(unittest.TestCase):
+
+    def setUp(self):
+        self.cpu = cpu.Cpu(mem.Memory(None))
+        self.cpu.set_pc(0xFF0000)
+        self.operand = ea.Operand()
+
+    def test_register(self):
+        self.cpu.set_a(3, 0x12345678)
+        cycles = ea.resolve(
+            self.cpu, self.operand, EA_MODE_REG_A, 3, OP_SIZE_WORD)
+        assert cycles == 0
+        assert ea.read(self.cpu, self.operand) == 0x5678
+        # Writing to an address register always sets all 32 bits
+        ea.write(self.cpu, self.operand, 0x1)
+        assert self.cpu.get_a(3) == 0x1
+
+    def test_immediate(self):
+        self.cpu.mem.write(0xFF0000, 0x1234)
+        self.cpu.mem.write(0xFF0002, 0x5678)
+        cycles = ea.resolve(
+            self.cpu, self.operand,
+            EA_MODE_OTHER, EA_REGISTER_IMMEDIATE, OP_SIZE_LONG)
+        assert cycles == 8
+        assert self.cpu.get_pc() == 0xFF0004
+        assert ea.read(self.cpu, self.operand) == 0x12345678
+
+    def test_memory_postinc(self):
+        self.cpu.set_a(0, 0xFF1000)
+        self.cpu.mem.write(0xFF1000, 0xABCD)
+        ea.resolve(
+            self.cpu, self.operand, EA_MODE_A_POSTINC, 0, OP_SIZE_BYTE)
+        assert self.cpu.get_a(0) == 0xFF1001
+        assert ea.read(self.cpu, self.operand) == 0xAB
+        ea.write(self.cpu, self.operand, 0x12)
+        assert self.cpu.mem.read(0xFF1000) == 0x12CD
+
+    def test_memory_predec_long(self):
+        self.cpu.set_a(1, 0xFF1004)
+        cycles = ea.resolve(
+            self.cpu, self.operand, EA_MODE_A_PREDEC, 1, OP_SIZE_LONG)
+        assert cycles == 10
+        assert self.cpu.get_a(1) == 0xFF1000
+        ea.write(self.cpu, self.operand, 0x12345678)
+        assert self.cpu.mem.read(0xFF1000) == 0x1234
+        assert self.cpu.mem.read(0xFF1002) == 0x5678
+        assert ea.read(self.cpu, self.operand) == 0x12345678
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Test the megadrive.devices.cram module.
+
+Created on Sun Oct 18 19:47:30 2026
+
+@author: Simon Romanowski
+"""
+
+import unittest
+
+from megadrive.devices import cram
+
+
+class TestCram(unittest.TestCase):
+
+    def test_init(self):
+        c = cram.Cram()
+        assert c.get_colors() == [0xFF] * cram.COLOR_COUNT
+        assert c.get_shadow_colors() == [0xFF] * cram.COLOR_COUNT
+        assert c.get_highlight_colors() == [0x808080FF] * cram.COLOR_COUNT
+
+    def test_write(self):
+        c = cram.Cram()
+        # Blue 7, green 2, red 1
+        c.write(0x7E, 0x0E42)
+        assert c.get_colors()[63] == 0x3457FFFF
+        assert c.get_shadow_colors()[63] == 0x1A2B7FFF
+        assert c.get_highlight_colors()[63] == 0x9AABFFFF
+        # Only the red component of color 1
+        c.write_byte(0x03, 0x0E)
+        assert c.get_colors()[1] == 0xFF0000FF
+        c.write_long(0x04, 0x0E000002)
+        assert c.get_colors()[2] == 0x0000FFFF
+        assert c.get_colors()[3] == 0x340000FF
+        c.fill_bytes(0x7C, 4, 0)
+        assert c.get_colors()[62:] == [0xFF, 0xFF]
+
+
+if __name__ == "__main__":
+    unittest.main()
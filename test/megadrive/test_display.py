@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Test the megadrive.devices.display module.
+
+Created on Sun Oct 18 23:52:37 2026
+
+@author: Simon Romanowski
+"""
+
+import unittest
+
+import m68k.cpu as cpu
+import megadrive.memory as mem
+from megadrive.devices import display
+
+
+def _machine(program=None):
+    """Create a display that is connected to the 68k and its memory."""
+    d = display.Display()
+    m = mem.Memory(program, d)
+    c = cpu.Cpu(m)
+    d.set_m68k_ram(m)
+    d.set_m68k_cpu(c)
+    # Only the counters matter
+    d.set_frameskip(-1)
+    return d, m, c
+
+
+def _set_register(m, register_index, value):
+    m.write(0xC00004, 0x8000 | (register_index << 8) | value)
+
+
+def _dma(m, source_address, length, increment, command, dma_type=0):
+    """
+    Start a DMA of ``length`` words with the given command for the control
+    port.
+    """
+    # Enable DMA
+    _set_register(m, 1, 0x14)
+    _set_register(m, 0xF, increment)
+    _set_register(m, 0x13, length & 0xFF)
+    _set_register(m, 0x14, (length >> 8) & 0xFF)
+    _set_register(m, 0x15, (source_address >> 1) & 0xFF)
+    _set_register(m, 0x16, (source_address >> 9) & 0xFF)
+    _set_register(m, 0x17, (dma_type << 6) | ((source_address >> 17) & 0x7F))
+    m.write_long(0xC00004, command)
+
+
+def _vram_copy(m, source_address, length, increment, command):
+    """
+    Start a copy of ``length`` bytes within VRAM with the given command for
+    the control port.
+    """
+    # Enable DMA
+    _set_register(m, 1, 0x14)
+    _set_register(m, 0xF, increment)
+    _set_register(m, 0x13, length & 0xFF)
+    _set_register(m, 0x14, (length >> 8) & 0xFF)
+    # The source is a byte address
+    _set_register(m, 0x15, source_address & 0xFF)
+    _set_register(m, 0x16, (source_address >> 8) & 0xFF)
+    _set_register(m, 0x17, 0xC0)
+    m.write_long(0xC00004, command)
+
+
+def _vram_write(address):
+    return 0x40000080 | ((address & 0x3FFF) << 16) | (address >> 14)
+
+
+def _cram_write(address):
+    return 0xC0000080 | (address << 16)
+
+
+def _vsram_write(address):
+    return 0x40000090 | (address << 16)
+
+
+def _finish_frames(d, amount):
+    """
+    Draw the lines of ``amount`` frames and return whether each of them was
+    rendered.
+    """
+    rendered = []
+    for _ in range(amount):
+        while not d.draw_line()[3]:
+            pass
+        rendered.append(d.is_frame_rendered())
+    return rendered
+
+
+def _vram_bytes(d, start, amount):
+    return [d._vram.read_byte(address) for address in range(start,
+                                                            start + amount)]
+
+
+class TestDisplay(unittest.TestCase):
+
+    def test_dma_from_ram(self):
+        d, m, _ = _machine()
+        for offset in range(8):
+            m.write_byte(0xFF0010 + offset, 0x11 * (offset + 1))
+        _dma(m, 0xFF0010, 4, 2, _vram_write(0x100))
+        assert _vram_bytes(d, 0xFE, 12) == [
+            0, 0, 0x11, 0x22, 0x33, 0x44, 0x55, 0x66, 0x77, 0x88, 0, 0]
+        # Both addresses point past the transferred data
+        assert d._address == 0x108
+        assert d._dma_address == 0xFF0018
+
+    def test_dma_increment(self):
+        d, m, _ = _machine()
+        for offset in range(6):
+            m.write_byte(0xFF0000 + offset, offset + 1)
+        # Every word is written on its own
+        _dma(m, 0xFF0000, 3, 4, _vram_write(0x200))
+        assert _vram_bytes(d, 0x200, 12) == [
+            1, 2, 0, 0, 3, 4, 0, 0, 5, 6, 0, 0]
+        assert d._address == 0x20C
+        # Odd target addresses write the word at the even address
+        _dma(m, 0xFF0000, 2, 2, _vram_write(0x301))
+        assert _vram_bytes(d, 0x300, 5) == [1, 2, 3, 4, 0]
+        assert d._address == 0x305
+
+    def test_dma_from_rom(self):
+        program = "".join(chr(value) for value in range(10))
+        d, m, _ = _machine(program)
+        # The last word is beyond the end of the program
+        _dma(m, 4, 4, 2, _vram_write(0))
+        assert _vram_bytes(d, 0, 8) == [4, 5, 6, 7, 8, 9, 0xFF, 0xFF]
+
+    def test_dma_from_other_devices(self):
+        d, m, _ = _machine()
+        # Pages with several devices are read through the memory
+        _dma(m, 0xA10000, 1, 2, _vram_write(0))
+        assert _vram_bytes(d, 0, 2) == [0, 0xA0]
+        # Z80 RAM wraps around within 8KB
+        m.write(0xA01FFE, 0x1234)
+        m.write(0xA00000, 0x5678)
+        _dma(m, 0xA01FFE, 2, 2, _vram_write(0x10))
+        assert _vram_bytes(d, 0x10, 4) == [0x12, 0x34, 0x56, 0x78]
+
+    def test_dma_source_wraps(self):
+        # 128KB with another word after them
+        program = "\x01\x02" + "\x00" * 0x1FFFC + "\x03\x04\x05\x06"
+        d, m, _ = _machine(program)
+        # The source wraps around within 128KB
+        _dma(m, 0x1FFFE, 2, 2, _vram_write(0))
+        assert _vram_bytes(d, 0, 4) == [3, 4, 1, 2]
+        assert d._dma_address == 2
+
+    def test_dma_target_wraps(self):
+        d, m, _ = _machine()
+        for offset in range(8):
+            m.write_byte(0xFF0000 + offset, offset + 1)
+        _dma(m, 0xFF0000, 4, 2, _vram_write(0xFFFC))
+        assert _vram_bytes(d, 0xFFFC, 4) == [1, 2, 3, 4]
+        assert _vram_bytes(d, 0, 4) == [5, 6, 7, 8]
+        assert d._address == 4
+        # CRAM wraps around after 128 bytes
+        _dma(m, 0xFF0000, 4, 2, _cram_write(0x7C))
+        assert d._cram.read(0x7C) == 0x0102
+        assert d._cram.read(0x7E) == 0x0304
+        assert d._cram.read(0) == 0x0506
+        assert d._cram.read(2) == 0x0708
+        # The converted colors are updated as well
+        assert d._cram.get_colors()[0] == display.cram.to_rgba(0x0506)
+        # The address register itself does not wrap around
+        assert d._address == 0x84
+
+    def test_dma_vsram_end(self):
+        d, m, _ = _machine()
+        for offset in range(8):
+            m.write_byte(0xFF0000 + offset, offset + 1)
+        # Writes beyond the end of VSRAM are lost
+        _dma(m, 0xFF0000, 4, 2, _vsram_write(0x4C))
+        assert d._vsram.read(0x4C) == 0x0102
+        assert d._vsram.read(0x4E) == 0x0304
+        assert d._address == 0x54
+        # VSRAM wraps around like CRAM
+        _dma(m, 0xFF0004, 2, 2, _vsram_write(0x7E))
+        assert d._vsram.read(0) == 0x0708
+        assert d._address == 0x82
+
+    def test_vram_copy(self):
+        d, m, _ = _machine()
+        for offset in range(8):
+            d._vram.write_byte(0x20 + offset, offset + 1)
+        # The length counts bytes
+        _vram_copy(m, 0x20, 5, 1, _vram_write(0x40))
+        assert _vram_bytes(d, 0x40, 6) == [1, 2, 3, 4, 5, 0]
+        assert d._address == 0x45
+        assert d.get_dma_bytes() == 5
+        # The source registers are advanced by the length
+        assert d._dma_address == 0x25 << 1
+        # Overlapping ranges repeat the first byte
+        _vram_copy(m, 0x20, 4, 1, _vram_write(0x21))
+        assert _vram_bytes(d, 0x20, 6) == [1, 1, 1, 1, 1, 6]
+        # Other increments copy single bytes with that stride
+        _vram_copy(m, 0x26, 2, 2, _vram_write(0x60))
+        assert _vram_bytes(d, 0x60, 4) == [7, 0, 8, 0]
+        assert d._address == 0x64
+        # The source wraps around within VRAM
+        d._vram.write_byte(0xFFFF, 9)
+        d._vram.write_byte(0, 10)
+        _vram_copy(m, 0xFFFF, 2, 1, _vram_write(0x80))
+        assert _vram_bytes(d, 0x80, 2) == [9, 10]
+        assert d._dma_address == 1 << 1
+        # Copies do not stall the 68k
+        assert d._m68k_cpu.get_cycle() == 0
+
+    def test_dma_stall(self):
+        d, _, c = _machine()
+        m = d._m68k_ram
+        # 168 bytes at 167 bytes per line of 488 cycles
+        _dma(m, 0xFF0000, 84, 2, _vram_write(0))
+        assert c.get_cycle() == 490
+        # 205 bytes per line in 320 pixel mode
+        _set_register(m, 0xC, 0x81)
+        _dma(m, 0xFF0000, 84, 2, _vram_write(0))
+        assert c.get_cycle() == 490 + 399
+
+    def test_dma_bytes(self):
+        d, m, _ = _machine()
+        _dma(m, 0xFF0000, 4, 2, _vram_write(0))
+        # VRAM fill starts with the next write to the data port
+        _set_register(m, 0x13, 3)
+        _set_register(m, 0x14, 0)
+        _set_register(m, 0x17, 0x80)
+        m.write_long(0xC00004, _vram_write(0x100))
+        m.write(0xC00000, 0xAB00)
+        assert _vram_bytes(d, 0x102, 6) == [0xAB] * 6
+        assert d.get_dma_bytes() == 8 + 6
+        assert d.get_dma_bytes_last_frame() == 0
+        while not d.draw_line()[3]:
+            pass
+        assert d.get_dma_bytes_last_frame() == 8 + 6
+        while not d.draw_line()[3]:
+            pass
+        assert d.get_dma_bytes_last_frame() == 0
+        assert d.get_dma_bytes() == 8 + 6
+
+    def test_frameskip(self):
+        d, _, _ = _machine()
+        # Applies to the current frame, since none of its lines was drawn
+        d.set_frameskip(0)
+        assert _finish_frames(d, 2) == [True, True]
+        # One frame out of n + 1 is drawn
+        d.set_frameskip(2)
+        assert _finish_frames(d, 7) == [
+            True, False, False, True, False, False, True]
+
+    def test_frameskip_never(self):
+        d, _, _ = _machine()
+        assert _finish_frames(d, 3) == [False, False, False]
+        assert d._frame[0] == 0
+        d.set_frameskip(-5)
+        assert _finish_frames(d, 2) == [False, False]
+
+    def test_frameskip_during_frame(self):
+        d, _, _ = _machine()
+        d.draw_line()
+        # The current frame stays skipped, but the next one is drawn
+        d.set_frameskip(1)
+        assert _finish_frames(d, 4) == [False, True, False, True]
+        d.draw_line()
+        # Also when the last frame was drawn
+        d.set_frameskip(0)
+        assert _finish_frames(d, 2) == [False, True]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,9 +7,28 @@ Created on Sat Sep 16 00:50:09 2023
 @author: Simon Romanowski
 """
 
+import os
+import tempfile
 import unittest
 
 import megadrive.memory as mem
+from megadrive.devices import device
+
+
+class _PortDevice(device.Device):
+    """Remembers the last address it was accessed at."""
+
+    def __init__(self):
+        self.address = -1
+        self.value = -1
+
+    def read(self, address):
+        self.address = address
+        return 0x1234
+
+    def write(self, address, value):
+        self.address = address
+        self.value = value
 
 
 class TestMemory(unittest.TestCase):
@@ -126,6 +145,120 @@ class TestMemory(unittest.TestCase):
                          value,
                          m.read(address + 1) if address < 0xFFFFFF else 0)
 
+    def test_side_effect_count(self):
+        m = mem.Memory("\x00\x01")
+        m.read(0)
+        m.read(0xFF0000)
+        assert m.get_side_effect_count() == 0
+        m.write(0xFF0000, 1)
+        assert m.get_side_effect_count() == 1
+        # IO registers
+        m.read(0xA10002)
+        assert m.get_side_effect_count() == 2
+
+    def test_pages(self):
+        m = mem.Memory()
+        for page in range(256):
+            for offset in (0, 0x1F, 0x1100, 0x4002, 0xFFFF):
+                address = (page << 16) | offset
+                device, adj_address = m._get_device(address)
+                if m._pages[page] is not None:
+                    assert m._pages[page] is device, hex(address)
+                    assert address & m._page_masks[page] == adj_address, \
+                        hex(address)
+
+    def test_page_device(self):
+        m = mem.Memory()
+        assert m.get_page_device(0xFF1234) is m._ram
+        assert m.get_page_mask(0xFF1234) == 0xFFFF
+        assert m.get_page_device(0x3F0000) is m.get_rom()
+        assert m.get_page_device(0xC00004) is None
+
+    def test_io_ports(self):
+        m = mem.Memory()
+        m.set_buttons(1, False, True, False, False, True, False, False, False)
+        # Player 1 data port, reporting A and start
+        assert m.read(0xA10002) == 0x21
+        assert m.read_byte(0xA10003) == 0x21
+        # Reporting C, B and the D-pad
+        m.write_byte(0xA10003, 0x40)
+        assert m.read_byte(0xA10003) == 0x3D
+        # Mirrors of the I/O registers are not mapped
+        assert m.read_byte(0xA10023) == 0
+        # Z80 bus request
+        assert not m.get_z80_request()
+        m.write(0xA11100, 0)
+        assert m.get_z80_request()
+        assert m.read(0xA11100) == 0x100
+        m.write(0xA11100, 0x100)
+        assert not m.get_z80_request()
+        assert m.read(0xA11100) == 0
+        assert m.read(0xA11102) == 0
+        # Z80 reset
+        m.write(0xA11200, 0)
+        assert m.get_z80_reset()
+        # TMSS
+        m.write_long(0xA14000, 0x53454741)
+        assert m.read(0xA14000) == 0
+
+    def test_vdp_ports(self):
+        vdp = _PortDevice()
+        m = mem.Memory(None, vdp)
+        assert m.read(0xC00004) == 0x1234
+        assert vdp.address == 4
+        m.write(0xC00004, 0x8F02)
+        assert vdp.address == 4
+        assert vdp.value == 0x8F02
+        m.write(0xC0001E, 0x1)
+        assert vdp.address == 0x1E
+        # Outside of the VDP ports
+        vdp.address = -1
+        assert m.read(0xC00020) == 0
+        m.write(0xC00104, 0)
+        assert vdp.address == -1
+        self.assertRaises(mem.MappingError,
+                          mem.Memory(None, vdp, fail_on_invalid=True).read,
+                          0xC00104)
+
+    def test_fail_on_invalid(self):
+        m = mem.Memory(fail_on_invalid=True)
+        m.read(0xA10002)
+        self.assertRaises(mem.MappingError, m.read, 0x800000)
+        self.assertRaises(mem.MappingError, m.write, 0xA10100, 0)
+        self.assertRaises(mem.MappingError, m.read, 0xC00020)
+        m = mem.Memory()
+        assert m.read(0x800000) == 0
+
+    def test_byte_and_long(self):
+        m = mem.Memory("\x01\x23\x45\x67\x89\xAB")
+        assert m.read_long(0) == 0x01234567
+        assert m.read_long(2) == 0x456789AB
+        assert m.read_byte(3) == 0x67
+        m.write_long(0xFF0010, 0x89ABCDEF)
+        assert m.read(0xFF0010) == 0x89AB
+        assert m.read(0xFF0012) == 0xCDEF
+        assert m.read_long(0xFF0010) == 0x89ABCDEF
+        m.write_byte(0xFF0011, 0x12)
+        assert m.read_byte(0xFF0011) == 0x12
+        assert m.read_long(0xFF0010) == 0x8912CDEF
+        # The last word of RAM and the first word of ROM
+        m.write(0xFFFFFE, 0xFEDC)
+        assert m.read_long(0xFFFFFE) == 0xFEDC0123
+        m.write_long(0xFFFFFE, 0x12345678)
+        assert m.read(0xFFFFFE) == 0x1234
+        assert m.read(0) == 0x0123
+
+    def test_long_across_mirror(self):
+        m = mem.Memory()
+        # The second word wraps around to the start of the 8KB Z80 RAM
+        m.write_long(0xA01FFE, 0x12345678)
+        assert m.read(0xA01FFE) == 0x1234
+        assert m.read(0xA00000) == 0x5678
+        assert m.read_long(0xA01FFE) == 0x12345678
+        assert m.read_long(0xA03FFE) == 0x12345678
+        m.write_long(0xA03FFE, 0x9ABCDEF0)
+        assert m.read_long(0xA01FFE) == 0x9ABCDEF0
+
     def test_read_rom(self):
         m = mem.Memory()
 
@@ -158,6 +291,30 @@ class TestMemory(unittest.TestCase):
                 "Expected ROM address 0x{:X} to contain the value 0x{:X}, but "
                 "found value 0x{:X}.").format(address, ex_value, value)
 
+    def test_mapped_rom(self):
+        try:
+            from rpython.rlib import rmmap
+        except ImportError:
+            self.skipTest("RPython is not available")
+        fd, path = tempfile.mkstemp()
+        try:
+            os.write(fd, "\x00\x00\x12\x34\xFF\xFF\xAB\xCD\x56")
+            mapped = rmmap.mmap(fd, 9, access=rmmap.ACCESS_READ)
+            try:
+                m = mem.Memory(mapped_program=mapped)
+
+                assert m.get_rom().get_size() == 9
+                assert m.read(2) == 0x1234
+                assert m.read(8) == 0x56FF
+                assert m.read(10) == 0xFFFF
+                assert m.read_byte(7) == 0xCD
+                assert m.read_long(4) == 0xFFFFABCD
+            finally:
+                mapped.close()
+        finally:
+            os.close(fd)
+            os.remove(path)
+
 
 if __name__ == "__main__":
     unittest.main()
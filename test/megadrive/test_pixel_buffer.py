@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Test the megadrive.devices.pixel_buffer module.
+
+Created on Sun Oct 18 22:31:09 2026
+
+@author: Simon Romanowski
+"""
+
+import unittest
+
+from megadrive.devices import pixel_buffer
+
+
+class TestPixelBuffer(unittest.TestCase):
+
+    def test_init(self):
+        b = pixel_buffer.PixelBuffer(16)
+        assert b.get_size() == 16
+        assert [b[index] for index in range(16)] == [0] * 16
+
+    def test_write(self):
+        b = pixel_buffer.PixelBuffer(16)
+        b[3] = 0xFFFFFFFF
+        b[4] = 0x3457FFFF
+        assert b[3] == 0xFFFFFFFF
+        assert type(b[3]) is int
+        assert b[4] == 0x3457FFFF
+        b.fill(2, 2, 0xFF)
+        assert [b[index] for index in range(1, 5)] == [0, 0xFF, 0xFF,
+                                                       0x3457FFFF]
+        b.free()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ Created on Sat Nov  4 15:59:41 2023
 import unittest
 
 from megadrive.devices import ram
+from utils import rpython_utils
 
 
 class TestRam(unittest.TestCase):
@@ -151,5 +152,47 @@ class TestRam(unittest.TestCase):
                 value)
 
 
+class TestByteRam(unittest.TestCase):
+
+    def test_odd_address(self):
+        m = ram.ByteRam(16)
+        m.write(7, 0x1234)
+        assert m.read(6) == 0x0012
+        assert m.read(7) == 0x1234
+        assert m.read(8) == 0x3400
+        assert m.read_byte(7) == 0x12
+        assert m.read_byte(8) == 0x34
+
+    def test_last_address(self):
+        m = ram.ByteRam(16)
+        m.write(15, 0xABCD)
+        assert m.read(14) == 0x00AB
+        assert m.read(15) == 0xAB00
+        self.assertRaises(rpython_utils.RIndexError, m.read, 16)
+        self.assertRaises(rpython_utils.RIndexError, m.write, 16, 0)
+
+    def test_long(self):
+        m = ram.ByteRam(16)
+        m.write_long(3, 0x89ABCDEF)
+        assert m.read_long(3) == 0x89ABCDEF
+        assert m.read(3) == 0x89AB
+        assert m.read(5) == 0xCDEF
+        m.write_byte(4, 0x1FF)
+        assert m.read_long(3) == 0x89FFCDEF
+        self.assertRaises(rpython_utils.RIndexError, m.read_long, 13)
+
+    def test_same_as_ram64(self):
+        m_bytes = ram.ByteRam(64)
+        m_qwords = ram.Ram64(64)
+        for address in range(0, 64, 2):
+            m_bytes.write(address, address * 0x1357)
+            m_qwords.write(address, (address * 0x1357) & 0xFFFF)
+        m_bytes.fill_bytes(20, 7, 0x5A)
+        m_qwords.fill_bytes(20, 7, 0x5A)
+        for address in range(64):
+            assert m_bytes.read(address) == m_qwords.read(address), \
+                hex(address)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Test the megadrive.scheduler module.
+
+Created on Sun Oct 18 21:14:40 2026
+
+@author: Simon Romanowski
+"""
+
+import random
+import unittest
+
+from megadrive import scheduler
+
+
+class TestScheduler(unittest.TestCase):
+
+    def test_order(self):
+        s = scheduler.Scheduler()
+        s.schedule(100, scheduler.EVENT_LINE)
+        s.schedule(50, scheduler.EVENT_VERBOSE)
+        s.schedule(100, scheduler.EVENT_QUIT)
+        assert s.get_next_cycle() == 50
+        assert s.pop() == scheduler.EVENT_VERBOSE
+        # Same cycle, ordered by kind
+        assert s.get_next_cycle() == 100
+        assert s.pop() == scheduler.EVENT_QUIT
+        assert s.get_next_cycle() == 100
+        assert s.pop() == scheduler.EVENT_LINE
+
+    def test_many(self):
+        s = scheduler.Scheduler()
+        rng = random.Random(1)
+        cycles = [rng.randint(0, 10000) for _ in range(200)]
+        for cycle in cycles:
+            s.schedule(cycle, scheduler.EVENT_LINE)
+        for cycle in sorted(cycles):
+            assert s.get_next_cycle() == cycle
+            assert s.pop() == scheduler.EVENT_LINE
+
+
+if __name__ == "__main__":
+    unittest.main()
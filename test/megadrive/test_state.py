@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Test the megadrive.state module.
+
+Created on Sun Oct 18 23:20:14 2026
+
+@author: Simon Romanowski
+"""
+
+import unittest
+
+import m68k.cpu as cpu
+from m68k.constants import REG_COUNT
+import megadrive.memory as mem
+from megadrive.devices import display
+from megadrive import state
+
+
+class TestState(unittest.TestCase):
+
+    def test_sections(self):
+        w = state.StateWriter()
+        w.begin_section("AAAA")
+        w.write_u8(0x1FF)
+        w.write_bool(True)
+        w.write_u16(0xBEEF)
+        w.write_u32(0xDEADBEEF)
+        w.end_section()
+        w.begin_section("BBBB")
+        w.write_i64(-2)
+        w.write_float(571.25)
+        w.end_section()
+        data = w.get_data()
+        assert data[:6] == state.MAGIC + "\x02\x00"
+        # Little-endian
+        assert "\xEF\xBE\xEF\xBE\xAD\xDE" in data
+
+        r = state.StateReader(data)
+        # Sections are found by their tag
+        r.begin_section("BBBB")
+        assert r.read_i64() == -2
+        assert r.read_float() == 571.25
+        r.end_section()
+        r.begin_section("AAAA")
+        assert r.read_u8() == 0xFF
+        assert r.read_bool()
+        assert r.read_u16() == 0xBEEF
+        assert r.read_u32() == 0xDEADBEEF
+        r.end_section()
+
+    def test_errors(self):
+        w = state.StateWriter()
+        w.begin_section("AAAA")
+        w.write_u16(1)
+        w.end_section()
+        data = w.get_data()
+        self.assertRaises(state.StateError, state.StateReader, "XXXX")
+        self.assertRaises(state.StateError,
+                          state.StateReader,
+                          state.MAGIC + "\x03\x00")
+        self.assertRaises(state.StateError, state.StateReader, data[:-1])
+        r = state.StateReader(data)
+        self.assertRaises(state.StateError, r.begin_section, "BBBB")
+        r.begin_section("AAAA")
+        r.read_u8()
+        self.assertRaises(state.StateError, r.end_section)
+        self.assertRaises(state.StateError, r.read_u32)
+
+    def test_cpu_and_memory(self):
+        m = mem.Memory()
+        c = cpu.Cpu(m)
+        c.set_d(1, 0x12345678)
+        c.set_a(7, 0xFF1000)
+        c.set_pc(0x200)
+        c.set_ccr_sub(5, 7, -2, 2, True)
+        c.increment_cycles(1234)
+        m.write(0xFF0010, 0xCAFE)
+        m.write(0xA00004, 0xBEEF)
+        # Player 1 control port
+        m.write_byte(0xA10009, 0x40)
+        m.write(0xA11100, 0)
+        m.write(0xA11200, 0)
+
+        w = state.StateWriter()
+        w.begin_section(state.SECTION_M68K)
+        c.save_state(w)
+        w.end_section()
+        w.begin_section(state.SECTION_MEMORY)
+        m.save_state(w)
+        w.end_section()
+        data = w.get_data()
+
+        m2 = mem.Memory()
+        c2 = cpu.Cpu(m2)
+        r = state.StateReader(data)
+        r.begin_section(state.SECTION_M68K)
+        c2.load_state(r)
+        r.end_section()
+        r.begin_section(state.SECTION_MEMORY)
+        m2.load_state(r)
+        r.end_section()
+
+        assert c2.get_d(1) == 0x12345678
+        assert c2.get_a(7) == 0xFF1000
+        assert c2.get_pc() == 0x200
+        assert c2.get_cycle() == c.get_cycle()
+        assert c2.get_ccr() == c.get_ccr()
+        assert c2.get_sr_full() == c.get_sr_full()
+        assert m2.read(0xFF0010) == 0xCAFE
+        assert m2.read(0xA00004) == 0xBEEF
+        assert m2.read_byte(0xA10009) == 0x40
+        assert m2.get_z80_request()
+        assert m2.get_z80_reset()
+
+    def test_unknown_ccr_kind(self):
+        c = cpu.Cpu(mem.Memory())
+        w = state.StateWriter()
+        w.begin_section(state.SECTION_M68K)
+        c.save_state(w)
+        w.end_section()
+        data = w.get_data()
+        # The kind follows the header, the section header and the registers
+        kind_index = 14 + 4 * REG_COUNT
+        invalid = data[:kind_index] + "\x05" + data[kind_index + 1:]
+
+        r = state.StateReader(invalid)
+        r.begin_section(state.SECTION_M68K)
+        self.assertRaises(state.StateError, c.load_state, r)
+
+    def test_other_program(self):
+        m = mem.Memory("\x00\x01")
+        w = state.StateWriter()
+        w.begin_section(state.SECTION_ROM)
+        w.write_u32(m.get_rom().get_size())
+        w.write_u32(m.get_rom().get_checksum())
+        w.end_section()
+        other = mem.Memory("\x00\x02")
+        # The program is checked before anything else
+        self.assertRaises(state.StateError,
+                          state.load_state,
+                          w.get_data(), cpu.Cpu(other), other, None)
+
+    def test_frame_saved_mid_frame(self):
+        machines = []
+        for _ in range(2):
+            d = display.Display()
+            m = mem.Memory(None, d)
+            c = cpu.Cpu(m)
+            d.set_m68k_ram(m)
+            d.set_m68k_cpu(c)
+            machines.append((c, m, d))
+        c, m, d = machines[0]
+        # Background color
+        m.write_long(0xC00004, 0xC0000000)
+        m.write(0xC00000, 0x0EEE)
+        for _ in range(37):
+            d.draw_line()
+        data = state.save_state(c, m, d, 0.0)
+        while not d.draw_line()[3]:
+            pass
+
+        c2, m2, d2 = machines[1]
+        state.load_state(data, c2, m2, d2)
+        while not d2.draw_line()[3]:
+            pass
+        size = d.width * d.height
+        assert d._frame[0] != 0
+        assert [d2.get_pixel(i) for i in range(size)] \
+            == [d.get_pixel(i) for i in range(size)]
+
+    def test_invalid_section_keeps_state(self):
+        m = mem.Memory()
+        c = cpu.Cpu(m)
+        d = display.Display()
+        c.set_d(1, 0x12345678)
+        m.write(0xFF0010, 0xCAFE)
+        data = state.save_state(c, m, d, 100.0)
+
+        # A RAM of a different size can only be found while loading the
+        # memory, after the registers of the 68k
+        w = state.StateWriter()
+        r = state.StateReader(data)
+        for tag in [state.SECTION_ROM, state.SECTION_TIME]:
+            r.begin_section(tag)
+            w.begin_section(tag)
+            # Both sections have 8 bytes
+            for _ in range(8):
+                w.write_u8(r.read_u8())
+            w.end_section()
+        w.begin_section(state.SECTION_M68K)
+        c.save_state(w)
+        w.end_section()
+        w.begin_section(state.SECTION_MEMORY)
+        w.write_u32(2)
+        w.write_u16(0)
+        w.end_section()
+        w.begin_section(state.SECTION_VDP)
+        d.save_state(w)
+        w.end_section()
+        invalid = w.get_data()
+
+        c.set_d(1, 0x87654321)
+        m.write(0xFF0010, 0xBEEF)
+        self.assertRaises(state.StateError,
+                          state.load_state,
+                          invalid, c, m, d)
+        assert c.get_d(1) == 0x87654321
+        assert m.read(0xFF0010) == 0xBEEF
+
+        assert state.load_state(data, c, m, d) == 100.0
+        assert c.get_d(1) == 0x12345678
+        assert m.read(0xFF0010) == 0xCAFE
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Test the megadrive.devices.vram module.
+
+Created on Sun Oct 18 19:31:05 2026
+
+@author: Simon Romanowski
+"""
+
+import unittest
+
+from megadrive.devices import vram
+
+
+def _tile_pixels(v, tile_index):
+    offset = v.get_tile(tile_index)
+    return v.get_tile_colors()[offset:offset + vram.TILE_PIXELS]
+
+
+class TestVram(unittest.TestCase):
+
+    def test_decode(self):
+        v = vram.Vram(1024)
+        # First row of tile 1
+        v.write_long(0x20, 0x0123ABCD)
+        assert _tile_pixels(v, 1)[:8] == [0, 1, 2, 3, 0xA, 0xB, 0xC, 0xD]
+        assert _tile_pixels(v, 1)[8:] == [0] * 56
+        assert _tile_pixels(v, 0) == [0] * 64
+
+    def test_invalidate(self):
+        v = vram.Vram(1024)
+        assert _tile_pixels(v, 2) == [0] * 64
+        # Last pixel of tile 2
+        v.write_byte(0x5F, 0x0F)
+        assert _tile_pixels(v, 2)[63] == 0xF
+        # Long word across tiles 2 and 3
+        v.write_long(0x5E, 0x12345678)
+        assert _tile_pixels(v, 2)[60:] == [1, 2, 3, 4]
+        assert _tile_pixels(v, 3)[:4] == [5, 6, 7, 8]
+        v.write(0x40, 0x9000)
+        assert _tile_pixels(v, 2)[0] == 9
+        v.fill_bytes(0x50, 0x20, 0x11)
+        assert _tile_pixels(v, 2)[32:] == [1] * 32
+        assert _tile_pixels(v, 3)[:32] == [1] * 32
+        assert _tile_pixels(v, 3)[32:] == [0] * 32
+
+    def test_wrap(self):
+        v = vram.Vram(1024)
+        v.write(0, 0x1200)
+        assert v.get_tile(32) == v.get_tile(0)
+        assert _tile_pixels(v, 32)[:2] == [1, 2]
+
+    def test_watch(self):
+        v = vram.Vram(1024)
+        v.watch(0x100, 0x1FF)
+        v.write(0xFE, 0)
+        v.fill_bytes(0x200, 0x10, 0)
+        assert not v.is_watched_written()
+        v.write_long(0xFE, 0)
+        assert v.is_watched_written()
+        v.watch(0x100, 0x1FF)
+        assert not v.is_watched_written()
+        v.write_byte(0x1FF, 0)
+        assert v.is_watched_written()
+
+
+if __name__ == "__main__":
+    unittest.main()
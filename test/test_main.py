@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Test the parsing of the arguments in the main module.
+
+Created on Mon Oct 19 00:08:44 2026
+
+@author: Simon Romanowski
+"""
+
+import unittest
+
+try:
+    import main
+except ImportError:
+    # The console needs the SDL 2 library
+    main = None
+
+
+@unittest.skipIf(main is None, "SDL 2 is not available")
+class TestMain(unittest.TestCase):
+
+    def test_parse_frameskip(self):
+        assert main._parse_frameskip(None, False) == 0
+        assert main._parse_frameskip("3", False) == 3
+        assert main._parse_frameskip("-2", False) == -2
+        assert main._parse_frameskip(None, True) == -1
+        assert main._parse_frameskip("3", True) == -1
+        self.assertRaises(ValueError, main._parse_frameskip, "x", False)
+        self.assertRaises(ValueError, main._parse_frameskip, "x", True)
+
+    def test_frameskip_args(self):
+        assert main.entry_point(
+            ["revelation", "--frameskip", "x", "missing.md"]) \
+            == main._EXIT_ARG_FRAMESKIP
+        # The arguments are accepted, only the file is missing
+        assert main.entry_point(
+            ["revelation", "--frameskip", "2", "missing.md"]) \
+            == main._EXIT_FILE_MISSING
+        assert main.entry_point(
+            ["revelation", "--render-never", "missing.md"]) \
+            == main._EXIT_FILE_MISSING
+        assert main.entry_point(
+            ["revelation", "--render-never", "--frameskip", "1",
+             "missing.md"]) \
+            == main._EXIT_FILE_MISSING
+
+
+if __name__ == "__main__":
+    unittest.main()
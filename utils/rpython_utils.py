@@ -8,11 +8,26 @@ Created on Mon Oct 23 20:37:46 2023
 """
 
 try:
-    from rpython.rlib.objectmodel import we_are_translated
+    from rpython.rlib.objectmodel import always_inline, we_are_translated
 except ImportError:
+    def always_inline(func):
+        return func
+
     def we_are_translated():
         return False
 
+try:
+    from rpython.rlib.jit import elidable, promote, we_are_jitted
+except ImportError:
+    def elidable(func):
+        return func
+
+    def promote(value):
+        return value
+
+    def we_are_jitted():
+        return False
+
 
 class ExceptionWithMessage(Exception):
 
@@ -32,3 +47,7 @@ class RValueError(ExceptionWithMessage):
 
 class RIndexError(ExceptionWithMessage):
     pass
+
+
+class StateError(ExceptionWithMessage):
+    """Raised when a save state cannot be loaded."""